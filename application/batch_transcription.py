@@ -0,0 +1,197 @@
+"""ファイル文字起こし - 録音と並行して音声ファイルを非同期で文字起こし"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from config.settings import AppSettings
+from utils.config_manager import load_config
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTranscriptionManager(QObject):
+    """音声ファイルの文字起こしジョブを管理
+
+    ジョブは qasync のイベントループ上のタスクとして実行し、
+    同時実行数はセマフォで制限する。アップロードと応答待ちは
+    await するだけなので、リアルタイム文字起こしを止めない。
+    結果は音声ファイルと同じ場所に保存する。
+
+    elevenlabs SDK・httpx・numpy は起動時間に影響するため、
+    最初にファイルが追加された時に読み込む。
+    """
+
+    # Signal定義
+    job_started = pyqtSignal(str)  # 音声ファイルパス
+    job_finished = pyqtSignal(str, str)  # (音声ファイルパス, 結果ファイルパス)
+    job_failed = pyqtSignal(str, str)  # (音声ファイルパス, エラーメッセージ)
+    progress_changed = pyqtSignal(int, int)  # (完了数, 全体数)
+    all_finished = pyqtSignal(int, int)  # (成功数, 失敗数)
+
+    def __init__(self, settings: AppSettings):
+        super().__init__()
+        self._settings = settings.batch
+        self._api_key = settings.elevenlabs_api_key
+        self._client = None  # AsyncElevenLabs (初回のジョブで作成)
+        self._http_client = None  # httpx.AsyncClient (ジョブ間で接続を再利用)
+        self._close_task: Optional[asyncio.Future] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._api = None  # external_service.elevenlabs_api (初回のenqueueで読み込み)
+        self._preprocess_options = None  # PreprocessOptions
+        self._cache = None  # TranscriptionCache (無効の場合はNone)
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+        self._total = 0
+        self._completed = 0
+        self._succeeded = 0
+
+        logger.info(
+            f"BatchTranscriptionManager 初期化完了 (同時実行数 {self._settings.max_concurrency})"
+        )
+
+    @property
+    def pending_count(self) -> int:
+        """実行中・待機中のジョブ数"""
+        return len(self._tasks)
+
+    def output_path_for(self, audio_file_path: str) -> str:
+        """結果ファイルのパス"""
+        return os.path.splitext(audio_file_path)[0] + self._settings.output_extension
+
+    def enqueue(self, audio_file_paths: List[str]):
+        """ファイルを文字起こしキューに追加 (追加済みのファイルは無視)"""
+        if not audio_file_paths:
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, self._settings.max_concurrency))
+            self._initialize()
+
+        for path in audio_file_paths:
+            if path in self._tasks:
+                logger.debug("追加済みのためスキップ: %s", path)
+                continue
+            self._total += 1
+            task = asyncio.create_task(self._run(path))
+            self._tasks[path] = task
+            task.add_done_callback(lambda _, path=path: self._on_task_done(path))
+
+        self.progress_changed.emit(self._completed, self._total)
+        logger.info(f"ファイル文字起こし追加: {len(audio_file_paths)}件 (待機中 {len(self._tasks)}件)")
+
+    def _initialize(self):
+        """API・前処理のモジュールを読み込み、config.ini の設定を反映
+
+        前処理とキャッシュは transcribe_audio と同じ設定を使う。
+        """
+        from external_service import elevenlabs_api
+        from external_service.audio_preprocess import PreprocessOptions
+        from external_service.transcription_cache import get_transcription_cache
+
+        self._api = elevenlabs_api
+        try:
+            config = load_config()
+        except Exception as e:
+            logger.warning(f"config.ini を読み込めないため前処理は既定の設定を使用します: {e}")
+            self._preprocess_options = PreprocessOptions()
+            return
+        self._preprocess_options = PreprocessOptions.from_config(config)
+        self._cache = get_transcription_cache(config)
+
+    def cancel_all(self):
+        """実行中・待機中のジョブを全てキャンセル"""
+        if not self._tasks:
+            return
+        logger.info(f"ファイル文字起こしをキャンセル: {len(self._tasks)}件")
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    async def aclose(self):
+        """実行中のジョブをキャンセルし、HTTPクライアントの接続を閉じる"""
+        tasks = list(self._tasks.values())
+        self.cancel_all()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        http_client = self._release_client()
+        if http_client is not None:
+            await http_client.aclose()
+        if self._close_task is not None:
+            await self._close_task
+
+    def _release_client(self):
+        """クライアントを手放し、閉じる必要のある httpx.AsyncClient を返す"""
+        http_client = self._http_client
+        self._client = None
+        self._http_client = None
+        return http_client
+
+    @property
+    def has_open_client(self) -> bool:
+        """閉じていない (または閉じている途中の) HTTPクライアントがあるか"""
+        closing = self._close_task is not None and not self._close_task.done()
+        return self._http_client is not None or closing
+
+    async def _run(self, audio_file_path: str):
+        """1ファイルを文字起こしして保存"""
+        assert self._semaphore is not None
+        async with self._semaphore:
+            self.job_started.emit(audio_file_path)
+
+            api = self._api
+            if self._client is None:
+                self._http_client = api.create_async_http_client()
+                self._client = api.create_async_elevenlabs_client(self._api_key, self._http_client)
+
+            text = await api.transcribe_audio_async(
+                audio_file_path,
+                self._client,
+                model_id=self._settings.model,
+                language_code=self._settings.language,
+                preprocess_options=self._preprocess_options,
+                cache=self._cache,
+            )
+            if text is None:
+                self.job_failed.emit(audio_file_path, "文字起こしに失敗しました")
+                return
+
+            output_path = self.output_path_for(audio_file_path)
+            try:
+                # ディスク書き込みでイベントループを止めない
+                await asyncio.to_thread(_write_text, output_path, text)
+            except OSError as e:
+                logger.error(f"結果ファイルの保存エラー: {e}")
+                self.job_failed.emit(audio_file_path, f"保存に失敗しました: {e}")
+                return
+
+            self._succeeded += 1
+            self.job_finished.emit(audio_file_path, output_path)
+
+    def _on_task_done(self, audio_file_path: str):
+        """ジョブ終了時の集計"""
+        task = self._tasks.pop(audio_file_path, None)
+        if task is not None and task.cancelled():
+            self.job_failed.emit(audio_file_path, "キャンセルされました")
+        elif task is not None and task.exception() is not None:
+            logger.error(f"ファイル文字起こしエラー: {task.exception()}")
+            self.job_failed.emit(audio_file_path, str(task.exception()))
+
+        self._completed += 1
+        self.progress_changed.emit(self._completed, self._total)
+
+        if not self._tasks:
+            failed = self._completed - self._succeeded
+            logger.info(f"ファイル文字起こし完了: 成功 {self._succeeded}件, 失敗 {failed}件")
+            self.all_finished.emit(self._succeeded, failed)
+            self._total = self._completed = self._succeeded = 0
+            # 次に追加されるまで接続を保持しない
+            http_client = self._release_client()
+            if http_client is not None:
+                self._close_task = asyncio.ensure_future(http_client.aclose())
+
+
+def _write_text(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
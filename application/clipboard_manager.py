@@ -2,156 +2,342 @@
 
 import logging
 import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional
 
-import pyperclip
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, Qt, QThread, QTimer, pyqtSignal, pyqtSlot
 
 from config.settings import AppSettings
-from domain.exceptions import ClipboardError
+from domain.models import PasteTimings, RecordingState
+from infrastructure.text_injector import (
+    TextInjectionBackend,
+    create_injection_backend,
+)
+from utils.latency_tracer import LatencyTracer
+from utils.metrics import REGISTRY
 
 logger = logging.getLogger(__name__)
 
+_PASTES = REGISTRY.counter("voicescribe_pastes_total", "貼り付けの成功件数")
+_PASTE_FAILURES = REGISTRY.counter(
+    "voicescribe_paste_failures_total", "貼り付けの失敗件数"
+)
+_PASTE_SECONDS = REGISTRY.histogram(
+    "voicescribe_paste_seconds", "貼り付けの受付から完了までの時間"
+)
+_PASTE_QUEUE_DEPTH = REGISTRY.gauge(
+    "voicescribe_paste_queue_depth", "貼り付け待ちのジョブ数"
+)
 
-class ClipboardManager(QObject):
-    """クリップボード操作管理"""
 
-    # Signal定義
-    paste_completed = pyqtSignal()
-    paste_failed = pyqtSignal(str)
+@dataclass
+class _PasteJob:
+    """貼り付けジョブ"""
 
-    def __init__(self, settings: AppSettings):
-        super().__init__()
-        self._settings = settings
-        self._paste_delay_ms = settings.recording.paste_delay_ms
-
-        logger.info("ClipboardManager 初期化完了")
+    job_id: int
+    text: str
+    enqueued_ns: int = field(default_factory=time.perf_counter_ns)
+    timings: Optional[PasteTimings] = None
+    delay_started_ns: int = 0
+    copy_only: bool = False  # コピーのみ (貼り付けない)
 
-    def copy_and_paste(self, text: str):
-        """クリップボードにコピーして貼り付け"""
-        try:
-            # クリップボードにコピー
-            if not self.copy_only(text):
-                self.paste_failed.emit("クリップボードへのコピーに失敗しました")
-                return
 
-            # 遅延
-            time.sleep(self._paste_delay_ms / 1000.0)
+class _PasteWorker(QObject):
+    """テキスト入力ワーカー (専用スレッドで直列に実行)"""
 
-            # 貼り付け
-            if self._safe_paste():
-                self.paste_completed.emit()
-                logger.info(f"貼り付け完了: {len(text)}文字")
-            else:
-                self.paste_failed.emit("貼り付けに失敗しました")
+    # Signal定義
+    # (job_id, 成否, copy_ns, verify_ns)
+    copy_finished = pyqtSignal(int, bool, int, int)
+    inject_finished = pyqtSignal(int, bool, int)  # (job_id, 成否, inject_ns)
 
-        except Exception as e:
-            logger.error(f"コピー&貼り付けエラー: {e}", exc_info=True)
-            self.paste_failed.emit(str(e))
+    def __init__(self, backend: TextInjectionBackend):
+        super().__init__()
+        self._backend = backend
 
-    def copy_only(self, text: str) -> bool:
-        """クリップボードにコピーのみ"""
+    @pyqtSlot(int, str)
+    def copy(self, job_id: int, text: str):
+        """入力の準備 (クリップボードへのコピー) と検証"""
+        copy_ns = verify_ns = 0
+        success = False
         try:
-            return self._safe_copy(text)
-        except Exception as e:
-            logger.error(f"コピーエラー: {e}", exc_info=True)
-            raise ClipboardError(f"コピー失敗: {e}")
+            start = time.perf_counter_ns()
+            self._backend.prepare(text)
+            copy_ns = time.perf_counter_ns() - start
 
-    def _safe_copy(self, text: str) -> bool:
-        """スレッドセーフなクリップボードコピー"""
-        try:
-            pyperclip.copy(text)
+            start = time.perf_counter_ns()
+            success = self._backend.verify(text)
+            verify_ns = time.perf_counter_ns() - start
 
-            # コピーの検証
-            if self._verify_clipboard(text):
-                logger.debug(f"クリップボードコピー成功: {len(text)}文字")
-                return True
+            if success:
+                logger.debug("クリップボードコピー成功: %d文字", len(text))
             else:
                 logger.error("クリップボード検証失敗")
-                return False
 
         except Exception as e:
             logger.error(f"クリップボードコピーエラー: {e}")
-            return False
 
-    def _safe_paste(self) -> bool:
-        """スレッドセーフな貼り付け (Windows SendInput使用)"""
-        if not self._is_windows():
-            logger.warning("Windows以外では貼り付け機能は未サポート")
-            return False
+        self.copy_finished.emit(job_id, success, copy_ns, verify_ns)
 
+    @pyqtSlot(int, str)
+    def inject(self, job_id: int, text: str):
+        """テキストを入力先に送信"""
+        start = time.perf_counter_ns()
         try:
-            # Windows SendInput API を使用
-            import ctypes
-
-            # Ctrl+V を送信
-            VK_CONTROL = 0x11
-            VK_V = 0x56
-            KEYEVENTF_KEYUP = 0x0002
-
-            # SendInput構造体
-            class INPUT(ctypes.Structure):
-                class _INPUT(ctypes.Union):
-                    class KEYBDINPUT(ctypes.Structure):
-                        _fields_ = [
-                            ("wVk", ctypes.c_ushort),
-                            ("wScan", ctypes.c_ushort),
-                            ("dwFlags", ctypes.c_ulong),
-                            ("time", ctypes.c_ulong),
-                            ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong)),
-                        ]
-
-                    _fields_ = [("ki", KEYBDINPUT)]
-
-                _fields_ = [("type", ctypes.c_ulong), ("ii", _INPUT)]
-
-            # Ctrl キーダウン
-            ctrl_down = INPUT()
-            ctrl_down.type = 1  # INPUT_KEYBOARD
-            ctrl_down.ii.ki.wVk = VK_CONTROL
-            ctrl_down.ii.ki.dwFlags = 0
-
-            # V キーダウン
-            v_down = INPUT()
-            v_down.type = 1
-            v_down.ii.ki.wVk = VK_V
-            v_down.ii.ki.dwFlags = 0
-
-            # V キーアップ
-            v_up = INPUT()
-            v_up.type = 1
-            v_up.ii.ki.wVk = VK_V
-            v_up.ii.ki.dwFlags = KEYEVENTF_KEYUP
-
-            # Ctrl キーアップ
-            ctrl_up = INPUT()
-            ctrl_up.type = 1
-            ctrl_up.ii.ki.wVk = VK_CONTROL
-            ctrl_up.ii.ki.dwFlags = KEYEVENTF_KEYUP
-
-            # SendInput 実行
-            inputs = (INPUT * 4)(ctrl_down, v_down, v_up, ctrl_up)
-            ctypes.windll.user32.SendInput(
-                4, ctypes.byref(inputs), ctypes.sizeof(INPUT)
-            )
-
-            logger.debug("SendInput で貼り付け実行")
-            return True
-
+            success = self._backend.inject(text)
         except Exception as e:
             logger.error(f"貼り付けエラー: {e}", exc_info=True)
-            return False
+            success = False
+        self.inject_finished.emit(job_id, success, time.perf_counter_ns() - start)
 
-    def _verify_clipboard(self, expected: str) -> bool:
-        """クリップボードの内容を検証"""
-        try:
-            actual = pyperclip.paste()
-            return actual == expected
-        except Exception as e:
-            logger.error(f"クリップボード検証エラー: {e}")
-            return False
 
-    def _is_windows(self) -> bool:
-        """Windows環境かどうか"""
-        import sys
+class ClipboardManager(QObject):
+    """クリップボード操作管理
+
+    コピー・検証・貼り付けは専用スレッドのワーカーで直列に実行し、
+    貼り付け前の待機はタイマーで行うため、メインスレッド (Qt/asyncio
+    イベントループ) をブロックしない。
+    """
+
+    # Signal定義
+    paste_completed = pyqtSignal()
+    paste_failed = pyqtSignal(str)
+    paste_timings_ready = pyqtSignal(PasteTimings)
+    copy_completed = pyqtSignal()
+    copy_failed = pyqtSignal(str)
+
+    # ワーカーへの要求 (キュー接続でワーカースレッドに渡す)
+    _copy_requested = pyqtSignal(int, str)
+    _inject_requested = pyqtSignal(int, str)
+
+    def __init__(
+        self,
+        settings: AppSettings,
+        backend: Optional[TextInjectionBackend] = None,
+        tracer: Optional[LatencyTracer] = None,
+    ):
+        super().__init__()
+        self._settings = settings
+        self._tracer = tracer
+        self._backend = backend or create_injection_backend(
+            settings.recording.injection_backend
+        )
+        # クリップボードを使わないバックエンドでは待機不要
+        self._paste_delay_ms = (
+            settings.recording.paste_delay_ms if self._backend.uses_clipboard else 0
+        )
+        self._coalesce_ms = settings.recording.paste_coalesce_ms
+
+        self._jobs: Deque[_PasteJob] = deque()
+        self._current_job: Optional[_PasteJob] = None
+        self._next_job_id = 0
+        _PASTE_QUEUE_DEPTH.set_function(self._jobs.__len__)
+
+        # 貼り付け前の待機タイマー
+        self._delay_timer = QTimer(self)
+        self._delay_timer.setSingleShot(True)
+        self._delay_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._delay_timer.timeout.connect(self._on_delay_elapsed)
+
+        # 確定結果のまとめ貼り付け
+        self._pending_segments: List[str] = []
+        self._coalesce_timer = QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._coalesce_timer.timeout.connect(self.flush)
+
+        # 専用ワーカースレッド
+        self._worker = _PasteWorker(self._backend)
+        self._thread = QThread(self)
+        self._thread.setObjectName("ClipboardPasteThread")
+        self._worker.moveToThread(self._thread)
+        self._copy_requested.connect(self._worker.copy)
+        self._inject_requested.connect(self._worker.inject)
+        self._worker.copy_finished.connect(self._on_copy_finished)
+        self._worker.inject_finished.connect(self._on_inject_finished)
+        self._thread.start()
+
+        logger.info(f"ClipboardManager 初期化完了 (入力方式: {self._backend.name})")
+
+    def copy_and_paste(self, text: str):
+        """クリップボードにコピーして貼り付け (非同期・受付順に実行)
+
+        まとめ貼り付けが有効な場合は、最初のセグメントから
+        paste_coalesce_ms 以内に届いたセグメントを1回の貼り付けにまとめる。
+        """
+        if self._coalesce_ms <= 0:
+            self._enqueue_job(text)
+            return
+
+        self._pending_segments.append(text)
+        if not self._coalesce_timer.isActive():
+            self._coalesce_timer.start(self._coalesce_ms)
+
+    def flush(self):
+        """まとめ待ちのセグメントを直ちに貼り付け"""
+        self._coalesce_timer.stop()
+        if not self._pending_segments:
+            return
+
+        text = "".join(self._pending_segments)
+        segment_count = len(self._pending_segments)
+        self._pending_segments.clear()
+
+        if segment_count > 1:
+            logger.debug("%d件の確定結果をまとめて貼り付け", segment_count)
+        self._enqueue_job(text)
+
+    def on_recording_state_changed(self, state: RecordingState):
+        """録音停止時にまとめ待ちのセグメントを貼り付け"""
+        if state != RecordingState.RECORDING:
+            self.flush()
+
+    def _enqueue_job(self, text: str):
+        """貼り付けジョブを登録"""
+        # まとめ貼り付け有効時は、未着手のジョブがあればそこに連結する
+        if self._coalesce_ms > 0 and self._jobs and not self._jobs[-1].copy_only:
+            waiting_job = self._jobs[-1]
+            waiting_job.text += text
+            if self._tracer is not None:
+                self._tracer.assign_paste_job(waiting_job.job_id)
+            return
+
+        job = _PasteJob(job_id=self._next_job_id, text=text)
+        self._next_job_id += 1
+        self._jobs.append(job)
+        if self._tracer is not None:
+            self._tracer.assign_paste_job(job.job_id)
+        self._start_next_job()
+
+    def copy_only(self, text: str):
+        """クリップボードにコピーのみ (非同期・貼り付けジョブと受付順に実行)
+
+        結果は copy_completed / copy_failed で通知する。
+        """
+        job = _PasteJob(job_id=self._next_job_id, text=text, copy_only=True)
+        self._next_job_id += 1
+        self._jobs.append(job)
+        self._start_next_job()
+
+    @property
+    def backend(self) -> TextInjectionBackend:
+        """テキスト入力バックエンド"""
+        return self._backend
+
+    def shutdown(self):
+        """ワーカースレッドを停止"""
+        self._delay_timer.stop()
+        self._coalesce_timer.stop()
+
+        # 終了時は貼り付けできないため、未処理のテキストを記録して破棄
+        unfinished = list(self._pending_segments) + [job.text for job in self._jobs]
+        if self._current_job is not None:
+            unfinished.insert(0, self._current_job.text)
+        if unfinished:
+            logger.warning(
+                f"終了のため未貼り付けのテキスト{len(unfinished)}件を破棄: "
+                f"{''.join(unfinished)[:200]}"
+            )
+        self._pending_segments.clear()
+        self._jobs.clear()
+        self._current_job = None
+        self._thread.quit()
+        self._thread.wait()
+        logger.info("ClipboardManager 停止")
+
+    def _start_next_job(self):
+        """待機中のジョブがあれば処理を開始"""
+        if self._current_job is not None or not self._jobs:
+            return
+
+        job = self._jobs.popleft()
+        job.timings = PasteTimings(
+            text_length=len(job.text),
+            queue_ms=(time.perf_counter_ns() - job.enqueued_ns) / 1e6,
+        )
+        self._current_job = job
+        self._copy_requested.emit(job.job_id, job.text)
+
+    def _on_copy_finished(
+        self, job_id: int, success: bool, copy_ns: int, verify_ns: int
+    ):
+        """コピー完了時の処理"""
+        job = self._current_job
+        if job is None or job.job_id != job_id or job.timings is None:
+            return
+
+        job.timings.copy_ms = copy_ns / 1e6
+        job.timings.verify_ms = verify_ns / 1e6
+
+        if job.copy_only:
+            self._finish_copy_only(success)
+            return
+
+        if not success:
+            self._finish_job(False, "クリップボードへのコピーに失敗しました")
+            return
+
+        # 遅延 (タイマーで待機)
+        job.delay_started_ns = time.perf_counter_ns()
+        self._delay_timer.start(self._paste_delay_ms)
+
+    def _on_delay_elapsed(self):
+        """待機完了時に貼り付けを要求"""
+        job = self._current_job
+        if job is None or job.timings is None:
+            return
+
+        job.timings.delay_ms = (time.perf_counter_ns() - job.delay_started_ns) / 1e6
+        self._inject_requested.emit(job.job_id, job.text)
+
+    def _on_inject_finished(self, job_id: int, success: bool, inject_ns: int):
+        """貼り付け完了時の処理"""
+        job = self._current_job
+        if job is None or job.job_id != job_id or job.timings is None:
+            return
+
+        job.timings.inject_ms = inject_ns / 1e6
+        if success:
+            self._finish_job(True)
+        else:
+            self._finish_job(False, "貼り付けに失敗しました")
+
+    def _finish_copy_only(self, success: bool):
+        """コピーのみのジョブを完了して次のジョブを開始"""
+        job = self._current_job
+        self._current_job = None
+
+        if success:
+            self.copy_completed.emit()
+            logger.info(f"コピー完了: {len(job.text)}文字")
+        else:
+            self.copy_failed.emit("クリップボードへのコピーに失敗しました")
+
+        self._start_next_job()
+
+    def _finish_job(self, success: bool, error_message: str = ""):
+        """ジョブを完了して次のジョブを開始"""
+        job = self._current_job
+        self._current_job = None
+
+        if self._tracer is not None and job is not None:
+            self._tracer.mark_pasted(job.job_id, success)
+
+        if job is not None and job.timings is not None:
+            timings = job.timings
+            self.paste_timings_ready.emit(timings)
+            _PASTE_SECONDS.observe(timings.total_ms / 1000)
+
+            if success:
+                _PASTES.inc()
+                self.paste_completed.emit()
+                logger.info(
+                    f"貼り付け完了: {timings.text_length}文字 "
+                    f"(コピー {timings.copy_ms:.1f}ms, 検証 {timings.verify_ms:.1f}ms, "
+                    f"待機 {timings.delay_ms:.1f}ms, 送信 {timings.inject_ms:.1f}ms)"
+                )
+            else:
+                _PASTE_FAILURES.inc()
+                self.paste_failed.emit(error_message)
 
-        return sys.platform == "win32"
+        self._start_next_job()
@@ -0,0 +1,203 @@
+"""ファジー語彙補正 - SymSpell方式の削除インデックス"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 補正対象のトークン (カタカナ語・英数字語)
+# 漢字列は同音異字の誤認識が主で編集距離による補正に向かないため対象外
+TOKEN_PATTERN = re.compile(r"[ァ-ヺー]+|[A-Za-z][A-Za-z0-9\-]*")
+
+
+def bounded_edit_distance(source: str, target: str, max_distance: int) -> int:
+    """上限付き編集距離 (隣接文字の転置を含む)
+
+    Returns:
+        int: 編集距離。max_distanceを超える場合は max_distance + 1
+    """
+    if source == target:
+        return 0
+
+    len_source, len_target = len(source), len(target)
+    if abs(len_source - len_target) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len_target + 1))
+
+    for i in range(1, len_source + 1):
+        current = [i] + [0] * len_target
+        row_min = current[0]
+        source_char = source[i - 1]
+
+        for j in range(1, len_target + 1):
+            cost = 0 if source_char == target[j - 1] else 1
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+            if (
+                i > 1
+                and j > 1
+                and source_char == target[j - 2]
+                and source[i - 2] == target[j - 1]
+            ):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+
+        if row_min > max_distance:
+            return max_distance + 1
+
+        previous_previous, previous = previous, current
+
+    distance = previous[len_target]
+    return distance if distance <= max_distance else max_distance + 1
+
+
+class SymSpellIndex:
+    """SymSpell方式の削除インデックス
+
+    語彙の各語について先頭 prefix_length 文字から最大 max_edit_distance 文字を
+    削除した文字列を事前に列挙しておき、検索時は入力側の削除文字列を
+    辞書引きするだけで候補を得る。
+    """
+
+    def __init__(self, max_edit_distance: int = 1, prefix_length: int = 7):
+        self._max_edit_distance = max_edit_distance
+        self._prefix_length = max(prefix_length, max_edit_distance + 1)
+        self._deletes: Dict[str, List[str]] = {}
+        self._terms: Set[str] = set()
+
+    def add_terms(self, terms: Iterable[str]):
+        """語彙を追加"""
+        for term in terms:
+            if not term or term in self._terms:
+                continue
+
+            self._terms.add(term)
+            for delete in self._generate_deletes(term[: self._prefix_length]):
+                self._deletes.setdefault(delete, []).append(term)
+
+    def lookup(self, token: str) -> Optional[Tuple[str, int]]:
+        """最も近い語彙を検索
+
+        Returns:
+            Optional[Tuple[str, int]]: (語彙, 編集距離)。候補がない場合None
+        """
+        if token in self._terms:
+            return token, 0
+
+        max_distance = self._max_edit_distance
+        best: Optional[Tuple[str, int]] = None
+        checked: Set[str] = set()
+
+        for delete in self._generate_deletes(token[: self._prefix_length]):
+            for candidate in self._deletes.get(delete, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+
+                limit = best[1] - 1 if best is not None else max_distance
+                distance = bounded_edit_distance(token, candidate, limit)
+                if distance <= limit:
+                    best = (candidate, distance)
+                    if distance == 1:
+                        return best
+
+        return best
+
+    def _generate_deletes(self, word: str) -> Set[str]:
+        """最大編集距離までの削除文字列を列挙 (元の文字列を含む)"""
+        deletes = {word}
+        frontier = {word}
+
+        for _ in range(self._max_edit_distance):
+            next_frontier = set()
+            for item in frontier:
+                if len(item) <= 1:
+                    continue
+                for i in range(len(item)):
+                    next_frontier.add(item[:i] + item[i + 1 :])
+            next_frontier -= deletes
+            deletes |= next_frontier
+            frontier = next_frontier
+
+        return deletes
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+
+class FuzzyVocabularyCorrector:
+    """語彙リストに基づくファジー補正"""
+
+    def __init__(
+        self,
+        max_edit_distance: int = 1,
+        min_confidence: float = 0.8,
+        min_token_length: int = 4,
+    ):
+        self._max_edit_distance = max_edit_distance
+        self._min_confidence = min_confidence
+        self._min_token_length = min_token_length
+        self._index = SymSpellIndex(max_edit_distance=max_edit_distance)
+
+    @classmethod
+    def from_file(
+        cls,
+        file_path: Path,
+        max_edit_distance: int = 1,
+        min_confidence: float = 0.8,
+        min_token_length: int = 4,
+    ) -> "FuzzyVocabularyCorrector":
+        """語彙ファイル (1行1語, #でコメント) から構築"""
+        corrector = cls(max_edit_distance, min_confidence, min_token_length)
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            terms = (line.strip() for line in f)
+            corrector._index.add_terms(
+                term for term in terms if term and not term.startswith("#")
+            )
+
+        logger.info(f"語彙インデックス構築完了: {len(corrector._index)}語")
+        return corrector
+
+    def add_terms(self, terms: Iterable[str]):
+        """語彙を追加"""
+        self._index.add_terms(terms)
+
+    def correct(self, text: str) -> str:
+        """テキスト中のトークンを最も近い語彙に置き換える"""
+        return TOKEN_PATTERN.sub(self._correct_token, text)
+
+    def _correct_token(self, match: "re.Match[str]") -> str:
+        """トークン単位の補正"""
+        token = match.group(0)
+        if len(token) < self._min_token_length:
+            return token
+
+        result = self._index.lookup(token)
+        if result is None:
+            return token
+
+        term, distance = result
+        if distance == 0:
+            return token
+
+        confidence = 1.0 - distance / max(len(token), len(term))
+        if confidence < self._min_confidence:
+            return token
+
+        logger.debug("ファジー補正: '%s' → '%s' (信頼度 %.2f)", token, term, confidence)
+        return term
+
+    @property
+    def vocabulary_size(self) -> int:
+        """語彙数"""
+        return len(self._index)
@@ -0,0 +1,226 @@
+"""漢数字 → アラビア数字 正規化 (単一パス走査)"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DIGIT = 0
+_SMALL_UNIT = 1
+_LARGE_UNIT = 2
+
+# 文字 → (種別, 値) の遷移表
+_CHAR_TABLE: Dict[str, Tuple[int, int]] = {
+    **{ch: (_DIGIT, value) for value, ch in enumerate("〇一二三四五六七八九")},
+    **{ch: (_DIGIT, value) for value, ch in enumerate("0123456789")},
+    **{ch: (_DIGIT, value) for value, ch in enumerate("０１２３４５６７８９")},
+    "零": (_DIGIT, 0),
+    "十": (_SMALL_UNIT, 10),
+    "百": (_SMALL_UNIT, 100),
+    "千": (_SMALL_UNIT, 1000),
+    "万": (_LARGE_UNIT, 10**4),
+    "億": (_LARGE_UNIT, 10**8),
+    "兆": (_LARGE_UNIT, 10**12),
+}
+
+_KANJI_NUMERALS = frozenset("〇零一二三四五六七八九十百千万億兆")
+_CANDIDATE_PATTERN = re.compile("[" + re.escape("".join(_CHAR_TABLE)) + "]")
+_DECIMAL_POINT = "点"
+
+# 直前にあっても数字として扱う接頭の漢字 (第三 → 第3 など)
+_ALLOWED_PREFIXES = frozenset("第約計毎各全")
+
+# 1文字の漢数字を変換する条件となる後続の助数詞
+COUNTERS = (
+    "ヶ月", "か月", "カ月", "ケ月", "箇所", "か所", "ヶ所", "時間", "週間",
+    "年間", "日間", "単位", "mmHg", "個", "人", "歳", "才", "回", "日", "月",
+    "年", "時", "分", "秒", "円", "件", "本", "枚", "錠", "度", "割", "倍",
+    "名", "階", "番", "号", "週", "滴", "袋", "包", "点", "mg", "kg", "ml",
+    "mL", "cc", "g", "L", "%", "％",
+)
+
+# 数値ではない慣用表現・複合語・地名 (変換しない)
+EXCLUDED_WORDS = (
+    "万一", "万が一", "千差万別", "一石二鳥", "十人十色", "十分な", "十分に",
+    "十分だ", "十分で", "一部", "一方", "一般", "一緒", "一応", "一旦",
+    "一層", "一気", "一切", "一体", "一定", "一致", "一連", "一貫", "一様",
+    "一時的", "一度も", "一番",
+    # 複合語・慣用表現
+    "一時中断", "一時停止", "一時休止", "一時保留", "一時保存", "一時帰宅",
+    "一時退院", "一時金", "三日月", "三日坊主", "五分五分", "八百屋", "八百長",
+    "八十八夜", "四百四病", "七五三", "十中八九", "四六時中",
+    "二束三文", "三寒四温", "四苦八苦", "五十歩百歩", "百発百中", "千載一遇",
+    "一期一会", "一朝一夕", "一長一短", "一進一退", "九死に一生", "百人一首",
+    "二人三脚", "三三五五", "千羽鶴", "七転八倒", "十年一日",
+    # 地名
+    "九十九里", "九十九島", "四日市", "五日市", "八日市", "十日町", "六本木",
+    "四万十", "百人町", "千日前", "八十八ヶ所", "三軒茶屋",
+)
+
+
+def _build_prefix_table(words: Tuple[str, ...]) -> Dict[str, Tuple[str, ...]]:
+    """先頭文字 → 候補語 (長い順) の表を構築"""
+    table: Dict[str, List[str]] = {}
+    for word in words:
+        table.setdefault(word[0], []).append(word)
+    return {
+        first: tuple(sorted(candidates, key=len, reverse=True))
+        for first, candidates in table.items()
+    }
+
+
+_COUNTER_TABLE = _build_prefix_table(COUNTERS)
+_COUNTER_CHARS = frozenset(counter for counter in COUNTERS if len(counter) == 1)
+_EXCLUDED_TABLE = _build_prefix_table(EXCLUDED_WORDS)
+
+
+def _match_prefix(
+    text: str, index: int, table: Dict[str, Tuple[str, ...]]
+) -> Optional[str]:
+    """text[index:] が表のいずれかの語で始まればその語を返す"""
+    if index >= len(text):
+        return None
+    for word in table.get(text[index], ()):
+        if text.startswith(word, index):
+            return word
+    return None
+
+
+def _is_kanji(ch: str) -> bool:
+    """CJK統合漢字かどうか"""
+    return "一" <= ch <= "鿿" or ch == "々"
+
+
+def parse_numeral(run: str) -> Optional[int]:
+    """数字列 (漢数字・位取り・単位混在) を整数に変換
+
+    例: 三百二十五 → 325, 二〇二四 → 2024, 1万2千 → 12000
+
+    数を表さない並び (前に数字のない 万・億・兆、位が大きい順に並んで
+    いないもの) は None を返す。例: 万年筆の「万」, 億万長者の「億万」
+    """
+    total = 0
+    section = 0
+    digits: Optional[int] = None
+    last_small_unit = 10**4
+    last_large_unit = 10**16
+
+    for ch in run:
+        kind, value = _CHAR_TABLE[ch]
+        if kind == _DIGIT:
+            digits = value if digits is None else digits * 10 + value
+        elif kind == _SMALL_UNIT:
+            if value >= last_small_unit:
+                return None
+            section += (digits if digits is not None else 1) * value
+            digits = None
+            last_small_unit = value
+        else:
+            if value >= last_large_unit or (section == 0 and digits is None):
+                return None
+            total += (section + (digits or 0)) * value
+            section = 0
+            digits = None
+            last_small_unit = 10**4
+            last_large_unit = value
+
+    return total + section + (digits or 0)
+
+
+class KanjiNumeralNormalizer:
+    """漢数字をアラビア数字に正規化する単一パスの変換器
+
+    入力を先頭から一度だけ走査し、数字列を検出するたびに位取り・単位
+    (十・百・千・万・億・兆) と小数点 (点) を解釈して置き換える。
+    1文字だけの漢数字は助数詞が続く場合にのみ変換し、直前が漢字の場合
+    (統一・同一など) や慣用表現は変換しない。
+    """
+
+    def normalize(self, text: str) -> str:
+        """テキスト中の漢数字を変換"""
+        output: List[str] = []
+        length = len(text)
+        start = 0
+        i = 0
+
+        while i < length:
+            # 次の数字候補まで読み飛ばす
+            match = _CANDIDATE_PATTERN.search(text, i)
+            if match is None:
+                break
+            i = match.start()
+
+            excluded = _match_prefix(text, i, _EXCLUDED_TABLE)
+            if excluded is not None:
+                i += len(excluded)
+                continue
+
+            end = i
+            has_kanji = False
+            while end < length and text[end] in _CHAR_TABLE:
+                has_kanji = has_kanji or text[end] in _KANJI_NUMERALS
+                end += 1
+            run = text[i:end]
+
+            # 算用数字のみの列はそのまま
+            if not has_kanji:
+                i = end
+                continue
+
+            fraction = ""
+            if (
+                end + 1 < length
+                and text[end] == _DECIMAL_POINT
+                and text[end + 1] in _CHAR_TABLE
+                and _CHAR_TABLE[text[end + 1]][0] == _DIGIT
+            ):
+                fraction_end = end + 1
+                while (
+                    fraction_end < length
+                    and text[fraction_end] in _CHAR_TABLE
+                    and _CHAR_TABLE[text[fraction_end]][0] == _DIGIT
+                ):
+                    fraction += str(_CHAR_TABLE[text[fraction_end]][1])
+                    fraction_end += 1
+                end = fraction_end
+
+            if not self._should_convert(text, i, run, end, bool(fraction)):
+                i = end
+                continue
+
+            value = parse_numeral(run)
+            if value is None:
+                i = end
+                continue
+
+            output.append(text[start:i])
+            number = str(value)
+            output.append(f"{number}.{fraction}" if fraction else number)
+            start = i = end
+
+        if start == 0:
+            return text
+
+        output.append(text[start:])
+        return "".join(output)
+
+    @staticmethod
+    def _should_convert(
+        text: str, start: int, run: str, end: int, has_fraction: bool
+    ) -> bool:
+        """検出した数字列を変換するか判定"""
+        if start > 0:
+            previous = text[start - 1]
+            # 直前の助数詞は別の数の終わり (1日三回 など)
+            if (
+                _is_kanji(previous)
+                and previous not in _ALLOWED_PREFIXES
+                and previous not in _COUNTER_CHARS
+            ):
+                return False
+
+        if len(run) > 1 or has_fraction:
+            return True
+
+        return _match_prefix(text, end, _COUNTER_TABLE) is not None
@@ -1,11 +1,16 @@
 """文字起こしオーケストレーター - 全体制御"""
 
 import logging
+import time
+from typing import Optional
 
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
+from application.transcript_differ import PartialTranscriptDiffer
 from config.settings import AppSettings
-from domain.models import RecordingState, Transcript
+from domain.exceptions import TextProcessingError
+from domain.models import PartialTextDelta, RecordingState, Transcript
+from utils.latency_tracer import LatencyTracer
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +22,7 @@ class TranscriptionOrchestrator(QObject):
     state_changed = pyqtSignal(RecordingState)
 
     # テキスト関連Signal
-    partial_text_ready = pyqtSignal(str)  # UI表示用（グレー）
+    partial_delta_ready = pyqtSignal(PartialTextDelta)  # UI表示用（差分のみ）
     committed_text_ready = pyqtSignal(str)  # UI表示用（黒）
     processed_text_ready = pyqtSignal(str)  # 後処理済み（貼り付け用）
 
@@ -33,15 +38,25 @@ class TranscriptionOrchestrator(QObject):
         client,  # RealtimeTranscriptionClient
         text_processor,  # TextPostProcessor
         settings: AppSettings,
+        tracer: Optional[LatencyTracer] = None,
     ):
         super().__init__()
         self._recorder = recorder
         self._client = client
         self._text_processor = text_processor
         self._settings = settings
+        self._tracer = tracer
 
         self._current_state = RecordingState.IDLE
         self._use_punctuation = settings.recording.use_punctuation
+        self._process_partials = settings.text.process_partials
+        self._partial_differ = PartialTranscriptDiffer()
+
+        # 録音時間 (録音中のみ1秒ごとに通知)
+        self._recording_started_at = 0.0
+        self._duration_timer = QTimer(self)
+        self._duration_timer.setInterval(1000)
+        self._duration_timer.timeout.connect(self._emit_recording_duration)
 
         # Signal/Slot接続
         self._connect_signals()
@@ -177,14 +192,33 @@ class TranscriptionOrchestrator(QObject):
         self._text_processor.set_punctuation_enabled(self._use_punctuation)
         logger.info(f"句読点使用: {self._use_punctuation}")
 
+    def reset_partial_diff(self):
+        """部分結果の差分状態をリセット (表示クリア時)"""
+        self._partial_differ.reset()
+
     def _set_state(self, new_state: RecordingState):
         """状態を更新してSignalを発火"""
         if self._current_state != new_state:
             old_state = self._current_state
             self._current_state = new_state
+            self._update_duration_timer(new_state)
             self.state_changed.emit(new_state)
             logger.info(f"状態遷移: {old_state.name} → {new_state.name}")
 
+    def _update_duration_timer(self, state: RecordingState):
+        """録音時間の通知を開始/停止"""
+        if state == RecordingState.RECORDING:
+            self._recording_started_at = time.monotonic()
+            self.recording_duration_changed.emit(0)
+            self._duration_timer.start()
+        else:
+            self._duration_timer.stop()
+
+    def _emit_recording_duration(self):
+        """録音時間 (秒) を通知"""
+        seconds = int(time.monotonic() - self._recording_started_at)
+        self.recording_duration_changed.emit(seconds)
+
     def _on_audio_chunk(self, data: bytes):
         """音声チャンク受信時の処理"""
         import asyncio
@@ -197,18 +231,38 @@ class TranscriptionOrchestrator(QObject):
 
     def _on_partial_transcript(self, transcript: Transcript):
         """部分結果受信時の処理"""
-        logger.debug(f"部分結果: {transcript.text}")
-        self.partial_text_ready.emit(transcript.text)
+        logger.debug("部分結果: %s", transcript.text)
+
+        text = transcript.text
+        if self._process_partials:
+            text = self._text_processor.process_partial(text)
+
+        # 前回の部分結果との差分（変更された末尾のみ）
+        delta = self._partial_differ.diff(text)
+        if delta is not None:
+            self.partial_delta_ready.emit(delta)
 
     def _on_committed_transcript(self, transcript: Transcript):
         """確定結果受信時の処理"""
-        logger.debug(f"確定結果: {transcript.text}")
+        logger.debug("確定結果: %s", transcript.text)
 
-        # UI表示用
-        self.committed_text_ready.emit(transcript.text)
+        # 次の発話の部分結果は先頭から
+        self._partial_differ.reset()
 
         # 後処理を適用
-        processed_text = self._text_processor.process(transcript.text)
+        try:
+            processed_text = self._text_processor.process(transcript.text)
+        except TextProcessingError:
+            # UI表示は元のテキストで行い、貼り付けられない発話のトレースを残さない
+            self.committed_text_ready.emit(transcript.text)
+            if self._tracer is not None:
+                self._tracer.discard_unprocessed()
+            raise
+        if self._tracer is not None:
+            self._tracer.mark_processed()
+
+        # UI表示用 (部分結果のプレビューと表示を揃える)
+        self.committed_text_ready.emit(processed_text)
 
         # 後処理済みテキスト（貼り付け用）
         self.processed_text_ready.emit(processed_text)
@@ -218,6 +272,7 @@ class TranscriptionOrchestrator(QObject):
     def _on_recording_started(self):
         """録音開始時の処理"""
         logger.debug("録音開始Signal受信")
+        self._partial_differ.reset()
 
     def _on_recording_stopped(self):
         """録音停止時の処理"""
@@ -0,0 +1,109 @@
+"""性能モニター - パイプラインの指標を一定間隔でサンプリング"""
+
+import logging
+import time
+from typing import Optional
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+from domain.models import PerformanceSnapshot, Transcript
+from utils.histogram import LatencyHistogram
+from utils.loop_monitor import EventLoopLagMonitor
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceSampler(QObject):
+    """送信キュー・往復遅延・受信レート・ループ遅延を定期的に集計
+
+    サンプリングはメインスレッドのタイマーで行い、各指標は既存の
+    カウンタを読むだけなので、録音中でも負荷はほぼ発生しない。
+    ループ遅延は EventLoopLagMonitor があればその区間最大値を、
+    なければタイマー自身の発火遅れを使う。
+    """
+
+    # Signal定義
+    snapshot_ready = pyqtSignal(PerformanceSnapshot)
+
+    def __init__(
+        self,
+        client,  # RealtimeTranscriptionClient
+        interval_ms: int = 1000,
+        window: int = 100,
+        loop_monitor: Optional[EventLoopLagMonitor] = None,
+    ):
+        super().__init__()
+        self._client = client
+        self._interval_ms = interval_ms
+        self._loop_monitor = loop_monitor
+
+        self._partial_count = 0
+        self._utterance_start_ns: Optional[int] = None
+        self._commit_latency = LatencyHistogram(window)
+        self._last_tick_ns = 0
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._sample)
+
+        self._client.partial_transcript_received.connect(self._on_partial)
+        self._client.committed_transcript_received.connect(self._on_committed)
+
+        logger.info(f"PerformanceSampler 初期化完了 ({interval_ms}ms間隔)")
+
+    def start(self):
+        """サンプリングを開始"""
+        self._partial_count = 0
+        self._last_tick_ns = time.monotonic_ns()
+        self._timer.start(self._interval_ms)
+
+    def stop(self):
+        """サンプリングを停止"""
+        self._timer.stop()
+
+    @property
+    def is_running(self) -> bool:
+        """サンプリング中か"""
+        return self._timer.isActive()
+
+    def _on_partial(self, transcript: Transcript):
+        """部分結果の受信を集計"""
+        self._partial_count += 1
+        if self._utterance_start_ns is None:
+            self._utterance_start_ns = transcript.received_ns
+
+    def _on_committed(self, transcript: Transcript):
+        """確定までの所要時間を集計"""
+        if self._utterance_start_ns is not None:
+            elapsed_ms = (transcript.received_ns - self._utterance_start_ns) / 1e6
+            self._commit_latency.record(elapsed_ms)
+            self._utterance_start_ns = None
+
+    def _sample(self):
+        """指標を集計してSignalを発火"""
+        now = time.monotonic_ns()
+        elapsed_ms = (now - self._last_tick_ns) / 1e6
+        self._last_tick_ns = now
+
+        partial_rate = self._partial_count / (elapsed_ms / 1000) if elapsed_ms else 0.0
+        self._partial_count = 0
+
+        commit_latency_ms = None
+        if len(self._commit_latency):
+            commit_latency_ms = self._commit_latency.percentile(50)
+
+        if self._loop_monitor is not None:
+            loop_lag_ms = self._loop_monitor.take_recent_max_ms()
+        else:
+            loop_lag_ms = max(0.0, elapsed_ms - self._interval_ms)
+
+        snapshot = PerformanceSnapshot(
+            queue_depth=self._client.queue_depth,
+            queue_capacity=self._client.queue_capacity,
+            dropped_chunks=self._client.dropped_chunks,
+            rtt_ms=self._client.round_trip_ms,
+            partial_rate=partial_rate,
+            commit_latency_ms=commit_latency_ms,
+            loop_lag_ms=loop_lag_ms,
+        )
+        self.snapshot_ready.emit(snapshot)
@@ -0,0 +1,145 @@
+"""置換ルールプロファイル管理 - コンパイル済みエンジンのLRUキャッシュ"""
+
+import logging
+import re
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional, Pattern, Tuple
+
+from domain.models import ReplacementRule
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledReplacementEngine:
+    """コンパイル済み置換ルールセット (不変)"""
+
+    def __init__(self, name: str, rules: List[ReplacementRule]):
+        self._name = name
+        self._steps: List[Tuple[Optional[Pattern[str]], ReplacementRule]] = []
+
+        for rule in rules:
+            if not rule.is_regex:
+                self._steps.append((None, rule))
+                continue
+
+            try:
+                self._steps.append((re.compile(rule.pattern), rule))
+            except re.error as e:
+                logger.error(f"正規表現のコンパイルに失敗しました: {rule} - {e}")
+
+        self._size_bytes = self._estimate_size()
+
+    def apply(self, text: str) -> str:
+        """置換ルールを順番に適用"""
+        for compiled, rule in self._steps:
+            try:
+                if compiled is not None:
+                    text = compiled.sub(rule.replacement, text)
+                else:
+                    text = text.replace(rule.pattern, rule.replacement)
+
+            except Exception as e:
+                logger.error(f"置換ルール適用エラー: {rule} - {e}")
+                continue
+
+        return text
+
+    def _estimate_size(self) -> int:
+        """おおよそのメモリ使用量 (バイト) を見積もる"""
+        size = sys.getsizeof(self._steps)
+        for compiled, rule in self._steps:
+            size += sys.getsizeof(rule.pattern) + sys.getsizeof(rule.replacement)
+            if compiled is not None:
+                # コンパイル済みパターンの内部表現はパターン長に概ね比例する
+                size += sys.getsizeof(compiled) + len(rule.pattern) * 16
+        return size
+
+    @property
+    def name(self) -> str:
+        """プロファイル名"""
+        return self._name
+
+    @property
+    def rule_count(self) -> int:
+        """有効なルール数"""
+        return len(self._steps)
+
+    @property
+    def size_bytes(self) -> int:
+        """見積もりメモリ使用量 (バイト)"""
+        return self._size_bytes
+
+
+class ReplacementProfileCache:
+    """プロファイル名をキーとしたコンパイル済みエンジンのLRUキャッシュ
+
+    エントリ数とメモリ見積もりの両方で上限を設け、超過時は最も古く
+    使われたプロファイルから破棄する。
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Path], List[ReplacementRule]],
+        max_entries: int = 4,
+        max_bytes: int = 32 * 1024 * 1024,
+    ):
+        self._loader = loader
+        self._max_entries = max(1, max_entries)
+        self._max_bytes = max_bytes
+        self._engines: "OrderedDict[str, CompiledReplacementEngine]" = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, name: str, path: Path) -> CompiledReplacementEngine:
+        """エンジンを取得 (未キャッシュの場合はロードしてコンパイル)"""
+        engine = self._engines.get(name)
+        if engine is not None:
+            self._engines.move_to_end(name)
+            return engine
+
+        rules = self._loader(path)
+        engine = CompiledReplacementEngine(name, rules)
+        self._put(name, engine)
+        logger.info(
+            f"プロファイルをコンパイルしました: {name} "
+            f"({engine.rule_count}件, 約{engine.size_bytes // 1024}KB)"
+        )
+        return engine
+
+    def invalidate(self, name: Optional[str] = None):
+        """キャッシュを破棄 (name省略時は全て)"""
+        if name is None:
+            self._engines.clear()
+            self._total_bytes = 0
+            return
+
+        engine = self._engines.pop(name, None)
+        if engine is not None:
+            self._total_bytes -= engine.size_bytes
+
+    def _put(self, name: str, engine: CompiledReplacementEngine):
+        """エンジンを登録して上限を超えた分を破棄"""
+        self.invalidate(name)
+        self._engines[name] = engine
+        self._total_bytes += engine.size_bytes
+
+        # 直近に追加したエントリは上限超過でも保持する
+        while len(self._engines) > 1 and (
+            len(self._engines) > self._max_entries
+            or self._total_bytes > self._max_bytes
+        ):
+            evicted_name, evicted = self._engines.popitem(last=False)
+            self._total_bytes -= evicted.size_bytes
+            logger.debug(f"プロファイルをキャッシュから破棄: {evicted_name}")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._engines
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    @property
+    def total_bytes(self) -> int:
+        """キャッシュ全体の見積もりメモリ使用量 (バイト)"""
+        return self._total_bytes
@@ -0,0 +1,150 @@
+"""セッション履歴 - 録音セッションごとの文字起こし結果を保存"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from domain.models import RecordingSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionHistory:
+    """録音セッションの履歴 (JSONファイルに保存)
+
+    2パス目の文字起こし結果はワーカースレッドで届くため、
+    更新はロックで保護する。上限を超えた古いセッションは録音ファイルと共に削除する。
+    録音開始時などにメインスレッドを待たせないよう、ファイルへの書き込みと
+    録音ファイルの削除は保存用スレッドで行う。
+    """
+
+    def __init__(self, history_file: Path, max_sessions: int = 500):
+        self._history_file = history_file
+        self._max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, RecordingSession]" = OrderedDict()
+        self._evicted_audio: List[str] = []
+        self._save_requested = threading.Event()
+        self._closed = False
+        self._saver: Optional[threading.Thread] = None
+        self._load()
+
+    def _load(self):
+        if not self._history_file.exists():
+            return
+        try:
+            with open(self._history_file, encoding="utf-8") as f:
+                data = json.load(f)
+            for item in data.get("sessions", []):
+                item["start_time"] = datetime.fromisoformat(item["start_time"])
+                if item.get("end_time"):
+                    item["end_time"] = datetime.fromisoformat(item["end_time"])
+                session = RecordingSession(**item)
+                self._sessions[session.session_id] = session
+            logger.info(f"セッション履歴を読み込みました: {len(self._sessions)}件")
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.error(f"セッション履歴の読み込みエラー: {e}")
+
+    def _request_save(self):
+        """保存用スレッドに保存を依頼 (ロックを取得した状態で呼び出す)"""
+        if self._closed:
+            return
+        if self._saver is None:
+            self._saver = threading.Thread(
+                target=self._saver_loop, name="SessionHistorySaver", daemon=True)
+            self._saver.start()
+        self._save_requested.set()
+
+    def _saver_loop(self):
+        while True:
+            self._save_requested.wait()
+            self._save_requested.clear()
+            if self._closed:
+                break
+            self._save()
+
+    def close(self):
+        """保存用スレッドを止め、最新の状態を書き出す"""
+        with self._lock:
+            self._closed = True
+            saver = self._saver
+            self._saver = None
+        self._save_requested.set()
+        if saver is not None:
+            saver.join()
+        self._save()
+
+    def _save(self):
+        """一時ファイルに書いてから置き換え (書き込み途中で終了しても壊さない)"""
+        with self._lock:
+            data = []
+            for session in self._sessions.values():
+                item = asdict(session)
+                item["start_time"] = session.start_time.isoformat()
+                item["end_time"] = session.end_time.isoformat() if session.end_time else None
+                data.append(item)
+            evicted_audio, self._evicted_audio = self._evicted_audio, []
+
+        for audio_path in evicted_audio:
+            try:
+                os.remove(audio_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"録音ファイルの削除に失敗: {e}")
+
+        try:
+            self._history_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self._history_file.with_name(self._history_file.name + ".tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"sessions": data}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_file, self._history_file)
+        except OSError as e:
+            logger.error(f"セッション履歴の保存エラー: {e}")
+
+    def add(self, session: RecordingSession):
+        """セッションを追加"""
+        with self._lock:
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self._max_sessions:
+                _, evicted = self._sessions.popitem(last=False)
+                if evicted.audio_path:
+                    self._evicted_audio.append(evicted.audio_path)
+            self._request_save()
+
+    def finish(self, session_id: str, realtime_text: str):
+        """録音終了時にリアルタイム文字起こしの結果を記録"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.end_time = datetime.now()
+            session.realtime_text = realtime_text
+            self._request_save()
+
+    def apply_refined_text(self, session_id: str, text: str) -> bool:
+        """2パス目の結果でセッションの文字起こしを置き換え"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                logger.warning(f"履歴にないセッションです: {session_id}")
+                return False
+            session.refined_text = text
+            self._request_save()
+        logger.info(f"セッション {session_id} を2パス目の結果で更新しました")
+        return True
+
+    def get(self, session_id: str) -> Optional[RecordingSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def sessions(self) -> List[RecordingSession]:
+        """新しい順のセッション一覧"""
+        with self._lock:
+            return list(reversed(self._sessions.values()))
@@ -1,47 +1,191 @@
 """テキスト後処理パイプライン"""
 
+import functools
 import logging
 import re
+import time
 from pathlib import Path
-from typing import List
-
+from typing import Dict, List, Optional
+
+from application.fuzzy_corrector import FuzzyVocabularyCorrector
+from application.numeral_normalizer import KanjiNumeralNormalizer
+from application.replacement_profiles import (
+    CompiledReplacementEngine,
+    ReplacementProfileCache,
+)
 from config.settings import AppSettings
 from domain.exceptions import TextProcessingError
 from domain.models import ReplacementRule
+from utils.metrics import REGISTRY
 
 logger = logging.getLogger(__name__)
 
+_PROCESSED_SEGMENTS = REGISTRY.counter(
+    "voicescribe_text_segments_processed_total", "後処理したテキストの件数"
+)
+_PROCESSING_ERRORS = REGISTRY.counter(
+    "voicescribe_text_processing_errors_total", "後処理のエラー数"
+)
+_PROCESSING_SECONDS = REGISTRY.histogram(
+    "voicescribe_text_processing_seconds",
+    "後処理1件あたりの所要時間",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+_PARTIALS_PROCESSED = REGISTRY.counter(
+    "voicescribe_text_partials_processed_total", "後処理した部分結果 (プレビュー) の件数"
+)
+_PARTIAL_PROCESSING_SECONDS = REGISTRY.histogram(
+    "voicescribe_text_partial_processing_seconds",
+    "部分結果1件あたりの後処理の所要時間",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+_SENTENCE_REUSE_MISMATCHES = REGISTRY.counter(
+    "voicescribe_text_sentence_reuse_mismatches_total",
+    "文単位の処理結果が全体の処理結果と一致しなかった確定結果の数",
+)
+
+# 部分結果を文単位で分割する区切り文字
+SENTENCE_DELIMITER = re.compile(r"[。！？!?]")
+
 
 class TextPostProcessor:
     """テキスト後処理パイプライン"""
 
-    def __init__(self, settings: AppSettings):
+    DEFAULT_PROFILE = "default"
+
+    def __init__(self, settings: AppSettings, defer_load: bool = False):
         self._settings = settings
         self._use_punctuation = settings.recording.use_punctuation
-        self._replacement_rules: List[ReplacementRule] = []
-
-        # 置換ルールをロード
-        self.reload_replacements()
+        self._profile_cache = ReplacementProfileCache(
+            loader=self._load_replacements_from_file,
+            max_entries=settings.text.profile_cache_size,
+            max_bytes=settings.text.profile_cache_max_mb * 1024 * 1024,
+        )
+        self._profile_paths: Dict[str, Path] = {}
+        self._active_profile = settings.text.active_profile
+        self._engine: Optional[CompiledReplacementEngine] = None
+        self._fuzzy_corrector: Optional[FuzzyVocabularyCorrector] = None
+        self._numeral_normalizer: Optional[KanjiNumeralNormalizer] = (
+            KanjiNumeralNormalizer() if settings.text.normalize_numerals else None
+        )
+
+        # 部分結果用の文単位の処理結果キャッシュ (文 → 処理済みの文)
+        self._process_partials = settings.text.process_partials
+        self._cached_sentence = functools.lru_cache(
+            maxsize=settings.text.partial_cache_size
+        )(self._run_pipeline)
+        # 文をまたぐルールで結果が変わることを確定結果で検出した場合は False
+        self._sentence_reuse = True
+
+        # 置換ルールをロード (defer_load の場合は load() を後で呼ぶ)
+        if not defer_load:
+            self.load()
 
         logger.info("TextPostProcessor 初期化完了")
 
+    def load(self):
+        """置換ルールと語彙インデックスを読み込み"""
+        self.reload_replacements()
+        self.reload_vocabulary()
+
     def process(self, text: str) -> str:
-        """メイン処理パイプライン"""
+        """メイン処理パイプライン (確定結果用)"""
         if not text:
             return text
 
+        start = time.perf_counter()
         try:
-            # 1. 句読点処理
-            text = self._apply_punctuation_rules(text)
+            processed = self._run_pipeline(text)
+            _PROCESSED_SEGMENTS.inc()
+            _PROCESSING_SECONDS.observe(time.perf_counter() - start)
 
-            # 2. 置換ルール適用
-            text = self._apply_replacements(text)
+        except Exception as e:
+            _PROCESSING_ERRORS.inc()
+            logger.error(f"テキスト処理エラー: {e}", exc_info=True)
+            raise TextProcessingError(f"処理失敗: {e}")
+
+        if self._process_partials and self._sentence_reuse:
+            self._check_sentence_reuse(text, processed)
+        return processed
 
+    def process_partial(self, text: str) -> str:
+        """部分結果の処理 (プレビュー用)
+
+        部分結果は同じ発話の伸びていく接頭辞であることが多いため、
+        区切り済みの文ごとの結果をLRUキャッシュで再利用し、
+        未確定の末尾だけを新たに処理する。文をまたぐルールで結果が
+        変わることを確定結果で検出した後は、部分結果全体を処理する。
+        """
+        if not text:
             return text
 
+        start = time.perf_counter()
+        try:
+            if self._sentence_reuse:
+                processed = self._process_by_sentence(text)
+            else:
+                processed = self._run_pipeline(text)
         except Exception as e:
-            logger.error(f"テキスト処理エラー: {e}", exc_info=True)
-            raise TextProcessingError(f"処理失敗: {e}")
+            # プレビューなので処理に失敗した場合は元のテキストを表示
+            logger.debug(f"部分結果の処理エラー: {e}")
+            return text
+
+        _PARTIALS_PROCESSED.inc()
+        _PARTIAL_PROCESSING_SECONDS.observe(time.perf_counter() - start)
+        return processed
+
+    def _run_pipeline(self, text: str) -> str:
+        """後処理の各段階を適用 (計測・例外の変換は呼び出し側で行う)"""
+        # 1. 句読点処理
+        text = self._apply_punctuation_rules(text)
+
+        # 2. 漢数字正規化
+        text = self._apply_numeral_normalization(text)
+
+        # 3. 置換ルール適用
+        text = self._apply_replacements(text)
+
+        # 4. ファジー語彙補正
+        return self._apply_fuzzy_correction(text)
+
+    def _process_by_sentence(self, text: str) -> str:
+        """区切り済みの文はキャッシュから、未確定の末尾は新たに処理"""
+        pieces = []
+        start = 0
+        for match in SENTENCE_DELIMITER.finditer(text):
+            pieces.append(self._cached_sentence(text[start : match.end()]))
+            start = match.end()
+
+        tail = text[start:]
+        if tail:
+            pieces.append(self._run_pipeline(tail))
+        return "".join(pieces)
+
+    def _check_sentence_reuse(self, text: str, processed: str):
+        """文単位の処理結果が確定結果の処理結果と一致するか検証
+
+        置換ルールなどが文の区切りをまたいで一致する場合は一致しないため、
+        以降の部分結果は全体を処理する (ルール変更時に再び有効にする)。
+        """
+        try:
+            by_sentence = self._process_by_sentence(text)
+        except Exception as e:
+            logger.debug(f"文単位の処理結果の検証エラー: {e}")
+            return
+
+        if by_sentence != processed:
+            _SENTENCE_REUSE_MISMATCHES.inc()
+            self._sentence_reuse = False
+            self._cached_sentence.cache_clear()
+            logger.info(
+                "文の区切りをまたぐ後処理があるため、部分結果の文単位の再利用を無効化: "
+                f"'{by_sentence[:50]}' != '{processed[:50]}'"
+            )
+
+    def _invalidate_partial_cache(self):
+        """設定・ルール変更時に部分結果キャッシュを破棄し、文単位の再利用を再開"""
+        self._cached_sentence.cache_clear()
+        self._sentence_reuse = True
 
     def _apply_punctuation_rules(self, text: str) -> str:
         """句読点処理を適用"""
@@ -53,50 +197,149 @@ class TextPostProcessor:
 
         return text
 
+    def _apply_numeral_normalization(self, text: str) -> str:
+        """漢数字をアラビア数字に変換"""
+        if self._numeral_normalizer is None:
+            return text
+
+        return self._numeral_normalizer.normalize(text)
+
     def _apply_replacements(self, text: str) -> str:
         """置換ルールを適用"""
-        if not self._replacement_rules:
+        engine = self._engine
+        if engine is None or engine.rule_count == 0:
             return text
 
         original_text = text
-
-        for rule in self._replacement_rules:
-            try:
-                if rule.is_regex:
-                    # 正規表現置換
-                    text = re.sub(rule.pattern, rule.replacement, text)
-                else:
-                    # 完全一致置換
-                    text = text.replace(rule.pattern, rule.replacement)
-
-            except Exception as e:
-                logger.error(f"置換ルール適用エラー: {rule} - {e}")
-                continue
+        text = engine.apply(text)
 
         if text != original_text:
-            logger.debug(f"置換適用: '{original_text}' → '{text}'")
+            logger.debug("置換適用: '%s' → '%s'", original_text, text)
 
         return text
 
+    def _apply_fuzzy_correction(self, text: str) -> str:
+        """語彙リストに基づくファジー補正を適用"""
+        if self._fuzzy_corrector is None:
+            return text
+
+        return self._fuzzy_corrector.correct(text)
+
+    def reload_vocabulary(self):
+        """ファジー補正用の語彙インデックスを再構築"""
+        self._invalidate_partial_cache()
+        text_settings = self._settings.text
+        if not text_settings.fuzzy_enabled:
+            self._fuzzy_corrector = None
+            return
+
+        vocabulary_file = self._settings.paths.vocabulary_file
+        if not vocabulary_file.exists():
+            logger.warning(f"語彙ファイルが見つかりません: {vocabulary_file}")
+            self._fuzzy_corrector = None
+            return
+
+        try:
+            self._fuzzy_corrector = FuzzyVocabularyCorrector.from_file(
+                vocabulary_file,
+                max_edit_distance=text_settings.fuzzy_max_edit_distance,
+                min_confidence=text_settings.fuzzy_min_confidence,
+                min_token_length=text_settings.fuzzy_min_token_length,
+            )
+
+        except Exception as e:
+            logger.error(f"語彙ファイル読み込みエラー: {e}", exc_info=True)
+            self._fuzzy_corrector = None
+
     def reload_replacements(self):
-        """置換ルールを再読み込み"""
-        replacements_file = self._settings.paths.replacements_file
+        """置換ルールを再読み込み (キャッシュ済みプロファイルも破棄)"""
+        self._invalidate_partial_cache()
+        self._profile_paths = self._discover_profiles()
+        self._profile_cache.invalidate()
+
+        if self._active_profile not in self._profile_paths:
+            logger.warning(
+                f"辞書プロファイルが見つかりません: {self._active_profile} "
+                f"→ {self.DEFAULT_PROFILE} を使用"
+            )
+            self._active_profile = self.DEFAULT_PROFILE
 
+        replacements_file = self._profile_paths[self._active_profile]
         if not replacements_file.exists():
             logger.warning(f"置換ルールファイルが見つかりません: {replacements_file}")
-            self._replacement_rules = []
+            self._engine = None
             return
 
         try:
-            self._replacement_rules = self._load_replacements_from_file(
-                replacements_file
+            self._engine = self._profile_cache.get(
+                self._active_profile, replacements_file
+            )
+            logger.info(
+                f"置換ルール読み込み完了: {self._engine.rule_count}件 "
+                f"(プロファイル: {self._active_profile})"
             )
-            logger.info(f"置換ルール読み込み完了: {len(self._replacement_rules)}件")
 
         except Exception as e:
             logger.error(f"置換ルール読み込みエラー: {e}", exc_info=True)
             raise TextProcessingError(f"置換ルール読み込み失敗: {e}")
 
+        self._preload_profiles()
+
+    def switch_profile(self, name: str) -> bool:
+        """辞書プロファイルを切り替え (キャッシュ済みならポインタの差し替えのみ)"""
+        path = self._profile_paths.get(name)
+        if path is None:
+            logger.error(f"未知の辞書プロファイル: {name}")
+            return False
+
+        try:
+            engine = self._profile_cache.get(name, path)
+        except Exception as e:
+            logger.error(f"辞書プロファイル切替エラー: {name} - {e}", exc_info=True)
+            return False
+
+        self._engine = engine
+        self._active_profile = name
+        self._invalidate_partial_cache()
+        logger.info(f"辞書プロファイル切替: {name} ({engine.rule_count}件)")
+        return True
+
+    def cycle_profile(self) -> str:
+        """次の辞書プロファイルに切り替えて、その名前を返す"""
+        names = self.available_profiles
+        if len(names) > 1:
+            if self._active_profile in names:
+                index = names.index(self._active_profile)
+            else:
+                index = -1
+            self.switch_profile(names[(index + 1) % len(names)])
+        return self._active_profile
+
+    def _discover_profiles(self) -> Dict[str, Path]:
+        """利用可能な辞書プロファイルを列挙"""
+        profiles = {self.DEFAULT_PROFILE: self._settings.paths.replacements_file}
+
+        profiles_dir = self._settings.paths.profiles_dir
+        if profiles_dir.is_dir():
+            for profile_file in sorted(profiles_dir.glob("*.txt")):
+                profiles.setdefault(profile_file.stem, profile_file)
+
+        logger.debug(f"辞書プロファイル: {list(profiles)}")
+        return profiles
+
+    def _preload_profiles(self):
+        """キャッシュ容量の範囲で他のプロファイルを事前コンパイル"""
+        for name, path in self._profile_paths.items():
+            if len(self._profile_cache) >= self._settings.text.profile_cache_size:
+                break
+            if name in self._profile_cache or not path.exists():
+                continue
+
+            try:
+                self._profile_cache.get(name, path)
+            except Exception as e:
+                logger.warning(f"辞書プロファイル事前読み込み失敗: {name} - {e}")
+
     def _load_replacements_from_file(self, file_path: Path) -> List[ReplacementRule]:
         """ファイルから置換ルールをロード"""
         rules = []
@@ -140,6 +383,7 @@ class TextPostProcessor:
     def set_punctuation_enabled(self, enabled: bool):
         """句読点使用を設定"""
         self._use_punctuation = enabled
+        self._invalidate_partial_cache()
         logger.info(f"句読点使用: {enabled}")
 
     @property
@@ -150,4 +394,14 @@ class TextPostProcessor:
     @property
     def replacement_count(self) -> int:
         """登録されている置換ルール数"""
-        return len(self._replacement_rules)
+        return self._engine.rule_count if self._engine is not None else 0
+
+    @property
+    def active_profile(self) -> str:
+        """現在の辞書プロファイル名"""
+        return self._active_profile
+
+    @property
+    def available_profiles(self) -> List[str]:
+        """利用可能な辞書プロファイル名"""
+        return list(self._profile_paths)
@@ -0,0 +1,51 @@
+"""部分結果の差分計算 - 安定した接頭辞を保持して末尾のみを更新"""
+
+import logging
+from typing import Optional
+
+from domain.models import PartialTextDelta
+
+logger = logging.getLogger(__name__)
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    """2つの文字列の共通接頭辞の長さ"""
+    if b.startswith(a):
+        return len(a)
+    if a.startswith(b):
+        return len(b)
+
+    # スライス比較 (C実装) による二分探索
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class PartialTranscriptDiffer:
+    """部分結果を前回との差分 (保持文字数 + 変更された末尾) に変換"""
+
+    def __init__(self):
+        self._previous = ""
+
+    def diff(self, text: str) -> Optional[PartialTextDelta]:
+        """差分を計算 (変更がない場合はNone)"""
+        if text == self._previous:
+            return None
+
+        keep_length = common_prefix_length(self._previous, text)
+        self._previous = text
+        return PartialTextDelta(keep_length=keep_length, tail=text[keep_length:])
+
+    def reset(self):
+        """前回の部分結果を破棄 (確定時・クリア時)"""
+        self._previous = ""
+
+    @property
+    def current_text(self) -> str:
+        """現在の部分結果"""
+        return self._previous
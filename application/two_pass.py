@@ -0,0 +1,228 @@
+"""2パス文字起こし - 録音を保存し、アイドル時にバッチAPIで再文字起こし
+
+リアルタイム文字起こし (1パス目) の経路には手を加えず、録音スレッドからは
+音声チャンクをキューに積むだけにする。再文字起こし (2パス目) は録音中は
+新しいジョブを取り出さず、アイドル状態が続いた時だけ低優先度で実行する。
+"""
+
+import configparser
+import ctypes
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+from application.session_history import SessionHistory
+from config.settings import AppSettings
+from domain.exceptions import TextProcessingError
+from domain.models import RecordingSession, RecordingState
+from external_service.elevenlabs_api import get_elevenlabs_client
+from external_service.job_queue import (
+    STATUS_DONE,
+    Job,
+    JobQueue,
+    JobWorkerPool,
+    QueueOptions,
+)
+from infrastructure.session_archiver import SessionAudioArchiver
+from utils.config_manager import load_config
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND = "two_pass"
+
+
+def seconds_since_last_input() -> Optional[float]:
+    """最後のキーボード・マウス操作からの秒数 (Windows以外はNone)"""
+    if sys.platform != "win32":
+        return None
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):  # type: ignore[attr-defined]
+        return None
+    elapsed_ms = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF  # type: ignore[attr-defined]
+    return elapsed_ms / 1000.0
+
+
+def _build_batch_config(settings: AppSettings) -> configparser.ConfigParser:
+    """transcribe_audio 用の設定 (モデル・言語はバッチ用の設定で上書き)"""
+    try:
+        config = load_config()
+    except Exception as e:
+        logger.warning(f"config.ini を読み込めないため既定値を使用します: {e}")
+        config = configparser.ConfigParser()
+    if not config.has_section('ELEVENLABS'):
+        config.add_section('ELEVENLABS')
+    config['ELEVENLABS']['MODEL'] = settings.batch.model
+    config['ELEVENLABS']['LANGUAGE'] = settings.batch.language
+    return config
+
+
+class TwoPassCoordinator(QObject):
+    """録音の保存・再文字起こしジョブの投入・履歴の更新"""
+
+    # Signal定義
+    session_refined = pyqtSignal(str, str)  # (セッションID, 2パス目の文字起こし)
+
+    # ワーカースレッド → メインスレッド
+    _job_finished = pyqtSignal(object)
+
+    def __init__(
+        self,
+        recorder,  # AudioRecorderWorker
+        orchestrator,  # TranscriptionOrchestrator
+        text_processor,  # TextPostProcessor
+        settings: AppSettings,
+    ):
+        super().__init__()
+        self._settings = settings.two_pass
+        self._text_processor = text_processor
+        self._state = RecordingState.IDLE
+        self._last_activity = time.monotonic()
+
+        self._archiver = SessionAudioArchiver(
+            archive_dir=self._settings.archive_dir, settings=settings.audio
+        )
+        self._history = SessionHistory(
+            self._settings.history_file, max_sessions=self._settings.max_history_sessions
+        )
+
+        batch_config = _build_batch_config(settings)
+        queue_options = QueueOptions.from_config(batch_config)
+        self._queue = JobQueue.from_options(queue_options)
+        self._queue_options = queue_options
+        self._pool = JobWorkerPool(
+            self._queue,
+            config=batch_config,
+            client=get_elevenlabs_client(settings.elevenlabs_api_key),
+            workers=queue_options.workers,
+            poll_interval_seconds=queue_options.poll_interval_seconds,
+            on_job_finished=self._job_finished.emit,
+        )
+
+        self._session: Optional[RecordingSession] = None
+        self._session_texts: List[str] = []
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setInterval(self._settings.idle_check_interval_ms)
+        self._idle_timer.timeout.connect(self._update_worker_state)
+
+        # 音声チャンクは録音スレッドでそのままキューに積む
+        recorder.audio_chunk_ready.connect(
+            self._archiver.write_chunk, Qt.ConnectionType.DirectConnection
+        )
+        recorder.recording_started.connect(self._on_recording_started)
+        recorder.recording_stopped.connect(self._archiver.end_session)
+        orchestrator.processed_text_ready.connect(self._on_processed_text)
+        orchestrator.state_changed.connect(self._on_state_changed)
+        self._archiver.session_archived.connect(self._on_session_archived)
+        self._job_finished.connect(self._on_job_finished)
+
+        logger.info("TwoPassCoordinator 初期化完了")
+
+    @property
+    def history(self) -> SessionHistory:
+        return self._history
+
+    def start(self):
+        """アイドル判定を開始 (前回の未完了ジョブもアイドル時に実行される)"""
+        self._idle_timer.start()
+
+    def shutdown(self):
+        """保存中の録音を書き出し、ワーカーを停止"""
+        self._idle_timer.stop()
+        self._pool.stop(wait=False, cancel_running=True)
+        self._archiver.shutdown()
+        self._history.close()
+
+    def _on_recording_started(self):
+        """録音開始 - 新しいセッションの保存を開始"""
+        session_id = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+        audio_path = self._archiver.begin_session(session_id)
+        self._session = RecordingSession(
+            session_id=session_id, start_time=datetime.now(), audio_path=str(audio_path)
+        )
+        self._session_texts = []
+        self._history.add(self._session)
+
+    def _on_processed_text(self, text: str):
+        if self._session is not None:
+            self._session_texts.append(text)
+
+    def _on_state_changed(self, state: RecordingState):
+        self._state = state
+        self._last_activity = time.monotonic()
+
+        if state == RecordingState.RECORDING:
+            # 録音中は新しいジョブを取り出さず、実行中の前処理・アップロードも中断する
+            if self._pool.is_running:
+                self._pool.stop(wait=False, cancel_running=True)
+                logger.info("録音中のため2パス目の文字起こしを一時停止")
+
+        elif state in (RecordingState.IDLE, RecordingState.ERROR) and self._session is not None:
+            # 確定結果は録音停止後にも届くため、接続を閉じた時点でまとめる
+            self._history.finish(self._session.session_id, "".join(self._session_texts))
+            self._archiver.end_session()
+            self._session = None
+            self._session_texts = []
+
+    def _on_session_archived(self, session_id: str, audio_path: str):
+        """録音の書き出し完了 - 再文字起こしジョブを投入"""
+        try:
+            self._queue.submit(
+                audio_path,
+                priority=self._settings.job_priority,
+                max_attempts=self._queue_options.max_attempts,
+                payload={"kind": JOB_KIND, "session_id": session_id},
+            )
+        except Exception as e:
+            logger.error(f"再文字起こしジョブの追加に失敗: {e}")
+
+    def _update_worker_state(self):
+        """アイドル状態が続いている時だけワーカーを動かす"""
+        idle = self._state == RecordingState.IDLE and (
+            time.monotonic() - self._last_activity >= self._settings.idle_seconds
+        )
+        if idle:
+            input_idle = seconds_since_last_input()
+            idle = input_idle is None or input_idle >= self._settings.idle_seconds
+
+        if idle and not self._pool.is_running:
+            logger.info("アイドル状態のため2パス目の文字起こしを開始")
+            self._pool.start()
+        elif not idle and self._pool.is_running:
+            self._pool.stop(wait=False, cancel_running=True)
+
+    def _on_job_finished(self, job: Job):
+        """2パス目の結果で履歴を更新 (メインスレッド)"""
+        if job.payload.get("kind") != JOB_KIND:
+            return
+        session_id = job.payload.get("session_id", "")
+
+        if job.status != STATUS_DONE or job.result is None:
+            logger.warning(f"セッション {session_id} の再文字起こしに失敗: {job.error}")
+            return
+
+        try:
+            text = self._text_processor.process(job.result)
+        except TextProcessingError as e:
+            # 後処理できない場合も2パス目の結果そのものは残す
+            logger.error(f"セッション {session_id} の2パス目の後処理に失敗: {e}")
+            text = job.result
+        if self._history.apply_refined_text(session_id, text):
+            self.session_refined.emit(session_id, text)
+
+        if not self._settings.keep_audio:
+            try:
+                os.remove(job.audio_path)
+            except OSError as e:
+                logger.warning(f"録音ファイルの削除に失敗: {e}")
@@ -45,6 +45,7 @@ class HotkeySettings(BaseSettings):
     exit_app: str = Field(default="esc", description="アプリ終了")
     toggle_punctuation: str = Field(default="f9", description="句読点トグル")
     reload_replacements: str = Field(default="f8", description="置換ルール再読込")
+    cycle_profile: str = Field(default="f7", description="辞書プロファイル切替")
 
     model_config = SettingsConfigDict(env_prefix="HOTKEY_")
 
@@ -62,10 +63,51 @@ class PathSettings(BaseSettings):
     log_dir: Path = Field(
         default_factory=lambda: Path("logs"), description="ログディレクトリ"
     )
+    profiles_dir: Path = Field(
+        default_factory=lambda: Path("service/profiles"),
+        description="辞書プロファイルディレクトリ (<名前>.txt)",
+    )
+    vocabulary_file: Path = Field(
+        default_factory=lambda: Path("service/vocabulary.txt"),
+        description="ファジー補正用語彙ファイル (1行1語)",
+    )
 
     model_config = SettingsConfigDict(env_prefix="PATH_")
 
 
+class TextProcessingSettings(BaseSettings):
+    """テキスト後処理設定"""
+
+    active_profile: str = Field(default="default", description="起動時の辞書プロファイル")
+    profile_cache_size: int = Field(
+        default=4, description="メモリに保持する辞書プロファイル数"
+    )
+    profile_cache_max_mb: int = Field(
+        default=32, description="辞書プロファイルキャッシュの上限 (MB)"
+    )
+    process_partials: bool = Field(
+        default=True, description="部分結果にも後処理を適用して表示"
+    )
+    partial_cache_size: int = Field(
+        default=512, description="部分結果処理キャッシュのエントリ数"
+    )
+    normalize_numerals: bool = Field(
+        default=False, description="漢数字をアラビア数字に変換"
+    )
+    fuzzy_enabled: bool = Field(default=False, description="ファジー語彙補正を使用")
+    fuzzy_max_edit_distance: int = Field(
+        default=1, description="ファジー補正の最大編集距離"
+    )
+    fuzzy_min_confidence: float = Field(
+        default=0.8, description="ファジー補正の信頼度閾値 (1 - 距離/語長)"
+    )
+    fuzzy_min_token_length: int = Field(
+        default=4, description="ファジー補正対象の最小文字数"
+    )
+
+    model_config = SettingsConfigDict(env_prefix="TEXT_")
+
+
 class LoggingSettings(BaseSettings):
     """ログ設定"""
 
@@ -77,16 +119,126 @@ class LoggingSettings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="LOG_")
 
 
+class TracingSettings(BaseSettings):
+    """遅延トレース設定"""
+
+    enabled: bool = Field(
+        default=False, description="発話単位の遅延トレースを有効化"
+    )
+    trace_file: str = Field(
+        default="latency_trace.jsonl",
+        description="トレースファイル名 (ログディレクトリ内)",
+    )
+    max_file_size_mb: int = Field(
+        default=10, description="トレースファイルの最大サイズ (MB)"
+    )
+    backup_count: int = Field(default=3, description="トレースファイルの世代数")
+    histogram_window: int = Field(
+        default=1000, description="パーセンタイル算出に使う直近の発話数"
+    )
+
+    model_config = SettingsConfigDict(env_prefix="TRACE_")
+
+
+class DiagnosticsSettings(BaseSettings):
+    """診断設定"""
+
+    loop_monitor_enabled: bool = Field(
+        default=False, description="イベントループ遅延モニターを有効化"
+    )
+    loop_monitor_interval_ms: int = Field(
+        default=50, description="ハートビート間隔 (ミリ秒)"
+    )
+    loop_lag_threshold_ms: int = Field(
+        default=200, description="スタックを取得する遅延の閾値 (ミリ秒)"
+    )
+    stack_capture_cooldown_s: float = Field(
+        default=10.0, description="スタック取得の最小間隔 (秒)"
+    )
+    loop_lag_histogram_window: int = Field(
+        default=1000, description="パーセンタイル算出に使う直近のサンプル数"
+    )
+    loop_lag_export_file: str = Field(
+        default="loop_lag.json",
+        description="終了時に遅延の集計を書き出すファイル名 (ログディレクトリ内)",
+    )
+
+    model_config = SettingsConfigDict(env_prefix="DIAG_")
+
+
+class MetricsSettings(BaseSettings):
+    """メトリクス公開設定"""
+
+    enabled: bool = Field(
+        default=False, description="Prometheus形式のメトリクスを公開"
+    )
+    host: str = Field(default="127.0.0.1", description="待ち受けアドレス")
+    port: int = Field(default=9464, description="待ち受けポート")
+
+    model_config = SettingsConfigDict(env_prefix="METRICS_")
+
+
 class RecordingSettings(BaseSettings):
     """録音制御設定"""
 
     auto_stop_timer: int = Field(default=60, description="自動停止タイマー (秒)")
     use_punctuation: bool = Field(default=True, description="句読点を使用")
     paste_delay_ms: int = Field(default=100, description="貼り付け遅延 (ミリ秒)")
+    paste_coalesce_ms: int = Field(
+        default=0,
+        description="この時間内に届いた確定結果をまとめて貼り付け (ミリ秒, 0で無効)",
+    )
+    injection_backend: str = Field(
+        default="clipboard",
+        description="テキスト入力方式 (clipboard / unicode / recording)",
+    )
 
     model_config = SettingsConfigDict(env_prefix="RECORDING_")
 
 
+class BatchTranscriptionSettings(BaseSettings):
+    """ファイル文字起こし設定"""
+
+    model: str = Field(default="scribe_v1", description="モデル名")
+    language: str = Field(default="jpn", description="言語コード")
+    max_concurrency: int = Field(
+        default=2, description="同時に文字起こしするファイル数"
+    )
+    output_extension: str = Field(
+        default=".txt", description="結果ファイルの拡張子 (音声ファイルと同じ場所に保存)"
+    )
+
+    model_config = SettingsConfigDict(env_prefix="BATCH_")
+
+
+class TwoPassSettings(BaseSettings):
+    """2パス文字起こし設定 (録音を保存し、アイドル時にバッチAPIで再文字起こし)"""
+
+    enabled: bool = Field(default=False, description="2パス文字起こしを使用")
+    archive_dir: Path = Field(
+        default_factory=lambda: Path("archive"), description="録音の保存先"
+    )
+    history_file: Path = Field(
+        default_factory=lambda: Path("archive/sessions.json"),
+        description="セッション履歴ファイル",
+    )
+    max_history_sessions: int = Field(default=500, description="履歴の最大件数")
+    idle_seconds: int = Field(
+        default=60, description="録音・操作がこの秒数ない場合に再文字起こしを行う"
+    )
+    idle_check_interval_ms: int = Field(
+        default=5000, description="アイドル判定の間隔 (ミリ秒)"
+    )
+    job_priority: int = Field(
+        default=-10, description="ジョブの優先度 (他のジョブより後に実行)"
+    )
+    keep_audio: bool = Field(
+        default=False, description="再文字起こし後も録音を残す"
+    )
+
+    model_config = SettingsConfigDict(env_prefix="TWO_PASS_")
+
+
 class UiSettings(BaseSettings):
     """UI設定"""
 
@@ -96,6 +248,12 @@ class UiSettings(BaseSettings):
     max_transcript_lines: int = Field(
         default=1000, description="文字起こし表示最大行数"
     )
+    show_performance_hud: bool = Field(
+        default=False, description="ステータスバーに性能指標を表示"
+    )
+    performance_sample_interval_ms: int = Field(
+        default=1000, description="性能指標のサンプリング間隔 (ミリ秒)"
+    )
 
     model_config = SettingsConfigDict(env_prefix="UI_")
 
@@ -110,7 +268,15 @@ class AppSettings(BaseSettings):
     hotkeys: HotkeySettings = Field(default_factory=HotkeySettings)
     paths: PathSettings = Field(default_factory=PathSettings)
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
+    tracing: TracingSettings = Field(default_factory=TracingSettings)
+    diagnostics: DiagnosticsSettings = Field(default_factory=DiagnosticsSettings)
+    metrics: MetricsSettings = Field(default_factory=MetricsSettings)
     recording: RecordingSettings = Field(default_factory=RecordingSettings)
+    batch: BatchTranscriptionSettings = Field(
+        default_factory=BatchTranscriptionSettings
+    )
+    two_pass: TwoPassSettings = Field(default_factory=TwoPassSettings)
+    text: TextProcessingSettings = Field(default_factory=TextProcessingSettings)
     ui: UiSettings = Field(default_factory=UiSettings)
 
     model_config = SettingsConfigDict(
@@ -1,8 +1,10 @@
 """ドメインモデル定義"""
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
+from typing import Optional
 
 
 class TranscriptType(Enum):
@@ -41,12 +43,21 @@ class Transcript:
     type: TranscriptType
     timestamp: datetime
     is_processed: bool = False
+    received_ns: int = field(default_factory=time.monotonic_ns)  # 受信時刻 (単調時計)
 
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
 
 
+@dataclass
+class PartialTextDelta:
+    """部分結果の差分 (前回の部分結果に対する変更)"""
+
+    keep_length: int  # 前回の部分結果から保持する先頭の文字数
+    tail: str  # 保持部分の後ろに続く新しい文字列
+
+
 @dataclass
 class ReplacementRule:
     """テキスト置換ルール"""
@@ -86,6 +97,29 @@ class AudioChunk:
         return (samples / self.sample_rate) * 1000
 
 
+@dataclass
+class PasteTimings:
+    """貼り付け処理の所要時間 (ミリ秒)"""
+
+    text_length: int
+    queue_ms: float = 0.0  # 受付から処理開始まで
+    copy_ms: float = 0.0  # クリップボードへのコピー
+    verify_ms: float = 0.0  # クリップボード内容の検証
+    delay_ms: float = 0.0  # 貼り付け前の待機
+    inject_ms: float = 0.0  # キー入力 (Ctrl+V) の送信
+
+    @property
+    def total_ms(self) -> float:
+        """受付から貼り付け完了までの合計"""
+        return (
+            self.queue_ms
+            + self.copy_ms
+            + self.verify_ms
+            + self.delay_ms
+            + self.inject_ms
+        )
+
+
 @dataclass
 class RecordingSession:
     """録音セッション情報"""
@@ -95,6 +129,14 @@ class RecordingSession:
     end_time: datetime | None = None
     total_chunks: int = 0
     total_bytes: int = 0
+    audio_path: Optional[str] = None  # 保存した録音 (2パス目の文字起こし用)
+    realtime_text: str = ""  # リアルタイム文字起こしの結果
+    refined_text: Optional[str] = None  # 2パス目 (バッチ) の文字起こし結果
+
+    @property
+    def text(self) -> str:
+        """2パス目の結果があればそちらを優先"""
+        return self.refined_text if self.refined_text is not None else self.realtime_text
 
     @property
     def duration_seconds(self) -> float:
@@ -109,3 +151,16 @@ class RecordingSession:
     def is_active(self) -> bool:
         """セッションがアクティブか"""
         return self.end_time is None
+
+
+@dataclass
+class PerformanceSnapshot:
+    """パイプラインの性能指標 (一定間隔でサンプリング)"""
+
+    queue_depth: int = 0  # 送信待ちの音声チャンク数
+    queue_capacity: int = 0  # 送信キューの上限
+    dropped_chunks: int = 0  # キュー満杯で破棄したチャンク数 (累計)
+    rtt_ms: Optional[float] = None  # WebSocketの往復遅延 (ping/pong)
+    partial_rate: float = 0.0  # 部分結果の受信レート (件/秒)
+    commit_latency_ms: Optional[float] = None  # 最初の部分結果から確定まで (中央値)
+    loop_lag_ms: float = 0.0  # イベントループの遅れ
@@ -0,0 +1,381 @@
+import configparser
+import logging
+import os
+import tempfile
+import threading
+import time
+import wave
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.config_manager import get_config_value
+
+# 一度に読み込むフレーム数 (変換前の音声全体をメモリに載せない)
+READ_BLOCK_FRAMES = 48000 * 10
+# 無音判定の解析窓 (秒)
+ANALYSIS_WINDOW_SECONDS = 0.03
+# 間引き前のローパスフィルタのタップ数
+LOWPASS_TAPS = 63
+
+
+@dataclass
+class PreprocessOptions:
+    """アップロード前の音声変換の設定"""
+
+    enabled: bool = True
+    target_sample_rate: int = 16000
+    trim_silence: bool = True
+    silence_threshold_db: float = -45.0
+    keep_silence_seconds: float = 0.3
+    cut_internal_silence: bool = False
+    max_internal_silence_seconds: float = 1.0
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> "PreprocessOptions":
+        defaults = cls()
+        return cls(
+            enabled=config.getboolean('PREPROCESS', 'enabled', fallback=defaults.enabled),
+            target_sample_rate=get_config_value(
+                config, 'PREPROCESS', 'target_sample_rate', defaults.target_sample_rate),
+            trim_silence=config.getboolean(
+                'PREPROCESS', 'trim_silence', fallback=defaults.trim_silence),
+            silence_threshold_db=get_config_value(
+                config, 'PREPROCESS', 'silence_threshold_db', defaults.silence_threshold_db),
+            keep_silence_seconds=get_config_value(
+                config, 'PREPROCESS', 'keep_silence_seconds', defaults.keep_silence_seconds),
+            cut_internal_silence=config.getboolean(
+                'PREPROCESS', 'cut_internal_silence', fallback=defaults.cut_internal_silence),
+            max_internal_silence_seconds=get_config_value(
+                config, 'PREPROCESS', 'max_internal_silence_seconds',
+                defaults.max_internal_silence_seconds),
+        )
+
+
+@dataclass
+class PreprocessedAudio:
+    """変換後の一時ファイルと、変換後の時刻から元の時刻への対応表"""
+
+    path: str
+    duration_seconds: float
+    source_duration_seconds: float
+    original_bytes: int
+    output_bytes: int
+    # (変換後の開始秒, 元の開始秒) - 残した区間ごと
+    offset_map: List[Tuple[float, float]] = field(default_factory=list)
+
+    def to_source_time(self, seconds: float) -> float:
+        """変換後の音声の時刻を元の音声の時刻に変換"""
+        if not self.offset_map:
+            return seconds
+        index = max(0, bisect_right([start for start, _ in self.offset_map], seconds) - 1)
+        output_start, source_start = self.offset_map[index]
+        return source_start + (seconds - output_start)
+
+    def cleanup(self):
+        """一時ファイルを削除"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def decode_frames(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """PCMデータを -1.0〜1.0 のモノラル float32 に変換"""
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        values = (values << 8) >> 8  # 符号拡張
+        samples = values.astype(np.float32) / float(1 << 23)
+    elif sample_width == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / float(1 << 31)
+    else:
+        raise ValueError(f"未対応のサンプル幅: {sample_width * 8}bit")
+
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def _lowpass_taps(cutoff: float, taps: int) -> np.ndarray:
+    """窓関数法によるローパスフィルタ (cutoff はサンプリング周波数に対する比)"""
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (h / h.sum()).astype(np.float32)
+
+
+class _StreamingResampler:
+    """ブロック単位でサンプリング周波数を変換
+
+    間引く場合はエイリアシングを防ぐためにローパスフィルタをかけてから
+    線形補間する。ブロック境界をまたぐフィルタ・補間の状態を保持する。
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        self._step = source_rate / target_rate
+        self._taps: Optional[np.ndarray] = None
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._skip = 0
+        if target_rate < source_rate:
+            self._taps = _lowpass_taps(0.45 * target_rate / source_rate, LOWPASS_TAPS)
+            self._tail = np.zeros(LOWPASS_TAPS - 1, dtype=np.float32)
+            # フィルタの遅延分を捨てて時刻を揃える
+            self._skip = (LOWPASS_TAPS - 1) // 2
+        self._previous: Optional[np.ndarray] = None
+        self._position = 0.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self._taps is not None:
+            extended = np.concatenate([self._tail, block])
+            filtered = np.convolve(extended, self._taps, mode="valid").astype(np.float32)
+            self._tail = extended[len(extended) - (LOWPASS_TAPS - 1):]
+            if self._skip:
+                dropped = min(self._skip, len(filtered))
+                filtered = filtered[dropped:]
+                self._skip -= dropped
+        else:
+            filtered = block
+
+        if self._step == 1.0:
+            return filtered
+        if len(filtered) == 0:
+            return filtered
+
+        # 前のブロックの最後のサンプルを先頭に置いて境界を補間
+        samples = filtered if self._previous is None else np.concatenate([self._previous, filtered])
+        last_index = len(samples) - 1
+        if self._position >= last_index:
+            self._position -= last_index
+            self._previous = samples[-1:]
+            return np.zeros(0, dtype=np.float32)
+
+        count = int(np.ceil((last_index - self._position) / self._step))
+        positions = self._position + self._step * np.arange(count)
+        output = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+        self._position = positions[-1] + self._step - last_index
+        self._previous = samples[-1:]
+        return output
+
+    def flush(self) -> np.ndarray:
+        """フィルタの遅延分の末尾を出力"""
+        if self._taps is None:
+            return np.zeros(0, dtype=np.float32)
+        return self.process(np.zeros((LOWPASS_TAPS - 1) // 2, dtype=np.float32))
+
+
+def _to_int16(samples: np.ndarray) -> np.ndarray:
+    return np.clip(np.round(samples * 32767.0), -32768, 32767).astype(np.int16)
+
+
+def _iter_mono_int16(audio_file_path: str, target_rate: int) -> Iterator[np.ndarray]:
+    """WAVをモノラル・目標サンプリング周波数の16bitに変換しながらブロック単位で返す
+
+    同じファイルに対しては何度呼び出しても同じサンプル列を返す。
+    """
+    with wave.open(audio_file_path, "rb") as wav:
+        sample_width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        resampler = _StreamingResampler(wav.getframerate(), target_rate)
+
+        while True:
+            data = wav.readframes(READ_BLOCK_FRAMES)
+            if not data:
+                break
+            yield _to_int16(resampler.process(decode_frames(data, sample_width, channels)))
+        yield _to_int16(resampler.flush())
+
+
+class _SilenceAnalyzer:
+    """ブロック単位で受け取ったサンプルの解析窓ごとの無音判定を集める
+
+    保持するのは窓ごとの判定結果 (1時間で約12万件) と、窓に満たない
+    ブロック末尾のサンプルだけ。
+    """
+
+    def __init__(self, window: int, threshold_db: float):
+        self._window = window
+        self._threshold_db = threshold_db
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._flags: List[np.ndarray] = []
+        self.total_samples = 0
+
+    def feed(self, block: np.ndarray):
+        self.total_samples += len(block)
+        samples = np.concatenate([self._remainder, block]) if len(self._remainder) else block
+        usable = len(samples) - len(samples) % self._window
+        if usable:
+            self._flags.append(_window_silence(samples[:usable], self._window, self._threshold_db))
+        self._remainder = samples[usable:].copy()
+
+    def result(self) -> np.ndarray:
+        if not self._flags:
+            return np.zeros(0, dtype=bool)
+        return np.concatenate(self._flags)
+
+
+def _window_silence(samples: np.ndarray, window: int, threshold_db: float) -> np.ndarray:
+    """解析窓ごとに無音かどうか"""
+    window_count = len(samples) // window
+    if window_count == 0:
+        return np.zeros(0, dtype=bool)
+
+    silent = np.empty(window_count, dtype=bool)
+    # 長時間の音声でも一時配列が大きくならないよう分けて計算
+    step = 10000
+    for start in range(0, window_count, step):
+        end = min(window_count, start + step)
+        windows = samples[start * window: end * window].reshape(end - start, window)
+        windows = windows.astype(np.float32) / 32768.0
+        rms = np.sqrt(np.mean(windows * windows, axis=1))
+        silent[start:end] = 20 * np.log10(np.maximum(rms, 1e-10)) < threshold_db
+    return silent
+
+
+def plan_kept_regions(
+        silent: np.ndarray,
+        window: int,
+        total_samples: int,
+        sample_rate: int,
+        options: PreprocessOptions
+) -> List[Tuple[int, int]]:
+    """残す区間 (サンプル位置の開始・終了) を決める"""
+    voiced = np.flatnonzero(~silent)
+    if not options.trim_silence or len(voiced) == 0:
+        start_window, end_window = 0, len(silent)
+        start, end = 0, total_samples
+    else:
+        start_window, end_window = int(voiced[0]), int(voiced[-1]) + 1
+        pad = int(options.keep_silence_seconds * sample_rate)
+        start = max(0, start_window * window - pad)
+        end = min(total_samples, end_window * window + pad)
+
+    if not options.cut_internal_silence or len(voiced) == 0:
+        return [(start, end)]
+
+    # 発話の間の長い無音を keep_silence_seconds に縮める
+    max_silence_windows = max(1, int(options.max_internal_silence_seconds / ANALYSIS_WINDOW_SECONDS))
+    half_keep = int(options.keep_silence_seconds * sample_rate / 2)
+    gaps = np.diff(voiced) - 1
+    long_gaps = np.flatnonzero(gaps > max_silence_windows)
+
+    regions = []
+    region_start = start
+    for index in long_gaps:
+        gap_start = (int(voiced[index]) + 1) * window
+        gap_end = int(voiced[index + 1]) * window
+        if gap_end - gap_start <= 2 * half_keep:
+            # 前後に残す無音が重なる場合は縮めない
+            continue
+        regions.append((region_start, gap_start + half_keep))
+        region_start = gap_end - half_keep
+    regions.append((region_start, end))
+    return regions
+
+
+def preprocess_audio(
+        audio_file_path: str,
+        options: PreprocessOptions,
+        output_dir: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None
+) -> Optional[PreprocessedAudio]:
+    """アップロード用に16bitモノラルへ変換し、無音を除去した一時WAVを作成
+
+    WAV以外や変換できないファイル、無効な設定の場合は None を返し、
+    呼び出し側は元のファイルをそのまま送信する。既に目標の形式で
+    無音の除去も行わない場合も、変換不要のため None を返す。
+    cancel_event がセットされた場合もブロックの区切りで中断して None を返す。
+    """
+    if not options.enabled:
+        return None
+
+    start_time = time.perf_counter()
+    # 1回目の読み込みで無音を解析し、2回目の読み込みで残す区間を書き出す
+    # (変換後の音声全体をメモリに載せないため、デコードは2回行う)
+    try:
+        with wave.open(audio_file_path, "rb") as wav:
+            source_rate = wav.getframerate()
+            source_duration = wav.getnframes() / float(source_rate)
+            already_converted = (
+                wav.getnchannels() == 1
+                and wav.getsampwidth() == 2
+                and source_rate <= options.target_sample_rate
+            )
+        if already_converted and not options.trim_silence and not options.cut_internal_silence:
+            logging.debug(f"変換不要のため前処理を行いません: {audio_file_path}")
+            return None
+        target_rate = min(options.target_sample_rate, source_rate)
+        window = max(1, int(target_rate * ANALYSIS_WINDOW_SECONDS))
+        analyzer = _SilenceAnalyzer(window, options.silence_threshold_db)
+        for block in _iter_mono_int16(audio_file_path, target_rate):
+            if cancel_event is not None and cancel_event.is_set():
+                logging.info(f"前処理を中断しました: {audio_file_path}")
+                return None
+            analyzer.feed(block)
+    except (wave.Error, EOFError):
+        logging.debug(f"WAV以外のため前処理を行いません: {audio_file_path}")
+        return None
+    except ValueError as e:
+        logging.warning(f"前処理できない音声のため元のファイルを送信します: {str(e)}")
+        return None
+
+    total_samples = analyzer.total_samples
+    regions = plan_kept_regions(analyzer.result(), window, total_samples, target_rate, options)
+
+    file_descriptor, output_path = tempfile.mkstemp(
+        prefix="voicescribe_upload_", suffix=".wav", dir=output_dir)
+    os.close(file_descriptor)
+
+    offset_map = []
+    output_samples = 0
+    for region_start, region_end in regions:
+        offset_map.append((output_samples / target_rate, region_start / target_rate))
+        output_samples += region_end - region_start
+
+    try:
+        with wave.open(output_path, "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(target_rate)
+            block_start = 0
+            for block in _iter_mono_int16(audio_file_path, target_rate):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                block_end = block_start + len(block)
+                for region_start, region_end in regions:
+                    start = max(region_start, block_start)
+                    end = min(region_end, block_end)
+                    if start < end:
+                        out.writeframes(block[start - block_start:end - block_start].astype("<i2").tobytes())
+                block_start = block_end
+    except (OSError, wave.Error, ValueError):
+        os.remove(output_path)
+        raise
+
+    if cancel_event is not None and cancel_event.is_set():
+        logging.info(f"前処理を中断しました: {audio_file_path}")
+        os.remove(output_path)
+        return None
+
+    result = PreprocessedAudio(
+        path=output_path,
+        duration_seconds=output_samples / target_rate,
+        source_duration_seconds=source_duration,
+        original_bytes=os.path.getsize(audio_file_path),
+        output_bytes=os.path.getsize(output_path),
+        offset_map=offset_map,
+    )
+    ratio = result.original_bytes / max(1, result.output_bytes)
+    logging.info(
+        f"アップロード前処理: {result.original_bytes} → {result.output_bytes} bytes "
+        f"({ratio:.1f}分の1), {source_duration:.1f}秒 → {result.duration_seconds:.1f}秒, "
+        f"処理時間 {time.perf_counter() - start_time:.2f}秒"
+    )
+    return result
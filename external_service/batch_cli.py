@@ -0,0 +1,346 @@
+"""ディレクトリ内の音声ファイルを一括で文字起こしするコマンドラインツール
+
+使い方:
+    python -m external_service.batch_cli <ディレクトリ> [-j 並列数] [--retries 回数]
+
+結果は各音声ファイルと同じ場所に拡張子 .txt で保存する。
+処理状況はディレクトリ内のマニフェスト (JSON) に記録し、
+中断後に再実行すると完了済みのファイルは処理しない。
+"""
+
+import argparse
+import configparser
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from elevenlabs.client import ElevenLabs
+
+from config.settings import BatchTranscriptionSettings
+from external_service.elevenlabs_api import close_elevenlabs_client, setup_elevenlabs_client
+from external_service.long_audio import audio_duration_seconds, transcribe_long_audio
+from utils.config_manager import load_config
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".webm", ".mp4"}
+MANIFEST_FILE_NAME = ".voicescribe_batch.json"
+OUTPUT_EXTENSION = ".txt"
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def find_audio_files(root_dir: str, recursive: bool = True) -> List[str]:
+    """ディレクトリ内の音声ファイルをパス順に列挙"""
+    audio_files = []
+    if recursive:
+        for dir_path, dir_names, file_names in os.walk(root_dir):
+            dir_names[:] = sorted(name for name in dir_names if not name.startswith("."))
+            for file_name in file_names:
+                if os.path.splitext(file_name)[1].lower() in AUDIO_EXTENSIONS:
+                    audio_files.append(os.path.join(dir_path, file_name))
+    else:
+        for file_name in os.listdir(root_dir):
+            path = os.path.join(root_dir, file_name)
+            if os.path.isfile(path) and os.path.splitext(file_name)[1].lower() in AUDIO_EXTENSIONS:
+                audio_files.append(path)
+    return sorted(audio_files)
+
+
+def output_path_for(audio_file_path: str) -> str:
+    """文字起こし結果の保存先 (音声ファイルと同じ場所)"""
+    return os.path.splitext(audio_file_path)[0] + OUTPUT_EXTENSION
+
+
+def _write_text_atomic(path: str, text: str):
+    """途中で中断されても不完全なファイルが残らないように書き込み"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+class BatchManifest:
+    """処理済みファイルの記録 (中断後の再開用)
+
+    ファイルごとにサイズと更新時刻を記録し、音声ファイルが変更された場合は
+    完了済みとみなさない。更新のたびにディスクへ書き出す。
+    """
+
+    def __init__(self, manifest_path: str, root_dir: str):
+        self.manifest_path = manifest_path
+        self.root_dir = root_dir
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = data.get("files", {})
+        except (OSError, ValueError) as e:
+            logging.warning(f"マニフェストを読み込めないため最初から処理します: {str(e)}")
+            self._entries = {}
+
+    def _key(self, audio_file_path: str) -> str:
+        return os.path.relpath(audio_file_path, self.root_dir).replace(os.sep, "/")
+
+    def is_completed(self, audio_file_path: str) -> bool:
+        """完了済みで、音声ファイルも出力ファイルも変わっていないか"""
+        with self._lock:
+            entry = self._entries.get(self._key(audio_file_path))
+        if entry is None or entry.get("status") != STATUS_DONE:
+            return False
+
+        try:
+            stat = os.stat(audio_file_path)
+        except OSError:
+            return False
+        return (
+            entry.get("size") == stat.st_size
+            and entry.get("mtime") == stat.st_mtime
+            and os.path.exists(output_path_for(audio_file_path))
+        )
+
+    def record(self, audio_file_path: str, status: str, **fields):
+        """処理結果を記録して保存"""
+        stat = os.stat(audio_file_path)
+        entry = {"status": status, "size": stat.st_size, "mtime": stat.st_mtime, **fields}
+        with self._lock:
+            self._entries[self._key(audio_file_path)] = entry
+            self._save()
+
+    def _save(self):
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "files": self._entries}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+
+@dataclass
+class FileResult:
+    """1ファイルの処理結果"""
+
+    path: str
+    success: bool
+    attempts: int
+    elapsed_seconds: float
+    audio_seconds: Optional[float]
+
+
+def transcribe_with_retry(
+        audio_file_path: str,
+        config: configparser.ConfigParser,
+        client: ElevenLabs,
+        max_retries: int,
+        backoff_seconds: float,
+        stop_event: Optional[threading.Event] = None
+) -> tuple[Optional[str], int]:
+    """失敗時は指数バックオフ (ジッター付き) で再試行
+
+    stop_event がセットされた場合は待機を打ち切り、再試行しない。
+
+    Returns:
+        tuple[Optional[str], int]: (文字起こし結果, 試行回数)
+    """
+    for attempt in range(1, max_retries + 2):
+        text = transcribe_long_audio(audio_file_path, config, client)
+        if text is not None:
+            return text, attempt
+        if attempt <= max_retries:
+            delay = backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+            logging.warning(
+                f"文字起こしに失敗したため{delay:.1f}秒後に再試行します "
+                f"({attempt}/{max_retries}): {audio_file_path}"
+            )
+            if stop_event is None:
+                time.sleep(delay)
+            elif stop_event.wait(delay):
+                return None, attempt
+    return None, max_retries + 1
+
+
+def process_file(
+        audio_file_path: str,
+        config: configparser.ConfigParser,
+        client: ElevenLabs,
+        manifest: BatchManifest,
+        max_retries: int,
+        backoff_seconds: float,
+        stop_event: Optional[threading.Event] = None
+) -> FileResult:
+    """1ファイルを文字起こしして結果を保存・記録"""
+    start_time = time.perf_counter()
+    audio_seconds = audio_duration_seconds(audio_file_path)
+    text, attempts = transcribe_with_retry(
+        audio_file_path, config, client, max_retries, backoff_seconds, stop_event)
+    elapsed = time.perf_counter() - start_time
+
+    if text is None and stop_event is not None and stop_event.is_set():
+        # 中断した場合は記録せず、次回の実行で再処理する
+        return FileResult(audio_file_path, False, attempts, elapsed, audio_seconds)
+    if text is None:
+        manifest.record(audio_file_path, STATUS_FAILED, attempts=attempts)
+        return FileResult(audio_file_path, False, attempts, elapsed, audio_seconds)
+
+    output_path = output_path_for(audio_file_path)
+    _write_text_atomic(output_path, text)
+    manifest.record(
+        audio_file_path,
+        STATUS_DONE,
+        output=os.path.basename(output_path),
+        attempts=attempts,
+        audio_seconds=audio_seconds,
+        elapsed_seconds=round(elapsed, 3),
+    )
+    return FileResult(audio_file_path, True, attempts, elapsed, audio_seconds)
+
+
+def format_summary(results: List[FileResult], skipped: int, wall_seconds: float) -> str:
+    """処理件数とスループットの集計"""
+    succeeded = [result for result in results if result.success]
+    failed = len(results) - len(succeeded)
+    audio_seconds = sum(result.audio_seconds or 0.0 for result in succeeded)
+    unknown_duration = sum(1 for result in succeeded if result.audio_seconds is None)
+
+    wall_minutes = wall_seconds / 60 if wall_seconds > 0 else 0.0
+    files_per_minute = len(succeeded) / wall_minutes if wall_minutes > 0 else 0.0
+    audio_hours_per_hour = audio_seconds / wall_seconds if wall_seconds > 0 else 0.0
+
+    lines = [
+        f"完了: {len(succeeded)}件, 失敗: {failed}件, スキップ (処理済み): {skipped}件",
+        f"所要時間: {wall_seconds:.1f}秒",
+        f"スループット: {files_per_minute:.2f} ファイル/分, "
+        f"{audio_hours_per_hour:.2f} 音声時間/時間 (音声 {audio_seconds / 3600:.2f}時間)",
+    ]
+    if unknown_duration:
+        lines.append(f"※ 長さを取得できないファイル {unknown_duration}件 (WAV以外) は音声時間に含みません")
+    return "\n".join(lines)
+
+
+def run_batch(
+        root_dir: str,
+        config: configparser.ConfigParser,
+        client: ElevenLabs,
+        jobs: int = 4,
+        max_retries: int = 3,
+        backoff_seconds: float = 2.0,
+        recursive: bool = True,
+        manifest_path: Optional[str] = None,
+        force: bool = False
+) -> tuple[List[FileResult], int, float]:
+    """ディレクトリ内の音声ファイルを並列に文字起こし
+
+    Returns:
+        tuple[List[FileResult], int, float]: (処理結果, スキップ件数, 所要秒数)
+    """
+    manifest = BatchManifest(manifest_path or os.path.join(root_dir, MANIFEST_FILE_NAME), root_dir)
+    audio_files = find_audio_files(root_dir, recursive)
+    pending = [path for path in audio_files if force or not manifest.is_completed(path)]
+    skipped = len(audio_files) - len(pending)
+    logging.info(f"対象: {len(audio_files)}件 (処理済み {skipped}件をスキップ), 並列数: {jobs}")
+
+    results: List[FileResult] = []
+    start_time = time.perf_counter()
+    stop_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="BatchTranscribe")
+    try:
+        futures = {
+            executor.submit(
+                process_file, path, config, client, manifest, max_retries, backoff_seconds,
+                stop_event): path
+            for path in pending
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.error(f"処理エラー {path}: {str(e)}")
+                result = FileResult(path, False, 0, 0.0, None)
+            results.append(result)
+
+            status = "完了" if result.success else "失敗"
+            print(f"[{len(results)}/{len(pending)}] {status}: {os.path.relpath(path, root_dir)}", flush=True)
+
+    except KeyboardInterrupt:
+        # 実行中のファイルは完了を待たずに破棄し、次回の実行で再処理する
+        print("中断しました。再実行すると未完了のファイルから再開します", flush=True)
+        stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    executor.shutdown(wait=True)
+    return results, skipped, time.perf_counter() - start_time
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ディレクトリ内の音声ファイルを一括で文字起こし")
+    parser.add_argument("directory", help="音声ファイルのあるディレクトリ")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="同時に処理するファイル数 (デフォルト: 4)")
+    parser.add_argument("--retries", type=int, default=3, help="失敗時の再試行回数 (デフォルト: 3)")
+    parser.add_argument("--backoff", type=float, default=2.0, help="再試行の初回待ち時間 秒 (デフォルト: 2.0)")
+    parser.add_argument("--model", help="モデルID (デフォルト: ファイル文字起こし用のモデル BATCH_MODEL)")
+    parser.add_argument("--language", help="言語コード (デフォルト: config.ini の設定)")
+    parser.add_argument("--manifest", help="マニフェストのパス (デフォルト: ディレクトリ内)")
+    parser.add_argument("--no-recursive", action="store_true", help="サブディレクトリを対象にしない")
+    parser.add_argument("--force", action="store_true", help="処理済みのファイルも再処理")
+    parser.add_argument("-v", "--verbose", action="store_true", help="詳細なログを表示")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+    )
+
+    if not os.path.isdir(args.directory):
+        print(f"エラー: ディレクトリ '{args.directory}' が見つかりません")
+        return 2
+    if args.jobs < 1:
+        print("エラー: 並列数は1以上を指定してください")
+        return 2
+
+    try:
+        config = load_config()
+        client = setup_elevenlabs_client()
+    except Exception as e:
+        print(f"初期化エラー: {e}")
+        return 1
+
+    # config.ini の MODEL はリアルタイム用のため、ファイル文字起こし用のモデルを使う
+    config['ELEVENLABS']['MODEL'] = args.model or BatchTranscriptionSettings().model
+    if args.language:
+        config['ELEVENLABS']['LANGUAGE'] = args.language
+
+    try:
+        results, skipped, wall_seconds = run_batch(
+            os.path.abspath(args.directory),
+            config,
+            client,
+            jobs=args.jobs,
+            max_retries=max(0, args.retries),
+            backoff_seconds=args.backoff,
+            recursive=not args.no_recursive,
+            manifest_path=args.manifest,
+            force=args.force,
+        )
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        close_elevenlabs_client()
+
+    print(format_summary(results, skipped, wall_seconds))
+    return 0 if all(result.success for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,118 @@
 import asyncio
-import base64
 import configparser
-import json
 import logging
 import os
+import threading
+import time
 import traceback
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, BinaryIO, Optional
 
+import httpx
 import websockets
-from elevenlabs.client import ElevenLabs
-
+from elevenlabs.client import AsyncElevenLabs, ElevenLabs
+
+from external_service.audio_preprocess import (
+    PreprocessedAudio,
+    PreprocessOptions,
+    preprocess_audio,
+)
+from external_service.transcription_cache import (
+    TranscriptionCache,
+    compute_cache_key,
+    get_transcription_cache,
+)
 from utils.env_loader import load_env_variables
+from utils.protocol_codec import (
+    KIND_COMMITTED,
+    KIND_ERROR,
+    KIND_PARTIAL,
+    KIND_SESSION_STARTED,
+    AudioChunkEncoder,
+    MessageDispatcher,
+    decode_message,
+    encode_commit,
+    error_message_of,
+    message_type_of,
+)
+
+
+# 共有HTTPクライアントの接続プール (長時間ファイルの区間並列 × バッチの並列数を想定)
+HTTP_MAX_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+HTTP_TIMEOUT_SECONDS = 300.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 10.0
+
+_client_lock = threading.Lock()
+_shared_client: Optional[ElevenLabs] = None
+_shared_http_client: Optional[httpx.Client] = None
+_shared_api_key: Optional[str] = None
+
+
+def _create_http_client() -> httpx.Client:
+    """接続を再利用する (keep-alive) HTTPクライアント"""
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+def get_elevenlabs_client(api_key: Optional[str] = None) -> ElevenLabs:
+    """プロセス全体で共有するクライアントを取得
+
+    HTTP接続プールを共有するため、ファイルごとにTLSハンドシェイクをやり直さない。
+    APIキーが変更された場合のみ作り直す。api_key 省略時は .env から読み込む。
+    """
+    global _shared_client, _shared_http_client, _shared_api_key
+    if api_key is None:
+        api_key = load_env_variables().get("ELEVENLABS_API_KEY")
+    if not api_key:
+        raise ValueError("ELEVENLABS_API_KEYが未設定です")
+
+    with _client_lock:
+        if _shared_client is None or api_key != _shared_api_key:
+            if _shared_http_client is None:
+                _shared_http_client = _create_http_client()
+            _shared_client = ElevenLabs(api_key=api_key, httpx_client=_shared_http_client)
+            _shared_api_key = api_key
+        return _shared_client
+
+
+def close_elevenlabs_client():
+    """共有クライアントの接続を閉じる (終了時に呼び出す)"""
+    global _shared_client, _shared_http_client, _shared_api_key
+    with _client_lock:
+        if _shared_http_client is not None:
+            _shared_http_client.close()
+        _shared_client = None
+        _shared_http_client = None
+        _shared_api_key = None
 
 
 def setup_elevenlabs_client() -> ElevenLabs:
-    env_vars = load_env_variables()
-    api_key = env_vars.get("ELEVENLABS_API_KEY")
+    return get_elevenlabs_client()
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """asyncio用の接続を再利用するHTTPクライアント (呼び出し側で aclose する)"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+def create_async_elevenlabs_client(api_key: str, http_client: httpx.AsyncClient) -> AsyncElevenLabs:
+    """asyncioイベントループ上で使うクライアント"""
     if not api_key:
         raise ValueError("ELEVENLABS_API_KEYが未設定です")
-    return ElevenLabs(api_key=api_key)
+    return AsyncElevenLabs(api_key=api_key, httpx_client=http_client)
 
 
 def validate_audio_file(file_path: str) -> tuple[bool, Optional[str]]:
@@ -40,6 +134,71 @@ def validate_audio_file(file_path: str) -> tuple[bool, Optional[str]]:
     return True, None
 
 
+class TranscriptionCancelledError(Exception):
+    """cancel_event がセットされたため前処理・アップロードを中断した"""
+
+
+def _raise_if_cancelled(cancel_event: Optional[threading.Event]):
+    if cancel_event is not None and cancel_event.is_set():
+        raise TranscriptionCancelledError("文字起こしを中断しました")
+
+
+class UploadProgressFile:
+    """アップロード量と速度を計測するファイルオブジェクトのラッパー
+
+    httpx はファイルオブジェクトをチャンク単位で読み出して送信するため、
+    ファイル全体をメモリに載せずにアップロードできる。
+    fileno を委譲しておくと Content-Length もファイルサイズから求められる。
+    cancel_event がセットされると次の読み出しで送信を中断する。
+    """
+
+    def __init__(self, file: BinaryIO, cancel_event: Optional[threading.Event] = None):
+        self._file = file
+        self._cancel_event = cancel_event
+        self.bytes_read = 0
+        self.first_read_at: Optional[float] = None
+        self.last_read_at: Optional[float] = None
+
+    def read(self, size: int = -1) -> bytes:
+        _raise_if_cancelled(self._cancel_event)
+        chunk = self._file.read(size)
+        now = time.perf_counter()
+        if self.first_read_at is None:
+            self.first_read_at = now
+        self.last_read_at = now
+        self.bytes_read += len(chunk)
+        return chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        position = self._file.seek(offset, whence)
+        if position == 0:
+            # 再送時は計測をやり直す
+            self.bytes_read = 0
+            self.first_read_at = None
+            self.last_read_at = None
+        return position
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    @property
+    def name(self) -> str:
+        return getattr(self._file, "name", "")
+
+    @property
+    def throughput_mbps(self) -> Optional[float]:
+        """アップロード速度 (MB/秒)"""
+        if self.first_read_at is None or self.last_read_at is None:
+            return None
+        elapsed = self.last_read_at - self.first_read_at
+        if elapsed <= 0:
+            return None
+        return self.bytes_read / elapsed / (1024 * 1024)
+
+
 def convert_response_to_text(response) -> Optional[str]:
     """APIレスポンスをテキストに変換"""
     if response is None:
@@ -62,11 +221,27 @@ def convert_response_to_text(response) -> Optional[str]:
         return None
 
 
+def _upload_file_name(audio_file_path: str, preprocessed: Optional[PreprocessedAudio]) -> str:
+    """送信時のファイル名 (前処理した場合は拡張子をWAVにする)"""
+    file_name = os.path.basename(audio_file_path)
+    if preprocessed is not None:
+        file_name = os.path.splitext(file_name)[0] + ".wav"
+    return file_name
+
+
 def transcribe_audio(
         audio_file_path: str,
         config: configparser.ConfigParser,
-        client: ElevenLabs
+        client: ElevenLabs,
+        use_cache: bool = True,
+        preprocess: bool = True,
+        cancel_event: Optional[threading.Event] = None
 ) -> Optional[str]:
+    """音声ファイルを文字起こし (失敗した場合は None)
+
+    cancel_event がセットされた場合は前処理・アップロードを中断し、
+    TranscriptionCancelledError を送出する。
+    """
     is_valid, error_msg = validate_audio_file(audio_file_path)
     if not is_valid:
         if error_msg and "未指定" in error_msg:
@@ -75,22 +250,56 @@ def transcribe_audio(
             logging.error(error_msg)
         return None
 
+    preprocessed: Optional[PreprocessedAudio] = None
     try:
-        logging.info("ファイル読み込み開始")
-        with open(audio_file_path, "rb") as file:
-            file_content = file.read()
-            logging.info(f"ファイル読み込み完了: {len(file_content)} bytes")
+        preprocess_options = PreprocessOptions.from_config(config) if preprocess else None
+        cache = get_transcription_cache(config) if use_cache else None
+        cache_key = None
+        if cache is not None:
+            cache_key = compute_cache_key(
+                audio_file_path, config['ELEVENLABS']['MODEL'], config['ELEVENLABS']['LANGUAGE'],
+                preprocess_options)
+            cached_text = cache.get(cache_key)
+            if cached_text is not None:
+                logging.info(f"キャッシュから文字起こし結果を取得: {len(cached_text)}文字")
+                return cached_text
+
+        # 16kHzモノラルへの変換と無音の除去 (WAV以外は元のファイルを送信)
+        if preprocess_options is not None:
+            preprocessed = preprocess_audio(
+                audio_file_path, preprocess_options, cancel_event=cancel_event)
+        _raise_if_cancelled(cancel_event)
+        upload_path = preprocessed.path if preprocessed is not None else audio_file_path
+
+        file_size = os.path.getsize(upload_path)
+        logging.info(f"アップロード開始: {file_size} bytes")
+        with open(upload_path, "rb") as file:
+            # ファイル全体を読み込まず、送信しながら少しずつ読み出す
+            upload_file = UploadProgressFile(file, cancel_event)
+            request_start = time.perf_counter()
 
             transcription = client.speech_to_text.convert(
-                file=(os.path.basename(audio_file_path), file_content),
+                file=(_upload_file_name(audio_file_path, preprocessed), upload_file),
                 model_id=config['ELEVENLABS']['MODEL'],
                 language_code=config['ELEVENLABS']['LANGUAGE']
             )
 
+            request_elapsed = time.perf_counter() - request_start
+            throughput = upload_file.throughput_mbps
+            throughput_text = f"{throughput:.2f} MB/s" if throughput is not None else "不明"
+            logging.info(
+                f"アップロード完了: {upload_file.bytes_read} bytes, "
+                f"送信速度 {throughput_text}, 応答まで {request_elapsed:.1f}秒"
+            )
+
         text_result = convert_response_to_text(transcription)
         if text_result is None:
             return None
 
+        # 空の結果は一時的な不調の可能性があるためキャッシュしない
+        if cache is not None and cache_key is not None and text_result:
+            cache.put(cache_key, text_result)
+
         if len(text_result) == 0:
             logging.warning("文字起こし結果が空です")
             return ""
@@ -98,6 +307,9 @@ def transcribe_audio(
         logging.info(f"文字起こし完了: {len(text_result)}文字")
         return text_result
 
+    except TranscriptionCancelledError:
+        logging.info(f"文字起こしを中断しました: {audio_file_path}")
+        raise
     except FileNotFoundError as e:
         logging.error(f"ファイルが見つかりません: {str(e)}")
         logging.debug(f"詳細: {traceback.format_exc()}")
@@ -111,12 +323,133 @@ def transcribe_audio(
         logging.debug(f"詳細: {traceback.format_exc()}")
         return None
 
+    except Exception as e:
+        if cancel_event is not None and cancel_event.is_set():
+            # HTTPクライアントが読み出し中の例外を包んで送出した場合
+            logging.info(f"文字起こしを中断しました: {audio_file_path}")
+            raise TranscriptionCancelledError("文字起こしを中断しました") from e
+        logging.error(f"文字起こしエラー: {str(e)}")
+        logging.error(f"エラーのタイプ: {type(e).__name__}")
+        logging.debug(f"詳細: {traceback.format_exc()}")
+        return None
+
+    finally:
+        if preprocessed is not None:
+            preprocessed.cleanup()
+
+
+async def _preprocess_audio_async(
+        audio_file_path: str,
+        options: PreprocessOptions
+) -> Optional[PreprocessedAudio]:
+    """別スレッドで前処理 (キャンセル時はスレッドにも中断を通知し、一時ファイルを削除)"""
+    cancel_event = threading.Event()
+    future = asyncio.ensure_future(
+        asyncio.to_thread(preprocess_audio, audio_file_path, options, cancel_event=cancel_event))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancel_event.set()
+
+        # 中断が間に合わず変換を終えていた場合は、その一時ファイルを削除する
+        def cleanup(done: "asyncio.Future[Optional[PreprocessedAudio]]"):
+            if done.cancelled() or done.exception() is not None:
+                return
+            result = done.result()
+            if result is not None:
+                result.cleanup()
+
+        future.add_done_callback(cleanup)
+        raise
+
+
+async def transcribe_audio_async(
+        audio_file_path: str,
+        client: AsyncElevenLabs,
+        model_id: str,
+        language_code: str,
+        preprocess_options: Optional[PreprocessOptions] = None,
+        cache: Optional[TranscriptionCache] = None
+) -> Optional[str]:
+    """transcribe_audio の非同期版 (イベントループを止めずにアップロード・応答待ちを行う)
+
+    前処理・キャッシュの参照は別スレッドで行う。
+    キャンセルされた場合は asyncio.CancelledError をそのまま送出する。
+    """
+    is_valid, error_msg = validate_audio_file(audio_file_path)
+    if not is_valid:
+        if error_msg:
+            logging.error(error_msg)
+        return None
+
+    preprocessed: Optional[PreprocessedAudio] = None
+    try:
+        cache_key = None
+        if cache is not None:
+            cache_key = await asyncio.to_thread(
+                compute_cache_key, audio_file_path, model_id, language_code, preprocess_options)
+            cached_text = await asyncio.to_thread(cache.get, cache_key)
+            if cached_text is not None:
+                logging.info(f"キャッシュから文字起こし結果を取得: {len(cached_text)}文字")
+                return cached_text
+
+        if preprocess_options is not None:
+            preprocessed = await _preprocess_audio_async(audio_file_path, preprocess_options)
+        upload_path = preprocessed.path if preprocessed is not None else audio_file_path
+
+        file_size = os.path.getsize(upload_path)
+        logging.info(f"アップロード開始: {file_size} bytes")
+        with open(upload_path, "rb") as file:
+            upload_file = UploadProgressFile(file)
+            request_start = time.perf_counter()
+
+            transcription = await client.speech_to_text.convert(
+                file=(_upload_file_name(audio_file_path, preprocessed), upload_file),
+                model_id=model_id,
+                language_code=language_code
+            )
+
+            request_elapsed = time.perf_counter() - request_start
+            throughput = upload_file.throughput_mbps
+            throughput_text = f"{throughput:.2f} MB/s" if throughput is not None else "不明"
+            logging.info(
+                f"アップロード完了: {upload_file.bytes_read} bytes, "
+                f"送信速度 {throughput_text}, 応答まで {request_elapsed:.1f}秒"
+            )
+
+        text_result = convert_response_to_text(transcription)
+        if text_result is None:
+            return None
+
+        # 空の結果は一時的な不調の可能性があるためキャッシュしない
+        if cache is not None and cache_key is not None and text_result:
+            await asyncio.to_thread(cache.put, cache_key, text_result)
+
+        if len(text_result) == 0:
+            logging.warning("文字起こし結果が空です")
+            return ""
+
+        logging.info(f"文字起こし完了: {len(text_result)}文字")
+        return text_result
+
+    except asyncio.CancelledError:
+        logging.info(f"文字起こしをキャンセルしました: {audio_file_path}")
+        raise
+    except OSError as e:
+        logging.error(f"OS関連エラー: {str(e)}")
+        logging.debug(f"詳細: {traceback.format_exc()}")
+        return None
+
     except Exception as e:
         logging.error(f"文字起こしエラー: {str(e)}")
         logging.error(f"エラーのタイプ: {type(e).__name__}")
         logging.debug(f"詳細: {traceback.format_exc()}")
         return None
 
+    finally:
+        if preprocessed is not None:
+            preprocessed.cleanup()
+
 
 class ElevenLabsRealtimeClient:
     """ElevenLabs Scribe V2 リアルタイムAPI用WebSocketクライアント
@@ -135,6 +468,18 @@ class ElevenLabsRealtimeClient:
         self._is_connected = False
         self._audio_queue: asyncio.Queue = asyncio.Queue()
         self._stop_flag = False
+        # エンコード用のバッファは送信が終わるまで使い回さない
+        self._encoder = AudioChunkEncoder()
+        self._send_lock = asyncio.Lock()
+        self._dispatcher = MessageDispatcher(
+            {
+                KIND_PARTIAL: self._on_partial_transcript,
+                KIND_COMMITTED: self._on_committed_transcript,
+                KIND_ERROR: self._on_error,
+                KIND_SESSION_STARTED: self._on_session_started,
+            },
+            default=self._on_unknown,
+        )
 
     def _build_websocket_url(self) -> str:
         """クエリパラメータを含むWebSocket URLを構築"""
@@ -180,14 +525,13 @@ class ElevenLabsRealtimeClient:
                     self.websocket.recv(),
                     timeout=10.0
                 )
-                data = json.loads(initial_response)
-                message_type = data.get("message_type")
+                kind, data = decode_message(initial_response)
 
-                if message_type == "session_started":
+                if kind == KIND_SESSION_STARTED:
                     session_id = data.get("session_id", "unknown")
                     logging.info(f"セッション開始: session_id={session_id}")
                 else:
-                    logging.warning(f"予期しない初期メッセージ: {message_type}")
+                    logging.warning(f"予期しない初期メッセージ: {message_type_of(data)}")
 
             except asyncio.TimeoutError:
                 logging.warning("セッション開始メッセージのタイムアウト（続行します）")
@@ -237,20 +581,10 @@ class ElevenLabsRealtimeClient:
             return
 
         try:
-            # 音声データをBase64エンコード
-            audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-
-            # input_audio_chunk メッセージ形式
-            message = {
-                "message_type": "input_audio_chunk",
-                "audio_base_64": audio_base64,
-            }
-
-            # commit フラグが True の場合、音声入力を確定
-            if commit:
-                message["commit"] = True
-
-            await self.websocket.send(json.dumps(message))
+            async with self._send_lock:
+                # input_audio_chunk メッセージ (commit=True で音声入力を確定)
+                message = self._encoder.encode(audio_data, commit=commit)
+                await self.websocket.send(message, text=True)
 
         except Exception as e:
             logging.error(f"音声チャンク送信エラー: {str(e)}")
@@ -262,14 +596,37 @@ class ElevenLabsRealtimeClient:
             return
 
         try:
-            message = {
-                "message_type": "commit"
-            }
-            await self.websocket.send(json.dumps(message))
+            await self.websocket.send(encode_commit(), text=True)
             logging.debug("コミットメッセージを送信しました")
         except Exception as e:
             logging.error(f"コミット送信エラー: {str(e)}")
 
+    def _on_partial_transcript(self, data: dict) -> Optional[tuple[str, bool]]:
+        text = data.get("text", "")
+        if not text:
+            return None
+        logging.debug(f"部分結果: {text}")
+        return (text, False)
+
+    def _on_committed_transcript(self, data: dict) -> Optional[tuple[str, bool]]:
+        # committed_transcript / committed_transcript_with_timestamps
+        text = data.get("text", "")
+        if not text:
+            return None
+        logging.info(f"確定結果: {text}")
+        return (text, True)
+
+    def _on_error(self, data: dict):
+        error_code = data.get("error_code", message_type_of(data))
+        logging.error(f"APIエラー [{error_code}]: {error_message_of(data)}")
+
+    def _on_session_started(self, data: dict):
+        # 接続時に既に処理済みの場合もある
+        logging.debug(f"セッション開始イベント: {data.get('session_id', 'unknown')}")
+
+    def _on_unknown(self, data: dict):
+        logging.debug(f"未処理のメッセージタイプ: {message_type_of(data)}")
+
     async def receive_text(self) -> AsyncGenerator[tuple[str, bool], None]:
         """テキスト結果を受信
 
@@ -288,48 +645,14 @@ class ElevenLabsRealtimeClient:
                     break
 
                 try:
-                    data = json.loads(message)
-
-                    message_type = data.get("message_type")
-
-                    if message_type == "partial_transcript":
-                        # 部分的なトランスクリプト
-                        text = data.get("text", "")
-                        if text:
-                            logging.debug(f"部分結果: {text}")
-                            yield (text, False)
-
-                    elif message_type == "committed_transcript":
-                        # 確定したトランスクリプト
-                        text = data.get("text", "")
-                        if text:
-                            logging.info(f"確定結果: {text}")
-                            yield (text, True)
-
-                    elif message_type == "committed_transcript_with_timestamps":
-                        # タイムスタンプ付き確定トランスクリプト
-                        text = data.get("text", "")
-                        if text:
-                            logging.info(f"確定結果(タイムスタンプ付き): {text}")
-                            yield (text, True)
-
-                    elif message_type == "error":
-                        error_code = data.get("error_code", "unknown")
-                        error_message = data.get("error_message", "Unknown error")
-                        logging.error(f"APIエラー [{error_code}]: {error_message}")
-
-                    elif message_type == "session_started":
-                        # セッション開始（接続時に既に処理済みの場合もある）
-                        session_id = data.get("session_id", "unknown")
-                        logging.debug(f"セッション開始イベント: {session_id}")
-
-                    else:
-                        logging.debug(f"未処理のメッセージタイプ: {message_type}")
-
-                except json.JSONDecodeError as e:
+                    result = self._dispatcher.dispatch(message)
+                except ValueError as e:
                     logging.error(f"JSONデコードエラー: {str(e)}")
                     continue
 
+                if result is not None:
+                    yield result
+
         except websockets.exceptions.ConnectionClosed as e:
             logging.info(f"WebSocket接続が閉じられました: {e.code} - {e.reason}")
             self._is_connected = False
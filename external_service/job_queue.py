@@ -0,0 +1,497 @@
+"""永続化された文字起こしジョブキュー (SQLite WAL)
+
+ジョブの状態遷移は全て1つのトランザクションで行う。
+実行中のジョブにはリース (有効期限) を設定し、ワーカープールが定期的に延長する。
+アプリが異常終了してリースが切れたジョブは、次に取り出す時に待機中へ戻す。
+"""
+
+import configparser
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from elevenlabs.client import ElevenLabs
+
+from external_service.elevenlabs_api import TranscriptionCancelledError, transcribe_audio
+from external_service.transcription_cache import get_default_data_dir
+from utils.config_manager import get_config_value
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+DEFAULT_LEASE_SECONDS = 120.0
+
+
+@dataclass
+class QueueOptions:
+    """ジョブキューとワーカープールの設定"""
+
+    database: str = ""
+    workers: int = 1
+    max_attempts: int = 5
+    backoff_seconds: float = 5.0
+    max_backoff_seconds: float = 600.0
+    poll_interval_seconds: float = 1.0
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> "QueueOptions":
+        defaults = cls()
+        return cls(
+            database=get_config_value(config, 'QUEUE', 'database', defaults.database),
+            workers=get_config_value(config, 'QUEUE', 'workers', defaults.workers),
+            max_attempts=get_config_value(config, 'QUEUE', 'max_attempts', defaults.max_attempts),
+            backoff_seconds=get_config_value(
+                config, 'QUEUE', 'backoff_seconds', defaults.backoff_seconds),
+            max_backoff_seconds=get_config_value(
+                config, 'QUEUE', 'max_backoff_seconds', defaults.max_backoff_seconds),
+            poll_interval_seconds=get_config_value(
+                config, 'QUEUE', 'poll_interval_seconds', defaults.poll_interval_seconds),
+        )
+
+    @property
+    def database_path(self) -> str:
+        return self.database or os.path.join(get_default_data_dir(), "jobs.sqlite3")
+
+
+@dataclass
+class Job:
+    """文字起こしジョブ"""
+
+    job_id: int
+    audio_path: str
+    priority: int
+    status: str
+    attempts: int
+    max_attempts: int
+    next_attempt_at: float
+    output_path: Optional[str]
+    payload: Dict[str, Any]
+    result: Optional[str]
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(
+            job_id=row["id"],
+            audio_path=row["audio_path"],
+            priority=row["priority"],
+            status=row["status"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            next_attempt_at=row["next_attempt_at"],
+            output_path=row["output_path"],
+            payload=json.loads(row["payload"]) if row["payload"] else {},
+            result=row["result"],
+            error=row["error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+
+class JobQueue:
+    """優先度・再試行・リース付きのジョブキュー
+
+    複数のプロセス (GUIとコマンドラインツールなど) から同じデータベースを
+    開いても、取り出しは BEGIN IMMEDIATE で直列化されるため同じジョブを
+    二重に実行しない。
+    """
+
+    def __init__(
+            self,
+            db_path: str,
+            backoff_seconds: float = 5.0,
+            max_backoff_seconds: float = 600.0,
+            lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ):
+        self.db_path = db_path
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # トランザクションは明示的に開始する
+        self._connection = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                audio_path TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                next_attempt_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_until REAL,
+                output_path TEXT,
+                payload TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_ready "
+            "ON jobs (status, priority DESC, next_attempt_at, id)"
+        )
+
+    @classmethod
+    def from_options(cls, options: QueueOptions) -> "JobQueue":
+        return cls(
+            options.database_path,
+            backoff_seconds=options.backoff_seconds,
+            max_backoff_seconds=options.max_backoff_seconds,
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込みロックを取得したトランザクション"""
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def submit(
+            self,
+            audio_path: str,
+            priority: int = 0,
+            max_attempts: int = 5,
+            output_path: Optional[str] = None,
+            payload: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """ジョブを追加 (優先度の数値が大きいものから実行)"""
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO jobs (audio_path, priority, status, max_attempts, next_attempt_at, "
+                "output_path, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (audio_path, priority, STATUS_PENDING, max(1, max_attempts), now, output_path,
+                 json.dumps(payload, ensure_ascii=False) if payload else None, now, now),
+            )
+            job_id = cursor.lastrowid
+        logging.info(f"ジョブを追加しました: #{job_id} (優先度 {priority}) {audio_path}")
+        return job_id
+
+    def claim(self, owner: str) -> Optional[Job]:
+        """実行可能なジョブを1件取り出して実行中にする"""
+        now = time.time()
+        with self._transaction() as connection:
+            self._release_expired(connection, now)
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE status = ? AND next_attempt_at <= ? "
+                "ORDER BY priority DESC, next_attempt_at, id LIMIT 1",
+                (STATUS_PENDING, now),
+            ).fetchone()
+            if row is None:
+                return None
+
+            connection.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_until = ?, updated_at = ? WHERE id = ?",
+                (STATUS_RUNNING, owner, now + self.lease_seconds, now, row["id"]),
+            )
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return Job.from_row(row)
+
+    def _release_expired(self, connection: sqlite3.Connection, now: float):
+        """リースが切れた実行中のジョブ (異常終了したワーカーのもの) を戻す"""
+        expired = connection.execute(
+            "SELECT id, attempts, max_attempts FROM jobs WHERE status = ? AND lease_until < ?",
+            (STATUS_RUNNING, now),
+        ).fetchall()
+        for row in expired:
+            if row["attempts"] >= row["max_attempts"]:
+                status, message = STATUS_FAILED, "実行中に中断されました (再試行回数の上限)"
+            else:
+                status, message = STATUS_PENDING, "実行中に中断されました"
+            connection.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_until = NULL, "
+                "error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                (status, message, now, now, row["id"]),
+            )
+            logging.warning(f"ジョブ #{row['id']} のリースが切れました: {message}")
+
+    def renew_leases(self, owner: str):
+        """実行中のジョブのリースを延長"""
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET lease_until = ? WHERE status = ? AND lease_owner = ?",
+                (now + self.lease_seconds, STATUS_RUNNING, owner),
+            )
+
+    def complete(self, job: Job, owner: str, result: str) -> bool:
+        """成功として記録
+
+        取り出した時のリースを持っている場合だけ記録する。リースが切れて
+        別のワーカーが取り出し直したジョブや、取り消されたジョブは更新しない。
+
+        Returns:
+            bool: 記録した場合 True
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL, "
+                "lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ? AND attempts = ?",
+                (STATUS_DONE, result, now, job.job_id, STATUS_RUNNING, owner, job.attempts),
+            )
+        if cursor.rowcount == 0:
+            logging.warning(f"ジョブ #{job.job_id} はリースを失ったため結果を破棄しました")
+            return False
+        return True
+
+    def fail(self, job: Job, owner: str, error: str, retry: bool = True) -> Optional[str]:
+        """失敗として記録し、上限まで指数バックオフで再試行を予約
+
+        Returns:
+            Optional[str]: 記録後の状態 (pending または failed)。
+                リースを失っていた場合は記録せず None
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? "
+                "AND lease_owner = ? AND attempts = ?",
+                (job.job_id, STATUS_RUNNING, owner, job.attempts),
+            ).fetchone()
+            if row is None:
+                logging.warning(f"ジョブ #{job.job_id} はリースを失ったため失敗を記録しません: {error}")
+                return None
+
+            if retry and row["attempts"] < row["max_attempts"]:
+                delay = min(
+                    self.max_backoff_seconds,
+                    self.backoff_seconds * (2 ** (row["attempts"] - 1)),
+                )
+                status, next_attempt_at = STATUS_PENDING, now + delay
+                logging.warning(
+                    f"ジョブ #{job.job_id} が失敗したため{delay:.1f}秒後に再試行します "
+                    f"({row['attempts']}/{row['max_attempts']}): {error}"
+                )
+            else:
+                status, next_attempt_at = STATUS_FAILED, now
+                logging.error(f"ジョブ #{job.job_id} が失敗しました: {error}")
+
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, next_attempt_at = ?, lease_owner = NULL, "
+                "lease_until = NULL, updated_at = ? WHERE id = ?",
+                (status, error, next_attempt_at, now, job.job_id),
+            )
+        return status
+
+    def release(self, job: Job, owner: str) -> bool:
+        """実行を中断したジョブを待機中に戻す (試行回数には数えない)"""
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_owner = NULL, "
+                "lease_until = NULL, next_attempt_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ? AND attempts = ?",
+                (STATUS_PENDING, now, now, job.job_id, STATUS_RUNNING, owner, job.attempts),
+            )
+        return cursor.rowcount > 0
+
+    def cancel(self, job_id: int) -> bool:
+        """待機中のジョブを取り消し (実行中のジョブは完了時に結果を破棄)"""
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_until = NULL, "
+                "updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                (STATUS_CANCELLED, now, job_id, STATUS_PENDING, STATUS_RUNNING),
+            )
+        return cursor.rowcount > 0
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def counts(self) -> Dict[str, int]:
+        """状態ごとのジョブ数"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["count"] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def _write_text_atomic(path: str, text: str):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+class JobWorkerPool:
+    """キューからジョブを取り出して transcribe_audio で処理するワーカースレッド群"""
+
+    def __init__(
+            self,
+            queue: JobQueue,
+            config: configparser.ConfigParser,
+            client: ElevenLabs,
+            workers: int = 2,
+            poll_interval_seconds: float = 1.0,
+            on_job_finished: Optional[Callable[[Job], None]] = None
+    ):
+        self._queue = queue
+        self._config = config
+        self._client = client
+        self._workers = max(1, workers)
+        self._poll_interval = poll_interval_seconds
+        self._on_job_finished = on_job_finished
+        # リースの所有者 (プロセスごとに一意)
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop_event = threading.Event()
+        self._cancel_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self):
+        if self._threads:
+            return
+        # 停止後すぐに再開しても、前回のスレッドは古いイベントを見て終了する
+        self._stop_event = threading.Event()
+        self._cancel_event = threading.Event()
+        workers = [
+            threading.Thread(
+                target=self._worker_loop, args=(self._stop_event, self._cancel_event),
+                name=f"JobWorker-{index}", daemon=True)
+            for index in range(self._workers)
+        ]
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop, args=(workers,), name="JobLease", daemon=True)
+        for thread in workers + [heartbeat]:
+            thread.start()
+        self._threads = workers + [heartbeat]
+        logging.info(f"ジョブワーカーを開始しました: {self._workers}スレッド")
+
+    def stop(self, wait: bool = True, timeout: Optional[float] = None, cancel_running: bool = False):
+        """新しいジョブの取り出しを止める
+
+        cancel_running=False の場合は実行中のジョブの完了を待つ。
+        True の場合は実行中の前処理・アップロードを中断し、ジョブを待機中に戻す。
+        """
+        self._stop_event.set()
+        if cancel_running:
+            self._cancel_event.set()
+        if wait:
+            for thread in self._threads:
+                thread.join(timeout)
+        self._threads = []
+
+    def _heartbeat_loop(self, workers: List[threading.Thread]):
+        """ワーカーが実行中のジョブを終えるまでリースを延長"""
+        interval = self._queue.lease_seconds / 3
+        last_renewed = time.monotonic()
+        while any(thread.is_alive() for thread in workers):
+            time.sleep(min(1.0, interval))
+            if time.monotonic() - last_renewed < interval:
+                continue
+            try:
+                self._queue.renew_leases(self._owner)
+            except sqlite3.Error as e:
+                logging.error(f"ジョブのリース延長エラー: {str(e)}")
+            last_renewed = time.monotonic()
+
+    def _worker_loop(self, stop_event: threading.Event, cancel_event: threading.Event):
+        while not stop_event.is_set():
+            try:
+                job = self._queue.claim(self._owner)
+            except sqlite3.Error as e:
+                logging.error(f"ジョブの取り出しエラー: {str(e)}")
+                job = None
+
+            if job is None:
+                stop_event.wait(self._poll_interval)
+                continue
+
+            self._run_job(job, cancel_event)
+
+    def _run_job(self, job: Job, cancel_event: Optional[threading.Event] = None):
+        """1件のジョブを実行して結果を記録"""
+        logging.info(f"ジョブ #{job.job_id} を開始 ({job.attempts}/{job.max_attempts}回目): {job.audio_path}")
+        try:
+            if not os.path.exists(job.audio_path):
+                self._queue.fail(
+                    job, self._owner, f"音声ファイルが存在しません: {job.audio_path}", retry=False)
+                return
+
+            text = transcribe_audio(
+                job.audio_path, self._config, self._client, cancel_event=cancel_event)
+            if text is None:
+                self._queue.fail(job, self._owner, "文字起こしに失敗しました")
+                return
+
+            # ファイルの書き込み後に完了を記録する (途中で終了した場合は再実行される)
+            if job.output_path:
+                _write_text_atomic(job.output_path, text)
+            if not self._queue.complete(job, self._owner, text):
+                return
+
+        except TranscriptionCancelledError:
+            try:
+                self._queue.release(job, self._owner)
+                logging.info(f"ジョブ #{job.job_id} を中断して待機中に戻しました")
+            except sqlite3.Error as db_error:
+                logging.error(f"ジョブの状態更新エラー: {str(db_error)}")
+            return
+
+        except Exception as e:
+            logging.error(f"ジョブ #{job.job_id} の実行エラー: {str(e)}")
+            logging.debug(f"詳細: {traceback.format_exc()}")
+            try:
+                self._queue.fail(job, self._owner, str(e))
+            except sqlite3.Error as db_error:
+                logging.error(f"ジョブの状態更新エラー: {str(db_error)}")
+            return
+
+        finally:
+            self._notify_finished(job.job_id)
+
+        logging.info(f"ジョブ #{job.job_id} が完了しました")
+
+    def _notify_finished(self, job_id: int):
+        """完了・最終的な失敗を通知 (再試行待ちの場合は通知しない)"""
+        if self._on_job_finished is None:
+            return
+        try:
+            finished = self._queue.get(job_id)
+            if finished is not None and finished.status in (STATUS_DONE, STATUS_FAILED):
+                self._on_job_finished(finished)
+        except Exception as e:
+            logging.error(f"ジョブ完了通知のエラー: {str(e)}")
@@ -0,0 +1,317 @@
+import configparser
+import logging
+import os
+import shutil
+import tempfile
+import time
+import traceback
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+from elevenlabs.client import ElevenLabs
+
+from external_service.audio_preprocess import PreprocessOptions, decode_frames
+from external_service.elevenlabs_api import transcribe_audio, validate_audio_file
+from external_service.transcription_cache import compute_cache_key, get_transcription_cache
+from utils.config_manager import get_config_value
+
+# 無音検出の解析窓 (秒)
+ANALYSIS_WINDOW_SECONDS = 0.03
+# 一度に読み込むフレーム数 (ファイル全体をメモリに載せない)
+READ_BLOCK_FRAMES = 16000 * 30
+# 重なりとみなす最短の一致文字数 (偶然の一致で本文を削らないように)
+MIN_OVERLAP_CHARS = 4
+# 単語の区切りに空白を使わない言語
+NO_SPACE_LANGUAGES = {"jpn", "ja", "zho", "zh", "cmn", "yue", "tha", "th"}
+
+
+@dataclass
+class BatchOptions:
+    """長時間ファイル分割の設定"""
+
+    long_file_threshold_seconds: float = 600.0
+    segment_seconds: float = 300.0
+    search_window_seconds: float = 30.0
+    overlap_seconds: float = 1.5
+    silence_threshold_db: float = -40.0
+    min_silence_seconds: float = 0.3
+    max_workers: int = 4
+    max_overlap_chars: int = 60
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> "BatchOptions":
+        defaults = cls()
+        return cls(
+            long_file_threshold_seconds=get_config_value(
+                config, 'BATCH', 'long_file_threshold_seconds', defaults.long_file_threshold_seconds),
+            segment_seconds=get_config_value(
+                config, 'BATCH', 'segment_seconds', defaults.segment_seconds),
+            search_window_seconds=get_config_value(
+                config, 'BATCH', 'search_window_seconds', defaults.search_window_seconds),
+            overlap_seconds=get_config_value(
+                config, 'BATCH', 'overlap_seconds', defaults.overlap_seconds),
+            silence_threshold_db=get_config_value(
+                config, 'BATCH', 'silence_threshold_db', defaults.silence_threshold_db),
+            min_silence_seconds=get_config_value(
+                config, 'BATCH', 'min_silence_seconds', defaults.min_silence_seconds),
+            max_workers=get_config_value(
+                config, 'BATCH', 'max_workers', defaults.max_workers),
+            max_overlap_chars=get_config_value(
+                config, 'BATCH', 'max_overlap_chars', defaults.max_overlap_chars),
+        )
+
+
+@dataclass
+class AudioSegment:
+    """分割した区間 (フレーム単位、重なりを含む)"""
+
+    index: int
+    start_frame: int
+    end_frame: int
+
+
+def _window_levels_db(wav: wave.Wave_read, window_frames: int) -> np.ndarray:
+    """解析窓ごとの音量 (dBFS) をブロック単位の読み込みで算出
+
+    未対応のサンプル幅の場合は ValueError を送出する。
+    """
+    sample_width = wav.getsampwidth()
+    channels = wav.getnchannels()
+    block_frames = max(window_frames, READ_BLOCK_FRAMES - READ_BLOCK_FRAMES % window_frames)
+
+    levels: List[np.ndarray] = []
+    wav.rewind()
+    while True:
+        data = wav.readframes(block_frames)
+        if not data:
+            break
+
+        samples = decode_frames(data, sample_width, channels)
+        window_count = len(samples) // window_frames
+        if window_count == 0:
+            continue
+        windows = samples[: window_count * window_frames].reshape(window_count, window_frames)
+        rms = np.sqrt(np.mean(windows * windows, axis=1))
+        levels.append(20 * np.log10(np.maximum(rms, 1e-10)))
+
+    if not levels:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(levels)
+
+
+def _find_split_window(
+        silent: np.ndarray,
+        search_start: int,
+        search_end: int,
+        min_silence_windows: int
+) -> Optional[int]:
+    """探索範囲内で最も長い無音区間の中央の窓番号 (見つからなければNone)"""
+    best_center = None
+    best_length = 0
+    run_start = None
+
+    for i in range(search_start, search_end + 1):
+        is_silent = i < search_end and silent[i]
+        if is_silent and run_start is None:
+            run_start = i
+        elif not is_silent and run_start is not None:
+            length = i - run_start
+            # 同じ長さなら目標位置 (探索範囲の末尾) に近い方を優先
+            if length >= min_silence_windows and length >= best_length:
+                best_length = length
+                best_center = run_start + length // 2
+            run_start = None
+
+    return best_center
+
+
+def plan_segments(wav: wave.Wave_read, options: BatchOptions) -> List[AudioSegment]:
+    """無音位置で区切った重なり付きの区間を計画"""
+    frame_rate = wav.getframerate()
+    total_frames = wav.getnframes()
+    window_frames = max(1, int(frame_rate * ANALYSIS_WINDOW_SECONDS))
+
+    levels = _window_levels_db(wav, window_frames)
+    silent = levels < options.silence_threshold_db
+    window_count = len(levels)
+
+    segment_windows = max(1, int(options.segment_seconds / ANALYSIS_WINDOW_SECONDS))
+    search_windows = int(options.search_window_seconds / ANALYSIS_WINDOW_SECONDS)
+    min_silence_windows = max(1, int(options.min_silence_seconds / ANALYSIS_WINDOW_SECONDS))
+    overlap_frames = int(options.overlap_seconds * frame_rate)
+
+    boundaries = [0]
+    position = 0
+    while window_count - position > segment_windows:
+        target = position + segment_windows
+        split = _find_split_window(
+            silent, max(position + 1, target - search_windows), target, min_silence_windows)
+        if split is None:
+            logging.debug(f"無音が見つからないため {target * ANALYSIS_WINDOW_SECONDS:.1f}秒で分割")
+            split = target
+        boundaries.append(split)
+        position = split
+    boundaries.append(window_count)
+
+    segments = []
+    for index, (start, end) in enumerate(zip(boundaries, boundaries[1:])):
+        start_frame = max(0, start * window_frames - overlap_frames)
+        end_frame = total_frames if index == len(boundaries) - 2 else min(
+            total_frames, end * window_frames + overlap_frames)
+        segments.append(AudioSegment(index=index, start_frame=start_frame, end_frame=end_frame))
+    return segments
+
+
+def _write_segment(wav: wave.Wave_read, segment: AudioSegment, output_path: str):
+    """区間を個別のWAVファイルに書き出し"""
+    with wave.open(output_path, "wb") as out:
+        out.setnchannels(wav.getnchannels())
+        out.setsampwidth(wav.getsampwidth())
+        out.setframerate(wav.getframerate())
+
+        frame_size = wav.getnchannels() * wav.getsampwidth()
+        wav.setpos(segment.start_frame)
+        remaining = segment.end_frame - segment.start_frame
+        while remaining > 0:
+            data = wav.readframes(min(remaining, READ_BLOCK_FRAMES))
+            if not data:
+                break
+            out.writeframes(data)
+            remaining -= len(data) // frame_size
+
+
+def merge_transcripts(texts: List[str], max_overlap_chars: int = 60, separator: str = "") -> str:
+    """区間ごとの文字起こしを順に連結し、重なり部分の重複を除去"""
+    merged = ""
+    for text in texts:
+        text = text.strip()
+        if not text:
+            continue
+        if not merged:
+            merged = text
+            continue
+
+        # 前の末尾と次の先頭で一致する最長部分を重なりとみなす
+        overlap = 0
+        limit = min(len(merged), len(text), max_overlap_chars)
+        for length in range(limit, MIN_OVERLAP_CHARS - 1, -1):
+            if merged.endswith(text[:length]):
+                overlap = length
+                break
+
+        remainder = text[overlap:]
+        if not remainder.strip():
+            continue
+        # 重なりが単語の途中で終わる場合は区切りを入れずに続ける
+        if overlap == 0 or remainder[0].isspace():
+            merged = f"{merged}{separator}{remainder.lstrip()}"
+        else:
+            merged += remainder
+    return merged
+
+
+def audio_duration_seconds(audio_file_path: str) -> Optional[float]:
+    """WAVファイルの長さ (WAV以外・読み込めない場合はNone)"""
+    try:
+        with wave.open(audio_file_path, "rb") as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except (wave.Error, EOFError, OSError):
+        return None
+
+
+def transcribe_long_audio(
+        audio_file_path: str,
+        config: configparser.ConfigParser,
+        client: ElevenLabs,
+        options: Optional[BatchOptions] = None,
+        use_cache: bool = True
+) -> Optional[str]:
+    """長時間の音声を無音位置で分割し、並列に文字起こしして連結
+
+    WAV以外、または閾値より短いファイルは transcribe_audio にそのまま渡す。
+    """
+    is_valid, error_msg = validate_audio_file(audio_file_path)
+    if not is_valid:
+        if error_msg:
+            logging.error(error_msg)
+        return None
+
+    options = options or BatchOptions.from_config(config)
+    duration = audio_duration_seconds(audio_file_path)
+    if duration is None:
+        logging.info("WAV以外のファイルのため分割せずに文字起こしします")
+        return transcribe_audio(audio_file_path, config, client, use_cache=use_cache)
+    if duration <= options.long_file_threshold_seconds:
+        return transcribe_audio(audio_file_path, config, client, use_cache=use_cache)
+
+    # ファイル全体の結果をキャッシュし、区間ごとの結果はキャッシュしない
+    # (区間は transcribe_audio が config の前処理設定で変換して送信する)
+    cache = get_transcription_cache(config) if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = compute_cache_key(
+            audio_file_path, config['ELEVENLABS']['MODEL'], config['ELEVENLABS']['LANGUAGE'],
+            PreprocessOptions.from_config(config))
+        cached_text = cache.get(cache_key)
+        if cached_text is not None:
+            logging.info(f"キャッシュから文字起こし結果を取得: {len(cached_text)}文字")
+            return cached_text
+
+    temp_dir = tempfile.mkdtemp(prefix="voicescribe_segments_")
+    try:
+        start_time = time.perf_counter()
+        segment_paths = []
+        with wave.open(audio_file_path, "rb") as wav:
+            try:
+                segments = plan_segments(wav, options)
+            except ValueError as e:
+                logging.warning(f"分割できない音声のため分割せずに文字起こしします: {str(e)}")
+                return transcribe_audio(audio_file_path, config, client, use_cache=use_cache)
+            for segment in segments:
+                segment_path = os.path.join(temp_dir, f"segment_{segment.index:04d}.wav")
+                _write_segment(wav, segment, segment_path)
+                segment_paths.append(segment_path)
+
+        logging.info(
+            f"長時間ファイルを分割: {duration:.0f}秒 → {len(segments)}区間 "
+            f"(並列数 {options.max_workers})"
+        )
+
+        with ThreadPoolExecutor(max_workers=options.max_workers) as executor:
+            results = list(executor.map(
+                lambda path: transcribe_audio(path, config, client, use_cache=False),
+                segment_paths))
+
+        failed = [index for index, result in enumerate(results) if result is None]
+        if failed:
+            logging.error(f"区間の文字起こしに失敗しました: {failed}")
+            return None
+
+        language = config['ELEVENLABS']['LANGUAGE'].lower()
+        separator = "" if language in NO_SPACE_LANGUAGES else " "
+        text_result = merge_transcripts(
+            [result for result in results if result is not None],
+            max_overlap_chars=options.max_overlap_chars,
+            separator=separator,
+        )
+
+        if cache is not None and cache_key is not None and text_result:
+            cache.put(cache_key, text_result)
+
+        elapsed = time.perf_counter() - start_time
+        logging.info(
+            f"長時間ファイルの文字起こし完了: {len(text_result)}文字, {elapsed:.1f}秒 "
+            f"(実時間比 {duration / elapsed:.1f}倍)"
+        )
+        return text_result
+
+    except Exception as e:
+        logging.error(f"長時間ファイルの文字起こしエラー: {str(e)}")
+        logging.debug(f"詳細: {traceback.format_exc()}")
+        return None
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
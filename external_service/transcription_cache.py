@@ -0,0 +1,188 @@
+import configparser
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from utils.config_manager import get_config_value
+
+if TYPE_CHECKING:
+    from external_service.audio_preprocess import PreprocessOptions
+
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_SIZE_MB = 100
+
+
+def _preprocess_token(preprocess_options: Optional["PreprocessOptions"]) -> str:
+    """前処理の設定を表すキーの一部 (前処理しない場合は raw)"""
+    if preprocess_options is None or not preprocess_options.enabled:
+        return "raw"
+    settings = json.dumps(dataclasses.asdict(preprocess_options), sort_keys=True)
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+
+
+def compute_cache_key(
+        audio_file_path: str,
+        model: str,
+        language: str,
+        preprocess_options: Optional["PreprocessOptions"] = None
+) -> str:
+    """音声の内容とモデル・言語・前処理の設定からキャッシュキーを算出 (ファイルは分割して読み込む)
+
+    前処理の設定が変わると送信する音声も変わるため、別のキーにする。
+    """
+    digest = hashlib.sha256()
+    with open(audio_file_path, "rb") as file:
+        while True:
+            chunk = file.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return f"{digest.hexdigest()}:{model}:{language}:{_preprocess_token(preprocess_options)}"
+
+
+def get_default_data_dir() -> str:
+    """アプリのローカルデータディレクトリ"""
+    if sys.platform == "win32":
+        base_dir = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base_dir, "VoiceScribe")
+
+
+def get_default_cache_dir() -> str:
+    """アプリのデータディレクトリ配下のキャッシュディレクトリ"""
+    return os.path.join(get_default_data_dir(), "cache")
+
+
+class TranscriptionCache:
+    """文字起こし結果の永続キャッシュ (SQLite, サイズ上限付きLRU)"""
+
+    def __init__(self, db_path: str, max_size_bytes: int = DEFAULT_MAX_SIZE_MB * 1024 * 1024):
+        self.db_path = db_path
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transcriptions (
+                cache_key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_accessed ON transcriptions (last_accessed)"
+        )
+        self._connection.commit()
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """キャッシュを取得 (参照時刻を更新)"""
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT text FROM transcriptions WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                self._connection.execute(
+                    "UPDATE transcriptions SET last_accessed = ? WHERE cache_key = ?",
+                    (time.time(), cache_key),
+                )
+                self._connection.commit()
+                return row[0]
+
+            except sqlite3.Error as e:
+                logging.error(f"文字起こしキャッシュの読み込みエラー: {str(e)}")
+                return None
+
+    def put(self, cache_key: str, text: str):
+        """キャッシュに保存し、上限を超えた分を古い順に削除"""
+        size = len(text.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO transcriptions "
+                    "(cache_key, text, size, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)",
+                    (cache_key, text, size, now, now),
+                )
+                self._evict()
+                self._connection.commit()
+
+            except sqlite3.Error as e:
+                self._connection.rollback()
+                logging.error(f"文字起こしキャッシュの書き込みエラー: {str(e)}")
+
+    def _evict(self):
+        """合計サイズが上限以下になるまで最も古く参照されたものから削除"""
+        total_size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM transcriptions"
+        ).fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        rows = self._connection.execute(
+            "SELECT cache_key, size FROM transcriptions ORDER BY last_accessed ASC"
+        ).fetchall()
+        for cache_key, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            self._connection.execute("DELETE FROM transcriptions WHERE cache_key = ?", (cache_key,))
+            total_size -= size
+            evicted += 1
+
+        if evicted:
+            logging.info(f"文字起こしキャッシュから{evicted}件を削除しました")
+
+    def clear(self):
+        """全てのキャッシュを削除"""
+        with self._lock:
+            self._connection.execute("DELETE FROM transcriptions")
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_caches: Dict[str, TranscriptionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_transcription_cache(config: configparser.ConfigParser) -> Optional[TranscriptionCache]:
+    """設定に応じたキャッシュを取得 (無効の場合はNone)"""
+    try:
+        enabled = config.getboolean('CACHE', 'enabled', fallback=True)
+    except ValueError:
+        enabled = True
+    if not enabled:
+        return None
+
+    cache_dir = get_config_value(config, 'CACHE', 'directory', '') or get_default_cache_dir()
+    max_size_mb = get_config_value(config, 'CACHE', 'max_size_mb', DEFAULT_MAX_SIZE_MB)
+    db_path = os.path.join(cache_dir, "transcriptions.sqlite3")
+
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            try:
+                cache = TranscriptionCache(db_path, max_size_mb * 1024 * 1024)
+            except (sqlite3.Error, OSError) as e:
+                logging.error(f"文字起こしキャッシュを開けません: {str(e)}")
+                return None
+            _caches[db_path] = cache
+        return cache
@@ -1,9 +1,9 @@
 """PyAudio音声録音モジュール - QThread対応"""
 
 import logging
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional
 
-import pyaudio
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from config.settings import AudioSettings
@@ -12,9 +12,32 @@ from domain.exceptions import (
     AudioRecordingError,
     AudioStreamError,
 )
+from utils.latency_tracer import LatencyTracer
+from utils.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    import pyaudio
 
 logger = logging.getLogger(__name__)
 
+_CHUNKS_CAPTURED = REGISTRY.counter(
+    "voicescribe_audio_chunks_captured_total", "録音した音声チャンク数"
+)
+_BYTES_CAPTURED = REGISTRY.counter(
+    "voicescribe_audio_bytes_captured_total", "録音した音声データのバイト数"
+)
+_READ_ERRORS = REGISTRY.counter(
+    "voicescribe_audio_read_errors_total", "音声チャンクの読み取りエラー数"
+)
+
+
+def preload_portaudio():
+    """PyAudio (PortAudio) を事前に読み込み、初回の録音開始を速くする"""
+    try:
+        import pyaudio  # noqa: F401
+    except Exception as e:
+        logger.warning(f"PyAudio の事前読み込みに失敗: {e}")
+
 
 class AudioRecorderWorker(QThread):
     """音声録音ワーカースレッド"""
@@ -25,13 +48,19 @@ class AudioRecorderWorker(QThread):
     recording_stopped = pyqtSignal()
     error_occurred = pyqtSignal(Exception)
 
-    def __init__(self, settings: AudioSettings):
+    def __init__(
+        self, settings: AudioSettings, tracer: Optional[LatencyTracer] = None
+    ):
         super().__init__()
         self._settings = settings
-        self._pyaudio: Optional[pyaudio.PyAudio] = None
-        self._stream: Optional[pyaudio.Stream] = None
+        self._tracer = tracer
+        self._pyaudio: Optional["pyaudio.PyAudio"] = None
+        self._stream: Optional["pyaudio.Stream"] = None
         self._is_recording = False
 
+        # 読み取り完了時点から見た、チャンク先頭サンプルの録音時刻までの遅れ
+        self._capture_lag_ns = 0
+
     def run(self):
         """QThread のメインループ"""
         try:
@@ -41,8 +70,13 @@ class AudioRecorderWorker(QThread):
                 try:
                     chunk_data = self._read_audio_chunk()
                     if chunk_data:
+                        _CHUNKS_CAPTURED.inc()
+                        _BYTES_CAPTURED.inc(len(chunk_data))
+                        if self._tracer is not None:
+                            self._tracer.mark_capture(self._estimate_capture_ns())
                         self.audio_chunk_ready.emit(chunk_data)
                 except Exception as e:
+                    _READ_ERRORS.inc()
                     logger.error(f"音声チャンク読み取りエラー: {e}")
                     self.error_occurred.emit(AudioStreamError(str(e)))
                     break
@@ -79,6 +113,9 @@ class AudioRecorderWorker(QThread):
     def _initialize_pyaudio(self):
         """PyAudio を初期化"""
         try:
+            # PortAudio は起動時間に影響するため録音開始時に読み込む
+            import pyaudio
+
             self._pyaudio = pyaudio.PyAudio()
 
             # デバイス情報をログ出力
@@ -94,6 +131,9 @@ class AudioRecorderWorker(QThread):
                 frames_per_buffer=self._settings.chunk_size,
             )
 
+            if self._tracer is not None:
+                self._measure_capture_lag()
+
             logger.info(
                 f"PyAudio初期化完了: {self._settings.sample_rate}Hz, "
                 f"{self._settings.channels}ch, {self._settings.chunk_size} samples/chunk"
@@ -107,6 +147,31 @@ class AudioRecorderWorker(QThread):
             logger.error(f"PyAudio初期化エラー: {e}")
             raise AudioRecordingError(f"録音初期化失敗: {e}")
 
+    def _measure_capture_lag(self):
+        """読み取り完了からチャンク先頭サンプルの録音時刻までの遅れを求める
+
+        ブロッキング読み取りではコールバックの time_info (ADC時刻) が
+        得られないため、入力レイテンシとチャンク長の和で近似する。
+        """
+        if not self._stream:
+            return
+
+        try:
+            chunk_seconds = self._settings.chunk_size / self._settings.sample_rate
+            input_latency = self._stream.get_input_latency()
+            self._capture_lag_ns = int((input_latency + chunk_seconds) * 1e9)
+
+        except Exception as e:
+            logger.debug(f"入力レイテンシの取得に失敗: {e}")
+            self._capture_lag_ns = 0
+
+    def _estimate_capture_ns(self) -> int:
+        """直前に読み取ったチャンクの推定録音時刻 (time.monotonic_ns)
+
+        読み取り完了時刻から、入力レイテンシとチャンク長の分をさかのぼる。
+        """
+        return time.monotonic_ns() - self._capture_lag_ns
+
     def _read_audio_chunk(self) -> Optional[bytes]:
         """音声チャンクを読み取り"""
         if not self._stream or not self._stream.is_active():
@@ -148,6 +213,8 @@ class AudioRecorderWorker(QThread):
 
     def _get_audio_format(self) -> int:
         """PyAudio フォーマットを取得"""
+        import pyaudio
+
         if self._settings.format_bits == 16:
             return pyaudio.paInt16
         elif self._settings.format_bits == 24:
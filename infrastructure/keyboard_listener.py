@@ -20,6 +20,7 @@ class GlobalHotkeyManager(QObject):
     toggle_punctuation_pressed = pyqtSignal()
     exit_app_pressed = pyqtSignal()
     reload_replacements_pressed = pyqtSignal()
+    cycle_profile_pressed = pyqtSignal()
 
     def __init__(self, settings: HotkeySettings):
         super().__init__()
@@ -62,6 +63,13 @@ class GlobalHotkeyManager(QObject):
                 self._on_reload_replacements,
             )
 
+            # 辞書プロファイル切替
+            self._register_hotkey(
+                "cycle_profile",
+                self._settings.cycle_profile,
+                self._on_cycle_profile,
+            )
+
             self._is_active = True
             logger.info("ホットキー登録完了")
 
@@ -94,7 +102,13 @@ class GlobalHotkeyManager(QObject):
 
     def update_hotkey(self, action: str, new_key: str):
         """ホットキーを動的に変更"""
-        if action not in ["toggle_recording", "toggle_punctuation", "exit_app", "reload_replacements"]:
+        if action not in [
+            "toggle_recording",
+            "toggle_punctuation",
+            "exit_app",
+            "reload_replacements",
+            "cycle_profile",
+        ]:
             logger.error(f"未知のアクション: {action}")
             return
 
@@ -147,6 +161,11 @@ class GlobalHotkeyManager(QObject):
         logger.debug("再読込キーが押されました")
         self.reload_replacements_pressed.emit()
 
+    def _on_cycle_profile(self, event: Optional[keyboard.KeyboardEvent] = None):
+        """辞書プロファイル切替時のコールバック"""
+        logger.debug("辞書プロファイル切替キーが押されました")
+        self.cycle_profile_pressed.emit()
+
     @property
     def is_active(self) -> bool:
         """ホットキーが有効かどうか"""
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import logging
 from datetime import datetime
 from typing import Optional
@@ -15,9 +14,51 @@ from domain.exceptions import (
     WebSocketConnectionError,
 )
 from domain.models import ConnectionState, Transcript, TranscriptType
+from utils.latency_tracer import LatencyTracer
+from utils.metrics import REGISTRY
+from utils.protocol_codec import (
+    KIND_COMMITTED,
+    KIND_ERROR,
+    KIND_PARTIAL,
+    MessageDispatcher,
+    decode_message,
+    error_message_of,
+    message_type_of,
+)
 
 logger = logging.getLogger(__name__)
 
+_CHUNKS_SENT = REGISTRY.counter(
+    "voicescribe_ws_chunks_sent_total", "WebSocketに送信した音声チャンク数"
+)
+_BYTES_SENT = REGISTRY.counter(
+    "voicescribe_ws_bytes_sent_total", "WebSocketに送信した音声データのバイト数"
+)
+_CHUNKS_DROPPED = REGISTRY.counter(
+    "voicescribe_ws_chunks_dropped_total", "送信キュー満杯で破棄した音声チャンク数"
+)
+_RECONNECTS = REGISTRY.counter(
+    "voicescribe_ws_reconnects_total", "WebSocketの再接続試行回数"
+)
+_CONNECT_FAILURES = REGISTRY.counter(
+    "voicescribe_ws_connect_failures_total", "WebSocketの接続失敗回数"
+)
+_PARTIALS = REGISTRY.counter(
+    "voicescribe_transcripts_partial_total", "受信した部分結果の件数"
+)
+_COMMITS = REGISTRY.counter(
+    "voicescribe_transcripts_committed_total", "受信した確定結果の件数"
+)
+_COMMIT_LATENCY = REGISTRY.histogram(
+    "voicescribe_commit_latency_seconds", "最初の部分結果から確定結果までの時間"
+)
+_SEND_QUEUE_DEPTH = REGISTRY.gauge(
+    "voicescribe_ws_send_queue_depth", "送信待ちの音声チャンク数"
+)
+_ROUND_TRIP = REGISTRY.gauge(
+    "voicescribe_ws_round_trip_seconds", "直近のping/pongによる往復遅延"
+)
+
 
 class RealtimeTranscriptionClient(QObject):
     """ElevenLabs Realtime API WebSocketクライアント"""
@@ -28,15 +69,34 @@ class RealtimeTranscriptionClient(QObject):
     connection_state_changed = pyqtSignal(ConnectionState)
     error_occurred = pyqtSignal(Exception)
 
-    def __init__(self, api_key: str, settings: RealtimeApiSettings):
+    def __init__(
+        self,
+        api_key: str,
+        settings: RealtimeApiSettings,
+        tracer: Optional[LatencyTracer] = None,
+    ):
         super().__init__()
         self._api_key = api_key
         self._settings = settings
+        self._tracer = tracer
         self._websocket: Optional[ClientConnection] = None
         self._connection_state = ConnectionState.DISCONNECTED
         self._reconnect_count = 0
         self._is_running = False
         self._audio_queue: asyncio.Queue = asyncio.Queue(maxsize=10)
+        self._dropped_chunks = 0
+        self._utterance_start_ns: Optional[int] = None
+        self._dispatcher = MessageDispatcher(
+            {
+                KIND_PARTIAL: self._on_partial,
+                KIND_COMMITTED: self._on_committed,
+                KIND_ERROR: self._on_error,
+            },
+            default=self._on_unknown,
+        )
+
+        _SEND_QUEUE_DEPTH.set_function(self._audio_queue.qsize)
+        _ROUND_TRIP.set_function(lambda: (self.round_trip_ms or 0.0) / 1000)
 
     def _check_connected(self) -> bool:
         """接続状態を確認するヘルパーメソッド"""
@@ -63,6 +123,29 @@ class RealtimeTranscriptionClient(QObject):
         """現在の接続状態"""
         return self._connection_state
 
+    @property
+    def queue_depth(self) -> int:
+        """送信待ちの音声チャンク数"""
+        return self._audio_queue.qsize()
+
+    @property
+    def queue_capacity(self) -> int:
+        """送信キューの上限"""
+        return self._audio_queue.maxsize
+
+    @property
+    def dropped_chunks(self) -> int:
+        """キュー満杯で破棄した音声チャンク数 (累計)"""
+        return self._dropped_chunks
+
+    @property
+    def round_trip_ms(self) -> Optional[float]:
+        """直近のping/pongによる往復遅延 (未計測ならNone)"""
+        latency = getattr(self._websocket, "latency", None)
+        if not latency:
+            return None
+        return latency * 1000
+
     def _set_connection_state(self, state: ConnectionState):
         """接続状態を更新してSignalを発火"""
         if self._connection_state != state:
@@ -119,6 +202,7 @@ class RealtimeTranscriptionClient(QObject):
                 f"接続タイムアウト ({self._settings.connection_timeout}秒)"
             )
             logger.error("WebSocket接続がタイムアウトしました")
+            _CONNECT_FAILURES.inc()
             self.error_occurred.emit(error)
             self._set_connection_state(ConnectionState.FAILED)
             return False
@@ -126,11 +210,13 @@ class RealtimeTranscriptionClient(QObject):
         except websockets.InvalidStatusCode as e:
             if e.status_code == 401:
                 error = WebSocketAuthenticationError("APIキーが無効です")
+                _CONNECT_FAILURES.inc()
                 self.error_occurred.emit(error)
                 self._set_connection_state(ConnectionState.FAILED)
                 raise error
             else:
                 error = WebSocketConnectionError(f"接続エラー: HTTP {e.status_code}")
+                _CONNECT_FAILURES.inc()
                 self.error_occurred.emit(error)
                 self._set_connection_state(ConnectionState.FAILED)
                 raise error
@@ -138,6 +224,7 @@ class RealtimeTranscriptionClient(QObject):
         except Exception as e:
             error = WebSocketConnectionError(f"予期しないエラー: {e}")
             logger.error(f"接続失敗: {e}", exc_info=True)
+            _CONNECT_FAILURES.inc()
             self.error_occurred.emit(error)
             self._set_connection_state(ConnectionState.FAILED)
             return False
@@ -153,6 +240,7 @@ class RealtimeTranscriptionClient(QObject):
                 logger.error(f"切断エラー: {e}")
             finally:
                 self._websocket = None
+                self._utterance_start_ns = None
                 self._set_connection_state(ConnectionState.DISCONNECTED)
 
     async def send_audio(self, data: bytes):
@@ -168,10 +256,14 @@ class RealtimeTranscriptionClient(QObject):
                 logger.warning("音声キューが満杯 - 古いデータを破棄")
                 try:
                     self._audio_queue.get_nowait()
+                    self._dropped_chunks += 1
+                    _CHUNKS_DROPPED.inc()
                 except asyncio.QueueEmpty:
                     pass
 
             await self._audio_queue.put(data)
+            if self._tracer is not None:
+                self._tracer.mark_enqueue()
 
         except Exception as e:
             logger.error(f"音声データキューイングエラー: {e}")
@@ -189,6 +281,10 @@ class RealtimeTranscriptionClient(QObject):
                 # 接続確認してから送信
                 if self._websocket and self._check_connected():
                     await self._websocket.send(data)
+                    _CHUNKS_SENT.inc()
+                    _BYTES_SENT.inc(len(data))
+                    if self._tracer is not None:
+                        self._tracer.mark_send()
                 else:
                     logger.debug("送信時にWebSocket未接続")
 
@@ -222,10 +318,13 @@ class RealtimeTranscriptionClient(QObject):
                     break
 
                 try:
-                    data = json.loads(message)
-                    await self._handle_message(data)
-                except json.JSONDecodeError as e:
+                    kind, data = decode_message(message)
+                except ValueError as e:
                     logger.error(f"JSONパースエラー: {e}")
+                    continue
+
+                try:
+                    self._dispatcher.handle(kind, data)
                 except Exception as e:
                     logger.error(f"メッセージ処理エラー: {e}")
 
@@ -256,42 +355,51 @@ class RealtimeTranscriptionClient(QObject):
             else:
                 logger.info("受信ループ終了: WebSocket=None")
 
-    async def _handle_message(self, data: dict):
-        """受信メッセージを処理"""
-        message_type = data.get("type")
-
-        if message_type == "partial":
-            # 部分結果
-            text = data.get("text", "")
-            transcript = Transcript(
-                text=text,
-                type=TranscriptType.PARTIAL,
-                timestamp=datetime.now(),
-            )
-            self.partial_transcript_received.emit(transcript)
-            logger.debug(f"部分結果: {text}")
-
-        elif message_type == "committed":
-            # 確定結果
-            text = data.get("text", "")
-            transcript = Transcript(
-                text=text,
-                type=TranscriptType.COMMITTED,
-                timestamp=datetime.now(),
+    def _on_partial(self, data: dict):
+        """部分結果"""
+        text = data.get("text", "")
+        transcript = Transcript(
+            text=text,
+            type=TranscriptType.PARTIAL,
+            timestamp=datetime.now(),
+        )
+        _PARTIALS.inc()
+        if self._utterance_start_ns is None:
+            self._utterance_start_ns = transcript.received_ns
+        if self._tracer is not None:
+            self._tracer.mark_first_partial()
+        self.partial_transcript_received.emit(transcript)
+        logger.debug("部分結果: %s", text)
+
+    def _on_committed(self, data: dict):
+        """確定結果"""
+        text = data.get("text", "")
+        transcript = Transcript(
+            text=text,
+            type=TranscriptType.COMMITTED,
+            timestamp=datetime.now(),
+        )
+        _COMMITS.inc()
+        if self._utterance_start_ns is not None:
+            _COMMIT_LATENCY.observe(
+                (transcript.received_ns - self._utterance_start_ns) / 1e9
             )
-            self.committed_transcript_received.emit(transcript)
-            logger.debug(f"確定結果: {text}")
-
-        elif message_type == "error":
-            # エラーメッセージ
-            error_msg = data.get("message", "Unknown error")
-            logger.error(f"サーバーからのエラー: {error_msg}")
-            error = TranscriptionError(f"サーバーエラー: {error_msg}")
-            self.error_occurred.emit(error)
-            self._set_connection_state(ConnectionState.FAILED)
-
-        else:
-            logger.debug(f"未知のメッセージタイプ: {message_type}")
+            self._utterance_start_ns = None
+        if self._tracer is not None:
+            self._tracer.mark_commit(transcript.received_ns)
+        self.committed_transcript_received.emit(transcript)
+        logger.debug("確定結果: %s", text)
+
+    def _on_error(self, data: dict):
+        """サーバーからのエラーメッセージ"""
+        error_msg = error_message_of(data)
+        logger.error(f"サーバーからのエラー: {error_msg}")
+        error = TranscriptionError(f"サーバーエラー: {error_msg}")
+        self.error_occurred.emit(error)
+        self._set_connection_state(ConnectionState.FAILED)
+
+    def _on_unknown(self, data: dict):
+        logger.debug("未知のメッセージタイプ: %s", message_type_of(data))
 
     async def _handle_reconnect(self):
         """再接続処理"""
@@ -305,6 +413,7 @@ class RealtimeTranscriptionClient(QObject):
             return
 
         self._reconnect_count += 1
+        _RECONNECTS.inc()
         delay = self._calculate_backoff_delay()
 
         logger.info(
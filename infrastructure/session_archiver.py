@@ -0,0 +1,111 @@
+"""録音セッションの音声保存 - バックグラウンドスレッドでWAVに書き出し"""
+
+import logging
+import queue
+import threading
+import wave
+from pathlib import Path
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from config.settings import AudioSettings
+
+logger = logging.getLogger(__name__)
+
+
+class SessionAudioArchiver(QObject):
+    """録音した音声チャンクをセッションごとのWAVファイルに保存
+
+    write_chunk は録音スレッドから呼ばれるため、キューに積むだけにして
+    ディスクへの書き込みは専用スレッドで行う (リアルタイム送信を遅らせない)。
+    """
+
+    # Signal定義
+    session_archived = pyqtSignal(str, str)  # (セッションID, WAVファイルパス)
+
+    def __init__(self, archive_dir: Path, settings: AudioSettings):
+        super().__init__()
+        self._archive_dir = archive_dir
+        self._settings = settings
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._active = False
+
+        logger.info(f"SessionAudioArchiver 初期化完了: {archive_dir}")
+
+    def begin_session(self, session_id: str) -> Path:
+        """セッションの保存を開始"""
+        self._ensure_thread()
+        path = self._archive_dir / f"{session_id}.wav"
+        self._queue.put(("begin", session_id, path))
+        self._active = True
+        return path
+
+    def write_chunk(self, data: bytes):
+        """音声チャンクを追加 (任意のスレッドから呼び出し可)"""
+        if self._active:
+            self._queue.put(("chunk", data))
+
+    def end_session(self):
+        """セッションの保存を終了 (書き出し完了時に session_archived を発火)"""
+        if self._active:
+            self._active = False
+            self._queue.put(("end",))
+
+    def shutdown(self, timeout: float = 5.0):
+        """書き込み途中のデータを書き出してスレッドを停止"""
+        self.end_session()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._writer_loop, name="SessionArchiver", daemon=True
+            )
+            self._thread.start()
+
+    def _writer_loop(self):
+        wav: Optional[wave.Wave_write] = None
+        session_id = ""
+        path: Optional[Path] = None
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            try:
+                if item[0] == "begin":
+                    if wav is not None:
+                        wav.close()
+                    session_id, path = item[1], item[2]
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    wav = wave.open(str(path), "wb")
+                    wav.setnchannels(self._settings.channels)
+                    wav.setsampwidth(self._settings.format_bits // 8)
+                    wav.setframerate(self._settings.sample_rate)
+
+                elif item[0] == "chunk" and wav is not None:
+                    wav.writeframes(item[1])
+
+                elif item[0] == "end" and wav is not None:
+                    wav.close()
+                    wav = None
+                    logger.info(f"録音を保存しました: {path}")
+                    self.session_archived.emit(session_id, str(path))
+
+            except (OSError, wave.Error) as e:
+                logger.error(f"録音の保存エラー: {e}")
+                if wav is not None:
+                    try:
+                        wav.close()
+                    except (OSError, wave.Error):
+                        pass
+                    wav = None
+
+        if wav is not None:
+            wav.close()
@@ -0,0 +1,289 @@
+"""テキスト入力バックエンド - 貼り付け・直接入力・計測用フェイク"""
+
+import logging
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import pyperclip
+
+logger = logging.getLogger(__name__)
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+VK_CONTROL = 0x11
+VK_V = 0x56
+
+
+class _Win32SendInput:
+    """SendInput の構造体と関数ポインタ (初回使用時に一度だけ構築)"""
+
+    _instance: Optional["_Win32SendInput"] = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [
+                ("dx", wintypes.LONG),
+                ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [
+                ("wVk", wintypes.WORD),
+                ("wScan", wintypes.WORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        # 共用体のサイズを SendInput の想定 (MOUSEINPUT が最大) に合わせる
+        class _INPUTUNION(ctypes.Union):
+            _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("ii", _INPUTUNION)]
+
+        self._ctypes = ctypes
+        self.INPUT = INPUT
+        self.input_size = ctypes.sizeof(INPUT)
+
+        self._send_input = ctypes.windll.user32.SendInput
+        self._send_input.argtypes = [wintypes.UINT, ctypes.c_void_p, ctypes.c_int]
+        self._send_input.restype = wintypes.UINT
+
+        # Ctrl+V は毎回同じなので事前に構築しておく
+        self.paste_inputs = self.build_key_inputs(
+            [
+                (VK_CONTROL, 0),
+                (VK_V, 0),
+                (VK_V, KEYEVENTF_KEYUP),
+                (VK_CONTROL, KEYEVENTF_KEYUP),
+            ]
+        )
+
+    @classmethod
+    def get(cls) -> "_Win32SendInput":
+        """共有インスタンスを取得"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def build_key_inputs(self, keys: List[tuple]) -> Any:
+        """(仮想キー, フラグ) の列から INPUT 配列を構築"""
+        inputs = (self.INPUT * len(keys))()
+        for item, (vk, flags) in zip(inputs, keys):
+            item.type = INPUT_KEYBOARD
+            item.ii.ki.wVk = vk
+            item.ii.ki.dwFlags = flags
+        return inputs
+
+    def build_unicode_inputs(self, text: str) -> Any:
+        """文字列から KEYEVENTF_UNICODE の INPUT 配列を構築"""
+        units = text.encode("utf-16-le")
+        count = len(units) // 2
+        inputs = (self.INPUT * (count * 2))()
+        for i in range(count):
+            code_unit = units[i * 2] | (units[i * 2 + 1] << 8)
+            down, up = inputs[i * 2], inputs[i * 2 + 1]
+            down.type = up.type = INPUT_KEYBOARD
+            down.ii.ki.wScan = up.ii.ki.wScan = code_unit
+            down.ii.ki.dwFlags = KEYEVENTF_UNICODE
+            up.ii.ki.dwFlags = KEYEVENTF_UNICODE | KEYEVENTF_KEYUP
+        return inputs
+
+    def send(self, inputs: Any) -> bool:
+        """INPUT 配列を送信"""
+        count = len(inputs)
+        sent = self._send_input(count, self._ctypes.byref(inputs), self.input_size)
+        return sent == count
+
+
+class TextInjectionBackend(ABC):
+    """テキスト入力バックエンド
+
+    貼り付けは prepare (クリップボードへの格納など) → verify → 待機 →
+    inject (キー入力の送信) の順に呼ばれる。
+    """
+
+    name = ""
+    uses_clipboard = True  # True の場合 prepare と inject の間で待機する
+
+    @abstractmethod
+    def prepare(self, text: str) -> bool:
+        """入力の準備"""
+
+    @abstractmethod
+    def verify(self, text: str) -> bool:
+        """準備結果の検証"""
+
+    @abstractmethod
+    def inject(self, text: str) -> bool:
+        """テキストを入力先に送信"""
+
+
+class ClipboardPasteBackend(TextInjectionBackend):
+    """クリップボード + Ctrl+V による貼り付け"""
+
+    name = "clipboard"
+    uses_clipboard = True
+
+    def prepare(self, text: str) -> bool:
+        pyperclip.copy(text)
+        return True
+
+    def verify(self, text: str) -> bool:
+        try:
+            return pyperclip.paste() == text
+        except Exception as e:
+            logger.error(f"クリップボード検証エラー: {e}")
+            return False
+
+    def inject(self, text: str) -> bool:
+        if sys.platform != "win32":
+            logger.warning("Windows以外では貼り付け機能は未サポート")
+            return False
+
+        try:
+            api = _Win32SendInput.get()
+            if not api.send(api.paste_inputs):
+                logger.error("SendInput が全てのキー入力を送信できませんでした")
+                return False
+
+            logger.debug("SendInput で貼り付け実行")
+            return True
+
+        except Exception as e:
+            logger.error(f"貼り付けエラー: {e}", exc_info=True)
+            return False
+
+
+class UnicodeTypingBackend(TextInjectionBackend):
+    """クリップボードを使わず Unicode 文字として直接入力"""
+
+    name = "unicode"
+    uses_clipboard = False
+
+    def prepare(self, text: str) -> bool:
+        return True
+
+    def verify(self, text: str) -> bool:
+        return True
+
+    def inject(self, text: str) -> bool:
+        if sys.platform != "win32":
+            logger.warning("Windows以外では直接入力は未サポート")
+            return False
+
+        try:
+            api = _Win32SendInput.get()
+            if not api.send(api.build_unicode_inputs(text)):
+                logger.error("SendInput が全ての文字を送信できませんでした")
+                return False
+
+            logger.debug("SendInput で直接入力: %d文字", len(text))
+            return True
+
+        except Exception as e:
+            logger.error(f"直接入力エラー: {e}", exc_info=True)
+            return False
+
+
+@dataclass
+class InjectionRecord:
+    """フェイクバックエンドの入力記録"""
+
+    text: str
+    prepared_ns: int  # prepare 呼び出し時刻 (time.monotonic_ns)
+    injected_ns: int  # inject 呼び出し時刻 (time.monotonic_ns)
+
+
+class RecordingInjectionBackend(TextInjectionBackend):
+    """入力を行わず時刻付きで記録するフェイク (ヘッドレスでの遅延計測用)
+
+    クリップボードは使わないため既定では貼り付け前の待機を行わない。
+    クリップボード方式の待機を含めて計測する場合は uses_clipboard=True を指定する。
+    """
+
+    name = "recording"
+    uses_clipboard = False
+
+    def __init__(self, uses_clipboard: bool = False):
+        self.uses_clipboard = uses_clipboard
+        self._records: List[InjectionRecord] = []
+        self._prepared: List[tuple] = []
+        self._condition = threading.Condition()
+
+    def prepare(self, text: str) -> bool:
+        with self._condition:
+            self._prepared.append((text, time.monotonic_ns()))
+        return True
+
+    def verify(self, text: str) -> bool:
+        return True
+
+    def inject(self, text: str) -> bool:
+        injected_ns = time.monotonic_ns()
+        with self._condition:
+            prepared_ns = injected_ns
+            for i, (prepared_text, timestamp) in enumerate(self._prepared):
+                if prepared_text == text:
+                    prepared_ns = timestamp
+                    del self._prepared[i]
+                    break
+
+            self._records.append(
+                InjectionRecord(
+                    text=text, prepared_ns=prepared_ns, injected_ns=injected_ns
+                )
+            )
+            self._condition.notify_all()
+        return True
+
+    def wait_for(self, count: int, timeout: float) -> bool:
+        """記録が count 件に達するまで待機"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: len(self._records) >= count, timeout=timeout
+            )
+
+    @property
+    def records(self) -> List[InjectionRecord]:
+        """入力記録 (コピー)"""
+        with self._condition:
+            return list(self._records)
+
+    def clear(self):
+        """記録を破棄"""
+        with self._condition:
+            self._records.clear()
+            self._prepared.clear()
+
+
+def create_injection_backend(name: str) -> TextInjectionBackend:
+    """名前からバックエンドを生成"""
+    backends = {
+        ClipboardPasteBackend.name: ClipboardPasteBackend,
+        UnicodeTypingBackend.name: UnicodeTypingBackend,
+        RecordingInjectionBackend.name: RecordingInjectionBackend,
+    }
+
+    backend_class = backends.get(name)
+    if backend_class is None:
+        logger.warning(f"未知の入力バックエンド: {name} → clipboard を使用")
+        backend_class = ClipboardPasteBackend
+
+    return backend_class()
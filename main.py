@@ -1,26 +1,45 @@
 import asyncio
 import logging
+import queue
 import sys
-from datetime import datetime, timedelta
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-
-import qasync
-from PyQt6.QtWidgets import QApplication, QMessageBox
-
-from application.clipboard_manager import ClipboardManager
-from application.orchestrator import TranscriptionOrchestrator
-from application.text_processor import TextPostProcessor
-from config.settings import AppSettings
-from infrastructure.audio_recorder import AudioRecorderWorker
-from infrastructure.keyboard_listener import GlobalHotkeyManager
-from infrastructure.realtime_client import RealtimeTranscriptionClient
-from presentation.dialogs.settings_dialog import SettingsDialog
-from presentation.main_window import MainWindow
-from presentation.widgets.control_panel import ControlPanel
-from presentation.widgets.status_bar import VoiceScribeStatusBar
-from presentation.widgets.transcript_view import TranscriptView
-from utils.error_handler import setup_exception_handler
+from typing import Optional
+
+from utils.startup_profiler import StartupProfiler
+
+# 以降のインポートも計測対象にするため、他のモジュールより先に生成する
+STARTUP_PROFILER = StartupProfiler.from_environment()
+
+import qasync  # noqa: E402
+from PyQt6.QtCore import QTimer  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox  # noqa: E402
+
+from application.batch_transcription import BatchTranscriptionManager  # noqa: E402
+from application.clipboard_manager import ClipboardManager  # noqa: E402
+from application.orchestrator import TranscriptionOrchestrator  # noqa: E402
+from application.performance_monitor import PerformanceSampler  # noqa: E402
+from application.text_processor import TextPostProcessor  # noqa: E402
+from config.settings import AppSettings  # noqa: E402
+from infrastructure.audio_recorder import AudioRecorderWorker, preload_portaudio  # noqa: E402
+from infrastructure.keyboard_listener import GlobalHotkeyManager  # noqa: E402
+from infrastructure.realtime_client import RealtimeTranscriptionClient  # noqa: E402
+from presentation.main_window import MainWindow  # noqa: E402
+from presentation.widgets.control_panel import ControlPanel  # noqa: E402
+from presentation.widgets.status_bar import VoiceScribeStatusBar  # noqa: E402
+from presentation.widgets.transcript_view import TranscriptView  # noqa: E402
+from utils.error_handler import setup_exception_handler  # noqa: E402
+from utils.latency_tracer import LatencyTracer  # noqa: E402
+from utils.loop_monitor import EventLoopLagMonitor  # noqa: E402
+from utils.metrics import MetricsServer  # noqa: E402
+from utils.log_rotation import (  # noqa: E402
+    LOG_FILE_NAME,
+    SizedTimedRotatingFileHandler,
+    start_log_cleanup,
+)
+
+# ファイル・コンソールへの書き込みを担うバックグラウンドリスナー
+_log_listener: Optional[QueueListener] = None
 
 
 def setup_logging(settings: AppSettings):
@@ -32,16 +51,15 @@ def setup_logging(settings: AppSettings):
     log_dir.mkdir(parents=True, exist_ok=True)
 
     # ログファイルパス
-    log_file = log_dir / "VoiceScribe.log"
+    log_file = log_dir / LOG_FILE_NAME
 
-    # TimedRotatingFileHandlerでログローテーション
-    file_handler = TimedRotatingFileHandler(
+    # 日付・サイズでローテーション (ローテーション済みファイルはgzip圧縮し、
+    # 保持期間を過ぎたものはローテーションのたびに削除)
+    file_handler = SizedTimedRotatingFileHandler(
         filename=str(log_file),
-        when='midnight',
-        backupCount=settings.logging.log_retention_days,
-        encoding='utf-8'
+        max_bytes=settings.logging.max_log_size_mb * 1024 * 1024,
+        retention_days=settings.logging.log_retention_days,
     )
-    file_handler.suffix = "%Y-%m-%d.log"
 
     # フォーマッター設定
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -52,19 +70,23 @@ def setup_logging(settings: AppSettings):
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.WARNING)  # WARNING以上のみコンソール出力
 
-    # ルートロガー設定
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-
     # デバッグモード時は全てのログをコンソール出力
     if settings.logging.debug_mode:
         console_handler.setLevel(logging.DEBUG)
-        root_logger.setLevel(logging.DEBUG)
+        log_level = logging.DEBUG
+
+    # ルートロガーはキューに積むだけにし、書き込みはリスナースレッドで行う
+    # (録音スレッド・受信ループ・UIスレッドがディスクI/Oで止まらないように)
+    global _log_listener
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _log_listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
 
-    # 古いログファイルをクリーンアップ
-    _cleanup_old_logs(log_dir, settings.logging.log_retention_days)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    root_logger.addHandler(QueueHandler(log_queue))
 
     logger = logging.getLogger(__name__)
     logger.info(f"ログシステムが初期化されました: {log_file}")
@@ -72,31 +94,12 @@ def setup_logging(settings: AppSettings):
     return logger
 
 
-def _cleanup_old_logs(log_dir: Path, retention_days: int):
-    """古いログファイルを削除"""
-    try:
-        now = datetime.now()
-        main_log_file = "VoiceScribe.log"
-        rotated_log_pattern = r"VoiceScribe\.log\.\d{4}-\d{2}-\d{2}\.log$"
-
-        import re
-        deleted_count = 0
-        for log_file in log_dir.glob("*.log"):
-            if log_file.name != main_log_file and re.match(rotated_log_pattern, log_file.name):
-                try:
-                    file_modified = datetime.fromtimestamp(log_file.stat().st_mtime)
-                    if now - file_modified >= timedelta(days=retention_days):
-                        log_file.unlink()
-                        logging.info(f"古いログファイルを削除しました: {log_file.name}")
-                        deleted_count += 1
-                except OSError as e:
-                    logging.error(f"ログファイルの削除中にエラーが発生しました {log_file.name}: {str(e)}")
-
-        if deleted_count > 0:
-            logging.info(f"合計 {deleted_count} 個の古いログファイルを削除しました")
-
-    except Exception as e:
-        logging.error(f"ログクリーンアップ処理中にエラーが発生しました: {str(e)}")
+def shutdown_logging():
+    """キューに残ったログを書き出してリスナーを停止"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
 
 
 def load_stylesheet() -> str:
@@ -108,8 +111,29 @@ def load_stylesheet() -> str:
     return ""
 
 
+def open_settings_dialog(settings: AppSettings, parent):
+    """設定ダイアログを表示 (初回表示時にモジュールを読み込む)"""
+    from presentation.dialogs.settings_dialog import SettingsDialog
+
+    SettingsDialog(settings, parent).exec()
+
+
+def select_audio_files(parent) -> list[str]:
+    """文字起こしする音声ファイルを選択"""
+    paths, _ = QFileDialog.getOpenFileNames(
+        parent,
+        "文字起こしする音声ファイルを選択",
+        "",
+        "音声ファイル (*.wav *.mp3 *.m4a *.flac *.ogg *.webm *.mp4);;すべてのファイル (*)",
+    )
+    return paths
+
+
 def main():
     """アプリケーションのメインエントリポイント"""
+    profiler = STARTUP_PROFILER
+    profiler.lap("モジュール読み込み")
+
     # QApplication 作成
     app = QApplication(sys.argv)
     app.setApplicationName("VoiceScribe v2.0")
@@ -117,6 +141,7 @@ def main():
     # qasyncイベントループ設定
     loop = qasync.QEventLoop(app)
     asyncio.set_event_loop(loop)
+    profiler.lap("QApplication 作成")
 
     try:
         # 1. 設定読み込み
@@ -131,27 +156,57 @@ def main():
         if stylesheet:
             app.setStyleSheet(stylesheet)
             logger.info("スタイルシート適用完了")
+        profiler.lap("設定・ログ初期化")
+
+        # 遅延トレース・イベントループ遅延モニター (無効時はNone)
+        tracer = LatencyTracer.from_settings(settings)
+        loop_monitor = EventLoopLagMonitor.from_settings(settings)
+
+        # メトリクス公開 (既定は無効・localhostで待ち受け)
+        metrics_server = MetricsServer.from_settings(settings)
+        if metrics_server is not None:
+            metrics_server.start()
 
         # 2. インフラ層初期化
         logger.info("インフラ層初期化開始")
-        audio_recorder = AudioRecorderWorker(settings=settings.audio)
+        audio_recorder = AudioRecorderWorker(settings=settings.audio, tracer=tracer)
         realtime_client = RealtimeTranscriptionClient(
             api_key=settings.elevenlabs_api_key,
             settings=settings.realtime_api,
+            tracer=tracer,
         )
         hotkey_manager = GlobalHotkeyManager(settings=settings.hotkeys)
+        profiler.lap("インフラ層初期化")
 
         # 3. アプリケーション層初期化
         logger.info("アプリケーション層初期化開始")
-        text_processor = TextPostProcessor(settings=settings)
-        clipboard_manager = ClipboardManager(settings=settings)
+        # 辞書のコンパイルは初回表示後に行う
+        text_processor = TextPostProcessor(settings=settings, defer_load=True)
+        clipboard_manager = ClipboardManager(settings=settings, tracer=tracer)
 
         orchestrator = TranscriptionOrchestrator(
             recorder=audio_recorder,
             client=realtime_client,
             text_processor=text_processor,
             settings=settings,
+            tracer=tracer,
         )
+        # ファイル文字起こし (録音と同じイベントループで並行実行)
+        batch_manager = BatchTranscriptionManager(settings=settings)
+
+        # 2パス文字起こし (有効時のみ・録音を保存してアイドル時に再文字起こし)
+        two_pass = None
+        if settings.two_pass.enabled:
+            # ジョブキュー・SQLite・elevenlabs SDK は有効時のみ読み込む
+            from application.two_pass import TwoPassCoordinator
+
+            two_pass = TwoPassCoordinator(
+                recorder=audio_recorder,
+                orchestrator=orchestrator,
+                text_processor=text_processor,
+                settings=settings,
+            )
+        profiler.lap("アプリケーション層初期化")
 
         # 4. プレゼンテーション層初期化
         logger.info("プレゼンテーション層初期化開始")
@@ -164,6 +219,7 @@ def main():
         main_window.set_transcript_view(transcript_view)
         main_window.set_control_panel(control_panel)
         main_window.set_status_bar_widget(status_bar)
+        profiler.lap("プレゼンテーション層初期化")
 
         # 5. Signal/Slot接続
         logger.info("Signal/Slot接続開始")
@@ -171,9 +227,13 @@ def main():
         # オーケストレーター → UI
         orchestrator.state_changed.connect(control_panel.update_recording_state)
         orchestrator.state_changed.connect(status_bar.update_recording_state)
-        orchestrator.partial_text_ready.connect(transcript_view.show_partial)
+        orchestrator.recording_duration_changed.connect(status_bar.update_duration)
+        orchestrator.partial_delta_ready.connect(transcript_view.apply_partial_delta)
         orchestrator.committed_text_ready.connect(transcript_view.show_committed)
         orchestrator.processed_text_ready.connect(clipboard_manager.copy_and_paste)
+        orchestrator.state_changed.connect(
+            clipboard_manager.on_recording_state_changed
+        )
         orchestrator.error_occurred.connect(
             lambda title, msg: QMessageBox.critical(main_window, title, msg)
         )
@@ -187,9 +247,42 @@ def main():
         control_panel.recording_toggled.connect(orchestrator.toggle_recording)
         control_panel.punctuation_toggled.connect(orchestrator.toggle_punctuation)
         control_panel.clear_clicked.connect(transcript_view.clear_all)
+        control_panel.clear_clicked.connect(orchestrator.reset_partial_diff)
         control_panel.settings_clicked.connect(
-            lambda: SettingsDialog(settings, main_window).exec()
+            lambda: open_settings_dialog(settings, main_window)
         )
+        control_panel.transcribe_files_clicked.connect(
+            lambda: batch_manager.enqueue(select_audio_files(main_window))
+        )
+
+        # ファイル文字起こし → ステータスバー
+        batch_manager.progress_changed.connect(
+            lambda done, total: status_bar.show_message_timed(
+                f"ファイル文字起こし: {done}/{total}"
+            )
+        )
+        batch_manager.job_failed.connect(
+            lambda path, msg: status_bar.show_message_timed(
+                f"文字起こし失敗: {Path(path).name} ({msg})"
+            )
+        )
+        batch_manager.all_finished.connect(
+            lambda succeeded, failed: status_bar.show_message_timed(
+                f"ファイル文字起こし完了: 成功 {succeeded}件, 失敗 {failed}件", 5000
+            )
+        )
+
+        # 性能モニター → ステータスバー (有効時のみ)
+        performance_sampler = None
+        if settings.ui.show_performance_hud:
+            performance_sampler = PerformanceSampler(
+                client=realtime_client,
+                interval_ms=settings.ui.performance_sample_interval_ms,
+                loop_monitor=loop_monitor,
+            )
+            performance_sampler.snapshot_ready.connect(status_bar.update_performance)
+            status_bar.set_performance_visible(True)
+            performance_sampler.start()
 
         # ホットキー → オーケストレーター
         hotkey_manager.toggle_recording_pressed.connect(orchestrator.toggle_recording)
@@ -200,6 +293,14 @@ def main():
         hotkey_manager.reload_replacements_pressed.connect(
             text_processor.reload_replacements
         )
+        hotkey_manager.reload_replacements_pressed.connect(
+            text_processor.reload_vocabulary
+        )
+        hotkey_manager.cycle_profile_pressed.connect(
+            lambda: status_bar.show_message_timed(
+                f"辞書: {text_processor.cycle_profile()}"
+            )
+        )
 
         # クリップボード → ステータスバー
         clipboard_manager.paste_completed.connect(
@@ -209,12 +310,14 @@ def main():
             lambda msg: status_bar.show_message_timed(f"貼り付け失敗: {msg}")
         )
 
-        # ホットキー登録
-        try:
-            hotkey_manager.register_hotkeys()
-            logger.info("ホットキー登録完了")
-        except Exception as e:
-            logger.warning(f"ホットキー登録失敗: {e}")
+        if two_pass is not None:
+            two_pass.session_refined.connect(
+                lambda session_id, text: status_bar.show_message_timed(
+                    f"高精度の文字起こしで履歴を更新: {session_id}"
+                )
+            )
+
+        profiler.lap("Signal/Slot接続")
 
         # メインウィンドウ表示
         if not settings.ui.start_minimized:
@@ -222,17 +325,78 @@ def main():
 
         logger.info("VoiceScribe v2.0 起動完了")
 
+        # 初回表示に不要な処理はイベントループ開始後に行う
+        def finish_startup():
+            profiler.lap("イベントループ開始")
+
+            # 置換ルール・語彙の読み込み
+            try:
+                text_processor.load()
+            except Exception as e:
+                logger.error(f"置換ルール読み込み失敗: {e}")
+                status_bar.show_message_timed(f"置換ルール読み込み失敗: {e}")
+
+            # ホットキー登録
+            try:
+                hotkey_manager.register_hotkeys()
+                logger.info("ホットキー登録完了")
+            except Exception as e:
+                logger.warning(f"ホットキー登録失敗: {e}")
+
+            # PortAudio の読み込み (初回の録音開始を待たせないように)
+            preload_portaudio()
+
+            if two_pass is not None:
+                two_pass.start()
+            profiler.lap("遅延初期化")
+            profiler.report()
+
+            # 古いログファイルの整理は起動を待たせないようバックグラウンドで行う
+            start_log_cleanup(
+                settings.paths.log_dir, settings.logging.log_retention_days
+            )
+
+        QTimer.singleShot(0, finish_startup)
+
         # アプリケーション終了時の処理
+        cleaned_up = False
+
         def cleanup():
+            nonlocal cleaned_up
+            if cleaned_up:
+                return
+            cleaned_up = True
             logger.info("アプリケーション終了処理開始")
             hotkey_manager.unregister_all()
+            batch_manager.cancel_all()
+            if two_pass is not None:
+                two_pass.shutdown()
+            if performance_sampler is not None:
+                performance_sampler.stop()
+            clipboard_manager.shutdown()
+            if tracer is not None:
+                tracer.close()
+            if metrics_server is not None:
+                metrics_server.stop()
+            if loop_monitor is not None:
+                loop_monitor.stop()
+                loop_monitor.export_json(
+                    settings.paths.log_dir / settings.diagnostics.loop_lag_export_file
+                )
 
         app.aboutToQuit.connect(cleanup)
 
+        if loop_monitor is not None:
+            loop_monitor.start(loop)
+
         # イベントループ開始 (qasyncで統合されたイベントループ)
         with loop:
             loop.run_forever()
 
+            # ファイル文字起こしの途中で終了した場合は接続を閉じてから終了する
+            if batch_manager.has_open_client:
+                loop.run_until_complete(batch_manager.aclose())
+
         return 0
 
     except Exception as e:
@@ -240,6 +404,10 @@ def main():
         QMessageBox.critical(None, "起動エラー", f"アプリケーションの起動に失敗しました:\n{e}")
         return 1
 
+    finally:
+        # 終了処理中のログも含めて書き出してから終了
+        shutdown_logging()
+
 
 if __name__ == "__main__":
     sys.exit(main())
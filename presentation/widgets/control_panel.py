@@ -22,6 +22,7 @@ class ControlPanel(QWidget):
     punctuation_toggled = pyqtSignal()
     settings_clicked = pyqtSignal()
     clear_clicked = pyqtSignal()
+    transcribe_files_clicked = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -55,6 +56,12 @@ class ControlPanel(QWidget):
         self._clear_button.clicked.connect(self._on_clear_clicked)
         layout.addWidget(self._clear_button)
 
+        # ファイル文字起こしボタン
+        self._transcribe_files_button = QPushButton("ファイル")
+        self._transcribe_files_button.setToolTip("音声ファイルを文字起こし")
+        self._transcribe_files_button.clicked.connect(self._on_transcribe_files_clicked)
+        layout.addWidget(self._transcribe_files_button)
+
         # 設定ボタン
         self._settings_button = QPushButton("設定")
         self._settings_button.clicked.connect(self._on_settings_clicked)
@@ -83,6 +90,11 @@ class ControlPanel(QWidget):
         self.clear_clicked.emit()
         logger.debug("クリアSignal発火")
 
+    def _on_transcribe_files_clicked(self):
+        """ファイル文字起こしボタンクリック"""
+        self.transcribe_files_clicked.emit()
+        logger.debug("ファイル文字起こしSignal発火")
+
     def update_recording_state(self, state: RecordingState):
         """録音状態に応じてUIを更新"""
         if state == RecordingState.IDLE:
@@ -4,7 +4,7 @@ import logging
 
 from PyQt6.QtWidgets import QLabel, QStatusBar
 
-from domain.models import ConnectionState, RecordingState
+from domain.models import ConnectionState, PerformanceSnapshot, RecordingState
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,11 @@ class VoiceScribeStatusBar(QStatusBar):
         self._duration_label = QLabel("録音時間: 0秒")
         self.addWidget(self._duration_label)
 
+        # 性能指標 (既定では非表示)
+        self._performance_label = QLabel()
+        self._performance_label.setVisible(False)
+        self.addPermanentWidget(self._performance_label)
+
         # ホットキーヒント
         self._hotkey_label = QLabel(
             "| Pause: 録音 | F9: 句読点 | Esc: 終了"
@@ -80,6 +85,35 @@ class VoiceScribeStatusBar(QStatusBar):
 
         self._duration_label.setText(text)
 
+    def set_performance_visible(self, visible: bool):
+        """性能指標の表示/非表示を切り替え"""
+        self._performance_label.setVisible(visible)
+
+    def update_performance(self, snapshot: PerformanceSnapshot):
+        """性能指標を更新"""
+        rtt = f"{snapshot.rtt_ms:.0f}ms" if snapshot.rtt_ms is not None else "-"
+        commit = (
+            f"{snapshot.commit_latency_ms:.0f}ms"
+            if snapshot.commit_latency_ms is not None
+            else "-"
+        )
+        text = (
+            f"送信待ち {snapshot.queue_depth}/{snapshot.queue_capacity} "
+            f"| 破棄 {snapshot.dropped_chunks} "
+            f"| RTT {rtt} "
+            f"| 部分 {snapshot.partial_rate:.1f}/秒 "
+            f"| 確定 {commit} "
+            f"| 遅延 {snapshot.loop_lag_ms:.0f}ms"
+        )
+        self._performance_label.setText(text)
+
+        # 送信が詰まっている・ループが遅れている場合は強調
+        congested = (
+            snapshot.queue_capacity > 0
+            and snapshot.queue_depth >= snapshot.queue_capacity // 2
+        ) or snapshot.loop_lag_ms >= 100
+        self._performance_label.setStyleSheet("color: orange;" if congested else "")
+
     def update_hotkey_hint(self, hints: str):
         """ホットキーヒントを更新"""
         self._hotkey_label.setText(f"| {hints}")
@@ -6,8 +6,17 @@ from PyQt6.QtCore import Qt, pyqtSlot
 from PyQt6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
 from PyQt6.QtWidgets import QTextEdit
 
+from domain.models import PartialTextDelta
+
 logger = logging.getLogger(__name__)
 
+PARTIAL_SUFFIX = "..."
+
+
+def _qt_length(text: str) -> int:
+    """Qtのカーソル位置単位 (UTF-16コードユニット) での長さ"""
+    return len(text.encode("utf-16-le")) // 2
+
 
 class TranscriptView(QTextEdit):
     """リアルタイム文字起こし表示ウィジェット"""
@@ -16,6 +25,7 @@ class TranscriptView(QTextEdit):
         super().__init__(parent)
         self._max_lines = max_lines
         self._partial_text_length = 0
+        self._partial_text = ""
 
         self._setup_widget()
         self._setup_formats()
@@ -61,13 +71,55 @@ class TranscriptView(QTextEdit):
         cursor.movePosition(QTextCursor.MoveOperation.End)
 
         # 部分結果を追加（末尾に "..." を付ける）
-        cursor.insertText(text + "...", self._partial_format)
-        self._partial_text_length = len(text) + 3
+        cursor.insertText(text + PARTIAL_SUFFIX, self._partial_format)
+        self._partial_text = text
+        self._partial_text_length = _qt_length(text + PARTIAL_SUFFIX)
 
         # スクロールを末尾に
         self.ensureCursorVisible()
 
-        logger.debug(f"部分結果表示: {text[:50]}...")
+        logger.debug("部分結果表示: %.50s...", text)
+
+    @pyqtSlot(PartialTextDelta)
+    def apply_partial_delta(self, delta: PartialTextDelta):
+        """部分結果の差分を適用（変更された末尾のみを書き換え）"""
+        keep_length = delta.keep_length
+        if keep_length > len(self._partial_text):
+            # 表示側と差分の基準がずれている場合は保持できる分だけ残す
+            logger.warning(
+                f"部分結果の差分が不整合: keep={keep_length}, "
+                f"表示中={len(self._partial_text)}文字"
+            )
+            keep_length = len(self._partial_text)
+
+        new_text = self._partial_text[:keep_length] + delta.tail
+        if not new_text:
+            self.clear_partial()
+            return
+
+        if self._partial_text_length == 0:
+            self.show_partial(new_text)
+            return
+
+        cursor = self.textCursor()
+        cursor.beginEditBlock()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        end = cursor.position()
+
+        # 保持部分の直後から "..." の手前までを置き換え
+        kept_length = _qt_length(self._partial_text[:keep_length])
+        cursor.setPosition(end - self._partial_text_length + kept_length)
+        cursor.setPosition(
+            end - _qt_length(PARTIAL_SUFFIX), QTextCursor.MoveMode.KeepAnchor
+        )
+        cursor.insertText(delta.tail, self._partial_format)
+        cursor.endEditBlock()
+
+        self._partial_text = new_text
+        self._partial_text_length = _qt_length(new_text + PARTIAL_SUFFIX)
+
+        # スクロールを末尾に
+        self.ensureCursorVisible()
 
     @pyqtSlot(str)
     def show_committed(self, text: str):
@@ -91,7 +143,7 @@ class TranscriptView(QTextEdit):
         # 最大行数制限
         self._limit_lines()
 
-        logger.debug(f"確定結果表示: {text[:50]}...")
+        logger.debug("確定結果表示: %.50s...", text)
 
     def clear_partial(self):
         """部分結果のみをクリア"""
@@ -100,18 +152,23 @@ class TranscriptView(QTextEdit):
 
         cursor = self.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
+        end = cursor.position()
 
-        # 部分結果の文字数分削除
-        for _ in range(self._partial_text_length):
-            cursor.deletePreviousChar()
+        # 部分結果の範囲を選択して一括削除 (位置はUTF-16単位)
+        cursor.setPosition(
+            end - self._partial_text_length, QTextCursor.MoveMode.KeepAnchor
+        )
+        cursor.removeSelectedText()
 
         self._partial_text_length = 0
+        self._partial_text = ""
         logger.debug("部分結果クリア")
 
     def clear_all(self):
         """全てクリア"""
         self.clear()
         self._partial_text_length = 0
+        self._partial_text = ""
         logger.debug("全テキストクリア")
 
     def _limit_lines(self):
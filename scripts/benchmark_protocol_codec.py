@@ -0,0 +1,126 @@
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils import protocol_codec  # noqa: E402
+from utils.protocol_codec import AudioChunkEncoder, MessageDispatcher  # noqa: E402
+
+# AudioRecorder の設定 (16kHz・16bit・モノラル)
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+
+
+def best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def legacy_encode(chunk: bytes) -> bytes:
+    """変更前の送信処理 (dict → json.dumps → UTF-8)"""
+    message = {
+        "message_type": "input_audio_chunk",
+        "audio_base_64": base64.b64encode(chunk).decode("utf-8"),
+    }
+    return json.dumps(message).encode("utf-8")
+
+
+def benchmark_encode(chunk_ms: int, audio_seconds: int, repeat: int):
+    chunk = os.urandom(BYTES_PER_SECOND * chunk_ms // 1000)
+    chunks = audio_seconds * 1000 // chunk_ms
+    encoder = AudioChunkEncoder(len(chunk))
+
+    assert json.loads(bytes(encoder.encode(chunk))) == json.loads(legacy_encode(chunk))
+
+    def run_legacy():
+        for _ in range(chunks):
+            legacy_encode(chunk)
+
+    def run_codec():
+        for _ in range(chunks):
+            encoder.encode(chunk)
+
+    legacy_us = best_of(repeat, run_legacy) / audio_seconds * 1e6
+    codec_us = best_of(repeat, run_codec) / audio_seconds * 1e6
+    print(f"[encode] チャンク {chunk_ms}ms ({len(chunk)} bytes), {chunks}チャンク")
+    print(f"[encode] {'json.dumps':<18}: {legacy_us:8.1f}µs/音声1秒")
+    print(f"[encode] {'AudioChunkEncoder':<18}: {codec_us:8.1f}µs/音声1秒 ({legacy_us / codec_us:.1f}倍)")
+
+
+def sample_messages(messages_per_second: int, audio_seconds: int):
+    """受信メッセージ (部分結果が続き、1秒ごとに確定結果)"""
+    text = "患者は頭痛を訴えており、解熱鎮痛剤を処方した。"
+    messages = []
+    for _ in range(audio_seconds):
+        for index in range(messages_per_second - 1):
+            partial = text[: (index + 1) * len(text) // messages_per_second]
+            messages.append(json.dumps({"message_type": "partial_transcript", "text": partial}))
+        messages.append(json.dumps({"message_type": "committed_transcript", "text": text}))
+    return messages
+
+
+def legacy_decode(message: str):
+    """変更前の受信処理 (json.loads → if/elif)"""
+    data = json.loads(message)
+    message_type = data.get("message_type")
+    if message_type == "partial_transcript":
+        return data.get("text", ""), False
+    elif message_type == "committed_transcript":
+        return data.get("text", ""), True
+    elif message_type == "committed_transcript_with_timestamps":
+        return data.get("text", ""), True
+    elif message_type == "error":
+        return None
+    return None
+
+
+def benchmark_decode(messages_per_second: int, audio_seconds: int, repeat: int):
+    messages = sample_messages(messages_per_second, audio_seconds)
+    dispatcher = MessageDispatcher({
+        protocol_codec.KIND_PARTIAL: lambda data: (data.get("text", ""), False),
+        protocol_codec.KIND_COMMITTED: lambda data: (data.get("text", ""), True),
+    })
+
+    def run_legacy():
+        for message in messages:
+            legacy_decode(message)
+
+    legacy_us = best_of(repeat, run_legacy) / audio_seconds * 1e6
+    print(f"[decode] {messages_per_second}メッセージ/秒, {len(messages)}メッセージ")
+    print(f"[decode] {'json + if/elif':<18}: {legacy_us:8.1f}µs/音声1秒")
+
+    for name, backend in protocol_codec.available_json_backends().items():
+        protocol_codec.set_json_backend(backend)
+
+        def run_codec():
+            for message in messages:
+                dispatcher.dispatch(message)
+
+        codec_us = best_of(repeat, run_codec) / audio_seconds * 1e6
+        print(f"[decode] {name + ' + dispatch':<18}: {codec_us:8.1f}µs/音声1秒")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="リアルタイムAPIのメッセージ変換のベンチマーク")
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--audio-seconds", type=int, default=600)
+    parser.add_argument("--messages-per-second", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"JSONバックエンド (既定): {protocol_codec.get_json_backend().name}")
+    benchmark_encode(args.chunk_ms, args.audio_seconds, args.repeat)
+    benchmark_decode(args.messages_per_second, args.audio_seconds, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from application.fuzzy_corrector import FuzzyVocabularyCorrector  # noqa: E402
+from application.numeral_normalizer import KanjiNumeralNormalizer  # noqa: E402
+
+KATAKANA = [chr(code) for code in range(ord("ァ"), ord("ヺ") + 1)]
+
+
+def random_term(rng: random.Random, min_len: int = 4, max_len: int = 10) -> str:
+    return "".join(rng.choice(KATAKANA) for _ in range(rng.randint(min_len, max_len)))
+
+
+def mutate(rng: random.Random, term: str) -> str:
+    i = rng.randrange(len(term))
+    return term[:i] + rng.choice(KATAKANA) + term[i + 1:]
+
+
+def benchmark_fuzzy(vocabulary_size: int, segments: int, seed: int):
+    rng = random.Random(seed)
+    vocabulary = [random_term(rng) for _ in range(vocabulary_size)]
+
+    corrector = FuzzyVocabularyCorrector(max_edit_distance=1, min_confidence=0.7)
+    start = time.perf_counter()
+    corrector.add_terms(vocabulary)
+    build_sec = time.perf_counter() - start
+
+    texts = []
+    for _ in range(segments):
+        words = [mutate(rng, rng.choice(vocabulary)) for _ in range(3)]
+        texts.append(f"患者は{words[0]}を服用し、{words[1]}と{words[2]}を確認した。")
+
+    start = time.perf_counter()
+    for text in texts:
+        corrector.correct(text)
+    per_segment_ms = (time.perf_counter() - start) / segments * 1000
+
+    print(f"[fuzzy] 語彙数: {corrector.vocabulary_size}")
+    print(f"[fuzzy] インデックス構築: {build_sec:.2f}秒")
+    print(f"[fuzzy] 1セグメントあたり: {per_segment_ms:.3f}ms ({segments}セグメント)")
+
+
+def benchmark_numerals(max_length: int, repeat: int):
+    normalizer = KanjiNumeralNormalizer()
+    unit = "体温は三十七点二度、一日三回五錠を二〇二四年から服用し、費用は一万二千円。"
+
+    length = 1000
+    while length <= max_length:
+        text = (unit * (length // len(unit) + 1))[:length]
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            normalizer.normalize(text)
+            best = min(best, time.perf_counter() - start)
+        ns_per_char = best / length * 1e9
+        print(f"[numeral] {length:>9}文字: {best * 1000:9.2f}ms ({ns_per_char:.0f}ns/文字)")
+        length *= 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description="テキスト後処理パイプラインのベンチマーク")
+    parser.add_argument("--vocabulary-size", type=int, default=100_000)
+    parser.add_argument("--segments", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--numeral-max-length", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    benchmark_fuzzy(args.vocabulary_size, args.segments, args.seed)
+    benchmark_numerals(args.numeral_max_length, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""貼り付けキューのテスト (記録用フェイクバックエンドで入力を検証)"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from application.clipboard_manager import ClipboardManager, _PasteWorker  # noqa: E402
+from infrastructure.text_injector import RecordingInjectionBackend  # noqa: E402
+
+
+class FailingBackend(RecordingInjectionBackend):
+    """指定したテキストの検証・入力に失敗するフェイク"""
+
+    def __init__(self, bad_verify=(), bad_inject=()):
+        super().__init__()
+        self._bad_verify = set(bad_verify)
+        self._bad_inject = set(bad_inject)
+
+    def verify(self, text: str) -> bool:
+        return text not in self._bad_verify
+
+    def inject(self, text: str) -> bool:
+        if text in self._bad_inject:
+            raise RuntimeError("入力先が見つかりません")
+        return super().inject(text)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def make_settings(paste_delay_ms=0, paste_coalesce_ms=0):
+    return SimpleNamespace(
+        recording=SimpleNamespace(
+            paste_delay_ms=paste_delay_ms,
+            paste_coalesce_ms=paste_coalesce_ms,
+            injection_backend="recording",
+        )
+    )
+
+
+def wait_until(app, predicate, timeout=5.0):
+    """キュー接続のSignalを処理しながら条件が満たされるまで待機"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 10)
+        time.sleep(0.001)
+    return True
+
+
+@pytest.fixture
+def make_manager(app):
+    managers = []
+
+    def factory(backend, **settings):
+        manager = ClipboardManager(settings=make_settings(**settings), backend=backend)
+        events = SimpleNamespace(completed=0, failed=[], copied=0, copy_failed=[], timings=[])
+        manager.paste_completed.connect(lambda: setattr(events, "completed", events.completed + 1))
+        manager.paste_failed.connect(events.failed.append)
+        manager.copy_completed.connect(lambda: setattr(events, "copied", events.copied + 1))
+        manager.copy_failed.connect(events.copy_failed.append)
+        manager.paste_timings_ready.connect(events.timings.append)
+        managers.append(manager)
+        return manager, events
+
+    yield factory
+    for manager in managers:
+        manager.shutdown()
+
+
+def test_recording_backend_skips_paste_delay():
+    backend = RecordingInjectionBackend()
+    assert backend.uses_clipboard is False
+    assert RecordingInjectionBackend(uses_clipboard=True).uses_clipboard is True
+
+
+def test_pastes_in_submission_order(app, make_manager):
+    backend = RecordingInjectionBackend()
+    manager, events = make_manager(backend, paste_delay_ms=200)
+
+    for text in ["一つ目。", "二つ目。", "三つ目。"]:
+        manager.copy_and_paste(text)
+
+    assert wait_until(app, lambda: events.completed == 3)
+    assert [record.text for record in backend.records] == ["一つ目。", "二つ目。", "三つ目。"]
+    assert len(events.timings) == 3
+    # クリップボードを使わないバックエンドでは貼り付け前に待機しない
+    assert all(timings.delay_ms < 200 for timings in events.timings)
+
+
+def test_coalesces_segments_into_one_paste(app, make_manager):
+    backend = RecordingInjectionBackend()
+    manager, events = make_manager(backend, paste_coalesce_ms=50)
+
+    manager.copy_and_paste("血圧は")
+    manager.copy_and_paste("120です。")
+
+    assert wait_until(app, lambda: events.completed == 1)
+    assert [record.text for record in backend.records] == ["血圧は120です。"]
+
+
+def test_unicode_text_is_injected_unchanged(app, make_manager):
+    backend = RecordingInjectionBackend()
+    manager, events = make_manager(backend)
+    text = "𠮷野家で😀を入力、ｶﾀｶﾅと　全角空白"
+
+    manager.copy_and_paste(text)
+
+    assert wait_until(app, lambda: events.completed == 1)
+    assert backend.records[0].text == text
+    assert events.timings[0].text_length == len(text)
+
+
+def test_copy_failure_reports_and_continues(app, make_manager):
+    backend = FailingBackend(bad_verify={"検証NG"})
+    manager, events = make_manager(backend)
+
+    manager.copy_and_paste("検証NG")
+    manager.copy_and_paste("次のテキスト")
+
+    assert wait_until(app, lambda: events.completed == 1 and events.failed)
+    assert events.failed == ["クリップボードへのコピーに失敗しました"]
+    assert [record.text for record in backend.records] == ["次のテキスト"]
+
+
+def test_inject_error_reports_failure(app, make_manager):
+    backend = FailingBackend(bad_inject={"入力NG"})
+    manager, events = make_manager(backend)
+
+    manager.copy_and_paste("入力NG")
+
+    assert wait_until(app, lambda: bool(events.failed))
+    assert events.failed == ["貼り付けに失敗しました"]
+    assert backend.records == []
+
+
+def test_copy_only_does_not_inject(app, make_manager):
+    backend = FailingBackend(bad_verify={"コピーNG"})
+    manager, events = make_manager(backend)
+
+    manager.copy_only("コピーのみ")
+    manager.copy_only("コピーNG")
+
+    assert wait_until(app, lambda: events.copied == 1 and events.copy_failed)
+    assert events.copy_failed == ["クリップボードへのコピーに失敗しました"]
+    assert backend.records == []
+    assert events.completed == 0
+
+
+def test_worker_reports_copy_and_inject_results():
+    backend = FailingBackend(bad_verify={"NG"})
+    worker = _PasteWorker(backend)
+    copies, injects = [], []
+    worker.copy_finished.connect(lambda *args: copies.append(args))
+    worker.inject_finished.connect(lambda *args: injects.append(args))
+
+    worker.copy(1, "NG")
+    worker.copy(2, "改行\nを含む")
+    worker.inject(2, "改行\nを含む")
+
+    assert [(job_id, success) for job_id, success, _, _ in copies] == [(1, False), (2, True)]
+    assert [(job_id, success) for job_id, success, _ in injects] == [(2, True)]
+    assert backend.records[0].text == "改行\nを含む"
+    assert backend.records[0].prepared_ns <= backend.records[0].injected_ns
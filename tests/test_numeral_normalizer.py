@@ -0,0 +1,61 @@
+"""漢数字正規化のテスト"""
+
+import pytest
+
+from application.numeral_normalizer import KanjiNumeralNormalizer, parse_numeral
+
+
+@pytest.fixture
+def normalizer():
+    return KanjiNumeralNormalizer()
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("三百二十五人", "325人"),
+        ("二〇二四年", "2024年"),
+        ("1万2千円", "12000円"),
+        ("一万円", "10000円"),
+        ("十万円", "100000円"),
+        ("三億五千万円", "350000000円"),
+        ("八百万円", "8000000円"),
+        ("第三回", "第3回"),
+        ("一日三回", "1日3回"),
+        ("三十七点二度", "37.2度"),
+    ],
+)
+def test_converts_numerals(normalizer, text, expected):
+    assert normalizer.normalize(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "万年筆",
+        "億万長者",
+        "八百屋",
+        "九十九里",
+        "三日月",
+        "四百四病",
+        "五分五分",
+        "一時中断",
+        "万が一",
+        "統一",
+    ],
+)
+def test_keeps_idioms_and_place_names(normalizer, text):
+    assert normalizer.normalize(text) == text
+
+
+@pytest.mark.parametrize("run", ["万", "億万", "十百", "百百", "万億", "千万千万"])
+def test_parse_numeral_rejects_malformed_runs(run):
+    assert parse_numeral(run) is None
+
+
+@pytest.mark.parametrize(
+    "run, expected",
+    [("十", 10), ("千", 1000), ("一万", 10000), ("一億二千万", 120000000), ("二〇二四", 2024)],
+)
+def test_parse_numeral(run, expected):
+    assert parse_numeral(run) == expected
@@ -1,21 +1,54 @@
 import os
+import threading
 from pathlib import Path
+from typing import Optional
 
+# (.envの更新時刻, 解析結果) - 更新時刻が変わるまで再解析しない
+_env_cache: Optional[tuple[Optional[float], dict]] = None
+_env_cache_lock = threading.Lock()
 
-def load_env_variables() -> dict:
+
+def _get_env_path() -> str:
     base_dir = Path(__file__).parent.parent
-    env_path = os.path.join(base_dir, '.env')
+    return os.path.join(base_dir, '.env')
+
 
+def _parse_env_file(env_path: str) -> dict:
     env_vars = {}
+    with open(env_path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                env_vars[key.strip()] = value.strip().strip('"\'')
+    return env_vars
 
-    if os.path.exists(env_path):
-        with open(env_path, encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip().strip('"\'')
-    else:
-        print("警告: .envファイルが見つかりません。")
 
-    return env_vars
+def load_env_variables() -> dict:
+    """.envを読み込み (更新時刻が変わらない限り前回の解析結果を返す)"""
+    global _env_cache
+    env_path = _get_env_path()
+
+    try:
+        mtime: Optional[float] = os.stat(env_path).st_mtime
+    except OSError:
+        mtime = None
+
+    with _env_cache_lock:
+        if _env_cache is None or _env_cache[0] != mtime:
+            if mtime is None:
+                print("警告: .envファイルが見つかりません。")
+                env_vars = {}
+            else:
+                env_vars = _parse_env_file(env_path)
+            _env_cache = (mtime, env_vars)
+
+        # 呼び出し側での変更がキャッシュに影響しないようにコピーを返す
+        return dict(_env_cache[1])
+
+
+def clear_env_cache():
+    """キャッシュを破棄し、次回の呼び出しで再読み込み"""
+    global _env_cache
+    with _env_cache_lock:
+        _env_cache = None
@@ -0,0 +1,57 @@
+"""遅延ヒストグラム - 直近のサンプルからパーセンタイルを算出"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class LatencyHistogram:
+    """直近 window 件のサンプルを保持するヒストグラム"""
+
+    def __init__(self, window: int = 1000):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._total_count = 0
+        self._lock = threading.Lock()
+
+    def record(self, value: float):
+        """サンプルを追加"""
+        with self._lock:
+            self._samples.append(value)
+            self._total_count += 1
+
+    def percentile(self, p: float) -> float:
+        """パーセンタイル値 (サンプルがない場合は0)"""
+        with self._lock:
+            samples = sorted(self._samples)
+        return self._percentile_of(samples, p)
+
+    def snapshot(self) -> Dict[str, float]:
+        """p50/p95/p99/最大値/件数"""
+        with self._lock:
+            samples = sorted(self._samples)
+            total_count = self._total_count
+
+        return {
+            "p50": self._percentile_of(samples, 50),
+            "p95": self._percentile_of(samples, 95),
+            "p99": self._percentile_of(samples, 99),
+            "max": samples[-1] if samples else 0.0,
+            "count": float(total_count),
+        }
+
+    def reset(self):
+        """サンプルを破棄"""
+        with self._lock:
+            self._samples.clear()
+            self._total_count = 0
+
+    @staticmethod
+    def _percentile_of(sorted_samples: list, p: float) -> float:
+        """ソート済みサンプルのパーセンタイル (最近傍法)"""
+        if not sorted_samples:
+            return 0.0
+        index = min(len(sorted_samples) - 1, int(len(sorted_samples) * p / 100))
+        return sorted_samples[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
@@ -0,0 +1,272 @@
+"""発話単位の遅延トレース - 録音から貼り付けまで"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+from utils.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# パイプラインの計測点 (発生順)
+STAGES = (
+    "capture",  # 発話の最初のチャンクの推定録音時刻 (読み取り完了 - 入力レイテンシ - チャンク長)
+    "enqueue",  # 送信キューへの投入
+    "send",  # WebSocketへの送信
+    "first_partial",  # 最初の部分結果の受信
+    "commit",  # 確定結果の受信
+    "processed",  # 後処理の完了
+    "pasted",  # 貼り付けの完了
+)
+
+# ヒストグラムを集計する区間
+SPANS: Tuple[Tuple[str, str], ...] = (
+    ("capture", "enqueue"),
+    ("enqueue", "send"),
+    ("send", "first_partial"),
+    ("first_partial", "commit"),
+    ("commit", "processed"),
+    ("processed", "pasted"),
+    ("commit", "pasted"),
+    ("capture", "pasted"),
+)
+
+MAX_PENDING_TRACES = 100
+
+
+def span_name(start: str, end: str) -> str:
+    """区間名 (例: commit_to_pasted)"""
+    return f"{start}_to_{end}"
+
+
+class _UtteranceTrace:
+    """1発話分の計測値 (time.monotonic_ns)"""
+
+    __slots__ = ("utterance_id", "marks", "paste_job_id")
+
+    def __init__(self, utterance_id: int):
+        self.utterance_id = utterance_id
+        self.marks: Dict[str, int] = {}
+        self.paste_job_id: Optional[int] = None
+
+
+class LatencyTracer:
+    """録音から貼り付けまでの各段階の時刻を発話単位で記録
+
+    発話は「前回の確定結果以降に録音された最初のチャンク」から始まり、
+    確定結果の受信で区切られる。完了した発話はJSONLファイルに書き出し、
+    区間ごとの遅延をヒストグラムに集計する。各メソッドはスレッドセーフ。
+    ファイルへの書き込みは専用のリスナースレッドで行い、
+    貼り付け完了を通知するメインスレッドをディスクI/Oで止めない。
+    """
+
+    def __init__(
+        self,
+        trace_file: Optional[Path] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+        histogram_window: int = 1000,
+    ):
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._current: Optional[_UtteranceTrace] = None
+        self._committed: Deque[_UtteranceTrace] = deque()
+        self._histograms: Dict[str, LatencyHistogram] = {
+            span_name(start, end): LatencyHistogram(histogram_window)
+            for start, end in SPANS
+        }
+
+        self._trace_logger: Optional[logging.Logger] = None
+        self._trace_handler: Optional[logging.Handler] = None
+        self._queue_handler: Optional[logging.Handler] = None
+        self._trace_listener: Optional[QueueListener] = None
+        if trace_file is not None:
+            self._setup_trace_file(trace_file, max_bytes, backup_count)
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["LatencyTracer"]:
+        """設定から生成 (無効の場合はNone)"""
+        if not settings.tracing.enabled:
+            return None
+
+        trace_file = settings.paths.log_dir / settings.tracing.trace_file
+        return cls(
+            trace_file=trace_file,
+            max_bytes=settings.tracing.max_file_size_mb * 1024 * 1024,
+            backup_count=settings.tracing.backup_count,
+            histogram_window=settings.tracing.histogram_window,
+        )
+
+    def _setup_trace_file(self, trace_file: Path, max_bytes: int, backup_count: int):
+        """ローテーション付きJSONL出力を設定 (書き込みはリスナースレッドで行う)"""
+        trace_file.parent.mkdir(parents=True, exist_ok=True)
+
+        handler = RotatingFileHandler(
+            filename=str(trace_file),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        trace_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(trace_queue, handler)
+        listener.start()
+        queue_handler = QueueHandler(trace_queue)
+
+        trace_logger = logging.getLogger(f"{__name__}.jsonl")
+        trace_logger.setLevel(logging.INFO)
+        trace_logger.propagate = False
+        trace_logger.addHandler(queue_handler)
+
+        self._trace_logger = trace_logger
+        self._trace_handler = handler
+        self._queue_handler = queue_handler
+        self._trace_listener = listener
+        logger.info(f"遅延トレース出力: {trace_file}")
+
+    def mark_capture(self, capture_ns: int):
+        """録音チャンクの取得 (発話の最初のチャンクのみ記録)"""
+        current = self._current
+        if current is not None and "capture" in current.marks:
+            return
+
+        with self._lock:
+            current = self._ensure_current()
+            current.marks.setdefault("capture", capture_ns)
+
+    def mark_enqueue(self):
+        """送信キューへの投入"""
+        self._mark_current("enqueue")
+
+    def mark_send(self):
+        """WebSocketへの送信"""
+        self._mark_current("send")
+
+    def mark_first_partial(self):
+        """部分結果の受信 (発話の最初のみ記録)"""
+        self._mark_current("first_partial")
+
+    def mark_commit(self, received_ns: Optional[int] = None):
+        """確定結果の受信 (発話の区切り)"""
+        received_ns = received_ns or time.monotonic_ns()
+        with self._lock:
+            trace = self._ensure_current()
+            trace.marks["commit"] = received_ns
+            self._committed.append(trace)
+            self._current = None
+
+            while len(self._committed) > MAX_PENDING_TRACES:
+                self._committed.popleft()
+
+    def mark_processed(self):
+        """後処理の完了 (後処理待ちの最も古い発話)"""
+        now = time.monotonic_ns()
+        with self._lock:
+            for trace in self._committed:
+                if "processed" not in trace.marks:
+                    trace.marks["processed"] = now
+                    break
+
+    def discard_unprocessed(self):
+        """後処理に失敗した発話 (後処理待ちの最も古い発話) を破棄"""
+        with self._lock:
+            for trace in self._committed:
+                if "processed" not in trace.marks:
+                    self._committed.remove(trace)
+                    break
+
+    def assign_paste_job(self, job_id: int):
+        """後処理済みで貼り付け待ちの発話を貼り付けジョブに割り当て
+
+        まとめ貼り付けでは1回の貼り付けが複数の発話を含む。
+        """
+        with self._lock:
+            for trace in self._committed:
+                if "processed" in trace.marks and trace.paste_job_id is None:
+                    trace.paste_job_id = job_id
+
+    def mark_pasted(self, job_id: int, success: bool = True):
+        """貼り付けの完了 (ジョブに割り当てた発話のみ完了扱い)"""
+        now = time.monotonic_ns()
+        finished: List[_UtteranceTrace] = []
+        with self._lock:
+            remaining: Deque[_UtteranceTrace] = deque()
+            for trace in self._committed:
+                if trace.paste_job_id != job_id:
+                    remaining.append(trace)
+                    continue
+                if success:
+                    trace.marks["pasted"] = now
+                finished.append(trace)
+            self._committed = remaining
+
+        for trace in finished:
+            self._finish(trace, success)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """区間ごとの遅延 (ミリ秒) のパーセンタイル"""
+        return {
+            name: histogram.snapshot() for name, histogram in self._histograms.items()
+        }
+
+    def histogram(self, start: str, end: str) -> LatencyHistogram:
+        """区間のヒストグラム"""
+        return self._histograms[span_name(start, end)]
+
+    def close(self):
+        """キューに残ったトレースを書き出してファイルを閉じる"""
+        if self._trace_logger is not None and self._queue_handler is not None:
+            self._trace_logger.removeHandler(self._queue_handler)
+            self._trace_logger = None
+            self._queue_handler = None
+        if self._trace_listener is not None:
+            self._trace_listener.stop()
+            self._trace_listener = None
+        if self._trace_handler is not None:
+            self._trace_handler.close()
+            self._trace_handler = None
+
+    def _ensure_current(self) -> _UtteranceTrace:
+        """進行中の発話を取得 (なければ開始) ※ロック取得済みで呼ぶ"""
+        if self._current is None:
+            self._current = _UtteranceTrace(self._next_id)
+            self._next_id += 1
+        return self._current
+
+    def _mark_current(self, stage: str):
+        """進行中の発話に計測点を記録 (最初の1回のみ)"""
+        current = self._current
+        if current is not None and stage in current.marks:
+            return
+
+        now = time.monotonic_ns()
+        with self._lock:
+            self._ensure_current().marks.setdefault(stage, now)
+
+    def _finish(self, trace: _UtteranceTrace, success: bool):
+        """発話の計測を確定してヒストグラムとファイルに出力"""
+        marks = trace.marks
+        spans_ms: Dict[str, float] = {}
+        for start, end in SPANS:
+            if start in marks and end in marks:
+                value_ms = (marks[end] - marks[start]) / 1e6
+                spans_ms[span_name(start, end)] = round(value_ms, 3)
+                self._histograms[span_name(start, end)].record(value_ms)
+
+        if self._trace_logger is None:
+            return
+
+        record = {
+            "utterance_id": trace.utterance_id,
+            "pasted": success,
+            "marks_ns": {stage: marks[stage] for stage in STAGES if stage in marks},
+            "spans_ms": spans_ms,
+        }
+        self._trace_logger.info(json.dumps(record, ensure_ascii=False))
@@ -1,155 +1,181 @@
+"""ログファイルのローテーション・圧縮・削除"""
+
+import gzip
 import logging
 import os
 import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from logging.handlers import TimedRotatingFileHandler
+from pathlib import Path
+from typing import Optional
 
-from utils.config_manager import load_config, get_config_value
-
-
-def setup_logging(config=None):
-    if config is None:
-        config = load_config()
-
-    try:
-        log_directory = get_config_value(config, 'LOGGING', 'log_directory', 'logs')
-        log_retention_days = get_config_value(config, 'LOGGING', 'log_retention_days', 7)
-        project_name = get_config_value(config, 'LOGGING', 'project_name', 'VoiceScribe')
-        log_level = get_config_value(config, 'LOGGING', 'log_level', 'INFO')
-
-        if not os.path.isabs(log_directory):
-            project_root = os.path.dirname(os.path.dirname(__file__))
-            log_directory = os.path.join(project_root, log_directory)
-
-        if not os.path.exists(log_directory):
-            os.makedirs(log_directory)
+logger = logging.getLogger(__name__)
 
-        log_file = os.path.join(log_directory, f'{project_name}.log')
+LOG_FILE_NAME = "VoiceScribe.log"
 
-        file_handler = TimedRotatingFileHandler(
-            filename=log_file,
-            when='midnight',
-            backupCount=log_retention_days,
-            encoding='utf-8'
-        )
-        file_handler.suffix = "%Y-%m-%d.log"
+# ローテーション済みファイル: VoiceScribe.log.2024-01-31.log / .2024-01-31.1.log (.gz)
+ROTATED_LOG_PATTERN = re.compile(
+    rf"{re.escape(LOG_FILE_NAME)}\.\d{{4}}-\d{{2}}-\d{{2}}(\.\d+)?\.log(\.gz)?$"
+)
 
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
 
-        root_logger = logging.getLogger()
+def compress_log_file(path: Path) -> Optional[Path]:
+    """ログファイルをgzip圧縮して元のファイルを削除"""
+    compressed = path.with_name(path.name + ".gz")
+    try:
+        with open(path, "rb") as source, gzip.open(compressed, "wb") as target:
+            shutil.copyfileobj(source, target)
+        path.unlink()
+        return compressed
 
+    except OSError as e:
+        logger.error(f"ログファイルの圧縮に失敗しました {path.name}: {e}")
         try:
-            level = getattr(logging, log_level.upper())
-            root_logger.setLevel(level)
-        except AttributeError:
-            root_logger.setLevel(logging.INFO)
-            logging.warning(f"無効なログレベル '{log_level}' が指定されました。INFOを使用します。")
-
-        root_logger.addHandler(file_handler)
-
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        console_handler.setLevel(logging.WARNING)  # WARNING以上のみコンソール出力
-        root_logger.addHandler(console_handler)
-
-        cleanup_old_logs(log_directory, log_retention_days, project_name)
-
-        logging.info(f"ログシステムが初期化されました: {log_file}")
+            compressed.unlink()
+        except OSError:
+            pass
+        return None
 
-    except PermissionError as e:
-        raise PermissionError(f"ログディレクトリの作成権限がありません: {e}")
-    except Exception as e:
-        raise Exception(f"ログ設定の初期化中にエラーが発生しました: {e}")
 
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """日付とサイズの両方でローテーションし、ローテーション済みファイルを圧縮
+
+    日付が変わった時に加え、ファイルが max_bytes を超えた時点でも
+    ローテーションする。同じ日に複数回ローテーションした場合は連番を付ける。
+    圧縮と保持期間 (retention_days) を過ぎたファイルの削除は専用スレッドで
+    ローテーションのたびに行うため、ログの書き込みを待たせない。
+    retention_days が0の場合は削除しない。
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 0,
+        compress: bool = True,
+        retention_days: int = 0,
+        encoding: str = "utf-8",
+    ):
+        super().__init__(
+            filename=filename, when="midnight", backupCount=0, encoding=encoding
+        )
+        self.suffix = "%Y-%m-%d"
+        self._max_bytes = max_bytes
+        self._compress = compress
+        self._retention_days = retention_days
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="LogRotation")
+            if compress or retention_days > 0
+            else None
+        )
 
-def cleanup_old_logs(log_directory: str, retention_days: int, project_name: str):
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if int(time.time()) >= self.rolloverAt:
+            return True
+
+        if self._max_bytes > 0 and self.stream is not None:
+            # 1レコード分の超過は許容し、判定のためにフォーマットし直さない
+            if self.stream.tell() >= self._max_bytes:
+                return True
+
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        current_time = int(time.time())
+        period_start = time.localtime(self.rolloverAt - self.interval)
+        rotated = self._next_rotated_name(time.strftime(self.suffix, period_start))
+
+        if os.path.exists(self.baseFilename):
+            os.rename(self.baseFilename, rotated)
+            if self._compress:
+                self._executor.submit(compress_log_file, Path(rotated))
+
+        # 圧縮の後に同じスレッドで保持期間を過ぎたファイルを削除
+        if self._retention_days > 0:
+            self._executor.submit(
+                prune_old_logs, Path(self.baseFilename).parent, self._retention_days
+            )
+
+        if not self.delay:
+            self.stream = self._open()
+
+        # 日付によるローテーションの場合のみ次回時刻を更新
+        if current_time >= self.rolloverAt:
+            new_rollover_at = self.computeRollover(current_time)
+            while new_rollover_at <= current_time:
+                new_rollover_at += self.interval
+            self.rolloverAt = new_rollover_at
+
+    def _next_rotated_name(self, date_text: str) -> str:
+        """既存のファイルと重ならないローテーション後のファイル名"""
+        candidate = f"{self.baseFilename}.{date_text}.log"
+        index = 1
+        while os.path.exists(candidate) or os.path.exists(f"{candidate}.gz"):
+            candidate = f"{self.baseFilename}.{date_text}.{index}.log"
+            index += 1
+        return candidate
+
+    def close(self):
+        super().close()
+        if self._executor is not None:
+            # 圧縮中のファイルを書き終えてから終了
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def prune_old_logs(log_dir: Path, retention_days: int):
+    """保持期間を過ぎたログを削除し、未圧縮のローテーション済みログを圧縮"""
     try:
         now = datetime.now()
-        main_log_file = f'{project_name}.log'
-
-        rotated_log_pattern = rf'{re.escape(project_name)}\.log\.\d{{4}}-\d{{2}}-\d{{2}}\.log$'
-
         deleted_count = 0
-        for filename in os.listdir(log_directory):
-            if filename.endswith('.log') and filename != main_log_file:
-                if re.match(rotated_log_pattern, filename):
-                    file_path = os.path.join(log_directory, filename)
-                    try:
-                        file_modification_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                        if now - file_modification_time >= timedelta(days=retention_days):
-                            os.remove(file_path)
-                            logging.info(f"古いログファイルを削除しました: {filename}")
-                            deleted_count += 1
-                    except OSError as e:
-                        logging.error(f"ログファイルの削除中にエラーが発生しました {filename}: {str(e)}")
+        compressed_count = 0
+
+        for log_file in log_dir.iterdir():
+            if not ROTATED_LOG_PATTERN.match(log_file.name):
+                continue
+
+            try:
+                file_modified = datetime.fromtimestamp(log_file.stat().st_mtime)
+                if now - file_modified >= timedelta(days=retention_days):
+                    log_file.unlink()
+                    logger.info(f"古いログファイルを削除しました: {log_file.name}")
+                    deleted_count += 1
+                elif log_file.suffix != ".gz" and now - file_modified >= timedelta(
+                    minutes=1
+                ):
+                    # 前回の終了時に圧縮されなかったファイル
+                    # (直前のローテーションで圧縮待ちのものは除く)
+                    if compress_log_file(log_file) is not None:
+                        compressed_count += 1
+
+            except OSError as e:
+                logger.error(
+                    f"ログファイルの削除中にエラーが発生しました {log_file.name}: {e}"
+                )
 
         if deleted_count > 0:
-            logging.info(f"合計 {deleted_count} 個の古いログファイルを削除しました")
-
-    except Exception as e:
-        logging.error(f"ログクリーンアップ処理中にエラーが発生しました: {str(e)}")
-
-
-def setup_debug_logging(config=None):
-    if config is None:
-        config = load_config()
-
-    try:
-        debug_mode = get_config_value(config, 'LOGGING', 'debug_mode', False)
-
-        if not debug_mode:
-            return None
-
-        log_directory = get_config_value(config, 'LOGGING', 'log_directory', 'logs')
-
-        if not os.path.isabs(log_directory):
-            project_root = os.path.dirname(os.path.dirname(__file__))
-            log_directory = os.path.join(project_root, log_directory)
-
-        debug_logger = logging.getLogger('debug')
-        debug_logger.setLevel(logging.DEBUG)
-
-        debug_log_path = os.path.join(log_directory, 'debug.log')
-        debug_handler = logging.FileHandler(debug_log_path, encoding='utf-8')
-        debug_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-        )
-        debug_handler.setFormatter(debug_formatter)
-        debug_logger.addHandler(debug_handler)
-        debug_logger.propagate = False
-
-        logging.info(f"デバッグログが有効化されました: {debug_log_path}")
-        return debug_logger
-
-    except Exception as e:
-        logging.error(f"デバッグログ設定中にエラーが発生しました: {str(e)}")
-        return None
-
-
-def get_log_info(config=None):
-    if config is None:
-        config = load_config()
-
-    try:
-        log_directory = get_config_value(config, 'LOGGING', 'log_directory', 'logs')
-        if not os.path.isabs(log_directory):
-            project_root = os.path.dirname(os.path.dirname(__file__))
-            log_directory = os.path.join(project_root, log_directory)
-
-        project_name = get_config_value(config, 'LOGGING', 'project_name', 'VoiceScribe')
-        log_retention_days = get_config_value(config, 'LOGGING', 'log_retention_days', 7)
-        debug_mode = get_config_value(config, 'LOGGING', 'debug_mode', False)
-
-        return {
-            'log_directory': log_directory,
-            'project_name': project_name,
-            'log_retention_days': log_retention_days,
-            'debug_mode': debug_mode,
-            'main_log_file': os.path.join(log_directory, f'{project_name}.log'),
-            'debug_log_file': os.path.join(log_directory, 'debug.log') if debug_mode else None
-        }
+            logger.info(f"合計 {deleted_count} 個の古いログファイルを削除しました")
+        if compressed_count > 0:
+            logger.info(f"合計 {compressed_count} 個のログファイルを圧縮しました")
 
     except Exception as e:
-        logging.error(f"ログ情報取得中にエラーが発生しました: {str(e)}")
-        return None
+        logger.error(f"ログクリーンアップ処理中にエラーが発生しました: {e}")
+
+
+def start_log_cleanup(log_dir: Path, retention_days: int) -> threading.Thread:
+    """バックグラウンドスレッドで古いログを整理"""
+    thread = threading.Thread(
+        target=prune_old_logs,
+        args=(log_dir, retention_days),
+        name="LogCleanup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,180 @@
+"""イベントループ遅延モニター - qasync統合ループのスケジューリング遅延を計測"""
+
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """イベントループのハートビートと停止検知ウォッチドッグ
+
+    ループ上のタスクが一定間隔でスリープし、予定時刻からの遅れを
+    ヒストグラムに記録する。別スレッドのウォッチドッグはハートビートが
+    途絶えている間にメインスレッドのスタックを取得するため、
+    「何がループを塞いでいたか」をその場で記録できる。
+    """
+
+    def __init__(
+        self,
+        interval_ms: int = 50,
+        threshold_ms: int = 200,
+        stack_cooldown_s: float = 10.0,
+        histogram_window: int = 1000,
+    ):
+        self._interval = interval_ms / 1000
+        self._threshold_ns = threshold_ms * 1_000_000
+        self._stack_cooldown_ns = int(stack_cooldown_s * 1e9)
+        self._histogram = LatencyHistogram(histogram_window)
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+        self._last_beat_ns = 0
+        self._recent_max_ms = 0.0
+        self._stall_count = 0
+        self._stack_captured_for_beat = 0
+        self._last_stack_ns = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["EventLoopLagMonitor"]:
+        """設定から生成 (無効の場合はNone)"""
+        diagnostics = settings.diagnostics
+        if not diagnostics.loop_monitor_enabled:
+            return None
+
+        return cls(
+            interval_ms=diagnostics.loop_monitor_interval_ms,
+            threshold_ms=diagnostics.loop_lag_threshold_ms,
+            stack_cooldown_s=diagnostics.stack_capture_cooldown_s,
+            histogram_window=diagnostics.loop_lag_histogram_window,
+        )
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """ハートビートとウォッチドッグを開始 (ループのスレッドから呼ぶ)"""
+        if self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat_ns = time.monotonic_ns()
+        self._stop_event.clear()
+
+        self._task = loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="LoopLagWatchdog", daemon=True
+        )
+        self._watchdog.start()
+
+        logger.info(
+            f"イベントループ遅延モニター開始 "
+            f"(間隔 {self._interval * 1000:.0f}ms, "
+            f"閾値 {self._threshold_ns / 1e6:.0f}ms)"
+        )
+
+    def stop(self):
+        """モニターを停止"""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    @property
+    def histogram(self) -> LatencyHistogram:
+        """遅延 (ミリ秒) のヒストグラム"""
+        return self._histogram
+
+    @property
+    def stall_count(self) -> int:
+        """閾値を超えた遅延の発生回数"""
+        return self._stall_count
+
+    def take_recent_max_ms(self) -> float:
+        """前回の呼び出し以降の最大遅延 (ミリ秒) を取得してリセット"""
+        value = self._recent_max_ms
+        self._recent_max_ms = 0.0
+        return value
+
+    def snapshot(self) -> Dict[str, float]:
+        """遅延のパーセンタイルと停止回数"""
+        summary = self._histogram.snapshot()
+        summary["stalls"] = float(self._stall_count)
+        return summary
+
+    def export_json(self, path: Path):
+        """遅延の集計をJSONファイルに書き出し"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            logger.info(f"イベントループ遅延を出力: {path}")
+        except Exception as e:
+            logger.error(f"イベントループ遅延の出力エラー: {e}")
+
+    async def _heartbeat(self):
+        """一定間隔でスリープし、予定時刻からの遅れを記録"""
+        interval_ns = int(self._interval * 1e9)
+        try:
+            while not self._stop_event.is_set():
+                expected_ns = time.monotonic_ns() + interval_ns
+                await asyncio.sleep(self._interval)
+                now = time.monotonic_ns()
+                self._last_beat_ns = now
+
+                lag_ns = max(0, now - expected_ns)
+                lag_ms = lag_ns / 1e6
+                self._histogram.record(lag_ms)
+                if lag_ms > self._recent_max_ms:
+                    self._recent_max_ms = lag_ms
+
+                if lag_ns >= self._threshold_ns:
+                    self._stall_count += 1
+                    logger.warning(f"イベントループが {lag_ms:.0f}ms 停止しました")
+
+        except asyncio.CancelledError:
+            pass
+
+    def _watch(self):
+        """ハートビートが途絶えている間にメインスレッドのスタックを取得"""
+        poll_interval = self._interval
+        while not self._stop_event.wait(poll_interval):
+            last_beat = self._last_beat_ns
+            now = time.monotonic_ns()
+            stalled_ns = now - last_beat - int(self._interval * 1e9)
+
+            if stalled_ns < self._threshold_ns:
+                continue
+            # 同じ停止中は1回だけ、かつ一定間隔を空けて取得する
+            if self._stack_captured_for_beat == last_beat:
+                continue
+            if now - self._last_stack_ns < self._stack_cooldown_ns:
+                continue
+
+            self._stack_captured_for_beat = last_beat
+            self._last_stack_ns = now
+            self._log_loop_stack(stalled_ns / 1e6)
+
+    def _log_loop_stack(self, stalled_ms: float):
+        """イベントループのスレッドのスタックをログ出力"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+
+        stack = "".join(traceback.format_stack(frame))
+        logger.warning(
+            f"イベントループが {stalled_ms:.0f}ms 以上応答しません。"
+            f"メインスレッドのスタック:\n{stack}"
+        )
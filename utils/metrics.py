@@ -0,0 +1,294 @@
+"""軽量メトリクス - カウンタ・ゲージ・ヒストグラムとPrometheus形式の出力
+
+記録はスレッドごとのセルに対して行うため、ホットパスでロックを取らない。
+ロックを取るのはスレッドが初めて記録する時のセル登録と、出力時の集計のみ。
+"""
+
+import bisect
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 秒単位の遅延向け既定バケット
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Metric:
+    """メトリクスの基底 (スレッドごとのセルを管理)"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._local = threading.local()
+        self._cells: List[list] = []
+        self._cells_lock = threading.Lock()
+
+    def _new_cell(self) -> list:
+        """このメトリクスのセルの初期値"""
+        return [0.0]
+
+    def _cell(self) -> list:
+        """呼び出し元スレッドのセルを取得 (初回のみ登録)"""
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = self._new_cell()
+            self._local.cell = cell
+            with self._cells_lock:
+                self._cells.append(cell)
+        return cell
+
+    def _snapshot_cells(self) -> List[list]:
+        """全スレッドのセルのコピー"""
+        with self._cells_lock:
+            return [list(cell) for cell in self._cells]
+
+    def render(self) -> List[str]:
+        """Prometheus テキスト形式の行"""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+
+class Counter(_Metric):
+    """単調増加カウンタ"""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0):
+        """加算"""
+        self._cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        """全スレッドの合計"""
+        return sum(cell[0] for cell in self._snapshot_cells())
+
+    def render(self) -> List[str]:
+        return super().render() + [f"{self.name} {_format_value(self.value)}"]
+
+
+class Gauge(_Metric):
+    """現在値 (set で上書き、または関数で都度取得)"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        """値を設定"""
+        self._value = value
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        """出力時に値を取得する関数を設定 (Noneで解除)"""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        """現在値"""
+        function = self._function
+        if function is not None:
+            try:
+                return float(function())
+            except Exception as e:
+                logger.debug(f"ゲージ値の取得に失敗: {self.name} - {e}")
+                return math.nan
+        return self._value
+
+    def render(self) -> List[str]:
+        return super().render() + [f"{self.name} {_format_value(self.value)}"]
+
+
+class Histogram(_Metric):
+    """累積バケット付きヒストグラム"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation)
+        self._buckets = tuple(sorted(buckets))
+
+    def _new_cell(self) -> list:
+        # [バケットごとの件数..., +Inf の件数, 合計値]
+        return [0] * (len(self._buckets) + 1) + [0.0]
+
+    def observe(self, value: float):
+        """値を記録"""
+        cell = self._cell()
+        cell[bisect.bisect_left(self._buckets, value)] += 1
+        cell[-1] += value
+
+    def render(self) -> List[str]:
+        bucket_count = len(self._buckets) + 1
+        counts = [0] * bucket_count
+        total = 0.0
+        for cell in self._snapshot_cells():
+            for i in range(bucket_count):
+                counts[i] += cell[i]
+            total += cell[-1]
+
+        lines = super().render()
+        cumulative = 0
+        for bound, count in zip(self._buckets, counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"{self.name}_sum {_format_value(total)}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return lines
+
+
+def _format_value(value: float) -> str:
+    """Prometheus 形式の数値表記"""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """メトリクスの登録と出力"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        """カウンタを取得 (未登録なら作成)"""
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        """ゲージを取得 (未登録なら作成)"""
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(
+        self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """ヒストグラムを取得 (未登録なら作成)"""
+        return self._get_or_create(Histogram, name, documentation, buckets)
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, documentation, *args)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"メトリクス名が別の種類で登録済み: {name}")
+            return metric
+
+    def render(self) -> str:
+        """全メトリクスを Prometheus テキスト形式で出力"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# プロセス共通のレジストリ
+REGISTRY = MetricsRegistry()
+
+
+class MetricsServer:
+    """メトリクスをHTTPで公開 (/metrics)"""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = REGISTRY,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+    ):
+        self._registry = registry
+        self._host = host
+        self._port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["MetricsServer"]:
+        """設定から生成 (無効の場合はNone)"""
+        if not settings.metrics.enabled:
+            return None
+        return cls(host=settings.metrics.host, port=settings.metrics.port)
+
+    def start(self) -> bool:
+        """バックグラウンドスレッドで待ち受けを開始"""
+        registry = self._registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # スクレイプごとのアクセスログは出さない
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self._host, self._port), _Handler)
+        except OSError as e:
+            logger.error(f"メトリクスサーバー起動失敗: {self._host}:{self._port} - {e}")
+            return False
+
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="MetricsServer", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"メトリクス公開: http://{self._host}:{self._port}/metrics")
+        return True
+
+    def stop(self):
+        """待ち受けを停止"""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._server = None
+        self._thread = None
+        logger.info("メトリクスサーバー停止")
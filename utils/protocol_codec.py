@@ -0,0 +1,212 @@
+"""リアルタイム文字起こしのワイヤープロトコル - メッセージのエンコード・デコード
+
+2つのリアルタイムクライアントはメッセージの種別を `type` (partial/committed) と
+`message_type` (partial_transcript/committed_transcript) の別々のキーで受け取るため、
+デコード時に共通の種別へ正規化し、種別ごとのハンドラ表で振り分ける。
+
+音声チャンクの送信は1チャンクごとに dict → json.dumps → str → UTF-8 と変換せず、
+固定部分を組み立て済みのバッファに Base64 の結果だけを書き込む。
+JSONの読み書きは orjson があれば使用し、なければ標準の json を使用する。
+"""
+
+import binascii
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 正規化したメッセージ種別
+KIND_PARTIAL = "partial"
+KIND_COMMITTED = "committed"
+KIND_ERROR = "error"
+KIND_SESSION_STARTED = "session_started"
+KIND_UNKNOWN = "unknown"
+
+# 受信メッセージの種別 → 正規化した種別
+MESSAGE_KINDS: Dict[str, str] = {
+    # infrastructure.realtime_client (type)
+    "partial": KIND_PARTIAL,
+    "committed": KIND_COMMITTED,
+    "error": KIND_ERROR,
+    # ElevenLabs Scribe V2 Realtime (message_type)
+    "partial_transcript": KIND_PARTIAL,
+    "committed_transcript": KIND_COMMITTED,
+    "committed_transcript_with_timestamps": KIND_COMMITTED,
+    "session_started": KIND_SESSION_STARTED,
+}
+
+# 最初に確保する音声チャンクのサイズ (16kHz・16bitで約100ms)
+DEFAULT_CHUNK_BYTES = 3200
+
+_AUDIO_CHUNK_PREFIX = b'{"message_type":"input_audio_chunk","audio_base_64":"'
+_AUDIO_CHUNK_SUFFIX = b'"}'
+_AUDIO_CHUNK_COMMIT_SUFFIX = b'","commit":true}'
+_COMMIT_MESSAGE = b'{"message_type":"commit"}'
+
+
+class JsonBackend:
+    """JSONの読み込み・書き込み (dumps はUTF-8のバイト列を返す)"""
+
+    def __init__(self, name: str, loads: Callable[[Any], Any], dumps: Callable[[Any], bytes]):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+
+def _stdlib_backend() -> JsonBackend:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return JsonBackend("json", json.loads, dumps)
+
+
+def _orjson_backend() -> Optional[JsonBackend]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return JsonBackend("orjson", orjson.loads, orjson.dumps)
+
+
+def available_json_backends() -> Dict[str, JsonBackend]:
+    """利用できるJSONバックエンド (名前 → バックエンド)"""
+    backends = {"json": _stdlib_backend()}
+    fast = _orjson_backend()
+    if fast is not None:
+        backends[fast.name] = fast
+    return backends
+
+
+_json_backend: JsonBackend = _orjson_backend() or _stdlib_backend()
+
+
+def get_json_backend() -> JsonBackend:
+    return _json_backend
+
+
+def set_json_backend(backend: "JsonBackend | str"):
+    """JSONバックエンドを切り替え (名前を指定した場合は利用可能なものから選ぶ)"""
+    global _json_backend
+    if isinstance(backend, str):
+        backends = available_json_backends()
+        if backend not in backends:
+            raise ValueError(f"利用できないJSONバックエンドです: {backend}")
+        backend = backends[backend]
+    _json_backend = backend
+    logger.debug(f"JSONバックエンド: {backend.name}")
+
+
+def dumps(obj: Any) -> bytes:
+    """オブジェクトをJSON (UTF-8のバイト列) に変換"""
+    return _json_backend.dumps(obj)
+
+
+def decode_message(message: "str | bytes") -> Tuple[str, Dict[str, Any]]:
+    """受信メッセージをデコードし、(正規化した種別, メッセージ) を返す
+
+    JSONとして不正な場合は ValueError (json.JSONDecodeError など) を送出する。
+    """
+    data = _json_backend.loads(message)
+    if not isinstance(data, dict):
+        return KIND_UNKNOWN, {}
+
+    message_type = data.get("message_type") or data.get("type")
+    kind = MESSAGE_KINDS.get(message_type)
+    if kind is None:
+        # auth_error, quota_exceeded などのエラー種別
+        if isinstance(message_type, str) and (
+            message_type.endswith("_error") or message_type.endswith("_exceeded")
+        ):
+            kind = KIND_ERROR
+        else:
+            kind = KIND_UNKNOWN
+    return kind, data
+
+
+def message_type_of(data: Dict[str, Any]) -> Optional[str]:
+    """正規化する前のメッセージ種別 (ログ用)"""
+    return data.get("message_type") or data.get("type")
+
+
+def error_message_of(data: Dict[str, Any]) -> str:
+    """エラーメッセージの本文 (キー名の違いを吸収)"""
+    return data.get("error_message") or data.get("message") or data.get("error") or "Unknown error"
+
+
+class MessageDispatcher:
+    """正規化した種別ごとのハンドラ表でメッセージを振り分け
+
+    if/elif の連鎖ではなく辞書引き1回でハンドラを決める。
+    登録されていない種別は default ハンドラ (なければ無視) に渡す。
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[Dict[str, Any]], Any]],
+        default: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ):
+        self._handlers = dict(handlers)
+        self._default = default
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Any]):
+        self._handlers[kind] = handler
+
+    def handle(self, kind: str, data: Dict[str, Any]) -> Any:
+        """デコード済みのメッセージをハンドラに渡し、その戻り値を返す"""
+        handler = self._handlers.get(kind, self._default)
+        if handler is None:
+            return None
+        return handler(data)
+
+    def dispatch(self, message: "str | bytes") -> Any:
+        """メッセージをデコードしてハンドラを呼び出す"""
+        kind, data = decode_message(message)
+        return self.handle(kind, data)
+
+
+class AudioChunkEncoder:
+    """input_audio_chunk メッセージのエンコーダ
+
+    メッセージの先頭部分を書き込み済みのバッファを使い回し、
+    Base64の結果と末尾部分だけを上書きする。返す memoryview は次の encode
+    呼び出しまで有効なので、呼び出し側は送信を終えてから次のチャンクを
+    エンコードすること (websockets の send は送信時にデータを複製する)。
+    """
+
+    def __init__(self, chunk_bytes: int = DEFAULT_CHUNK_BYTES):
+        self._buffer = bytearray()
+        self._view = memoryview(self._buffer)
+        self._reserve(chunk_bytes)
+
+    @staticmethod
+    def encoded_size(chunk_bytes: int) -> int:
+        """chunk_bytes の音声を格納するメッセージの最大バイト数"""
+        base64_size = (chunk_bytes + 2) // 3 * 4
+        return len(_AUDIO_CHUNK_PREFIX) + base64_size + len(_AUDIO_CHUNK_COMMIT_SUFFIX)
+
+    def _reserve(self, chunk_bytes: int):
+        size = self.encoded_size(chunk_bytes)
+        if size <= len(self._buffer):
+            return
+        # 送信中の memoryview が残っていても壊さないよう、新しいバッファを確保する
+        self._buffer = bytearray(size)
+        self._buffer[: len(_AUDIO_CHUNK_PREFIX)] = _AUDIO_CHUNK_PREFIX
+        self._view = memoryview(self._buffer)
+
+    def encode(self, audio_data: bytes, commit: bool = False) -> memoryview:
+        """音声チャンクをJSONメッセージ (UTF-8) にエンコード"""
+        self._reserve(len(audio_data))
+        encoded = binascii.b2a_base64(audio_data, newline=False)
+
+        start = len(_AUDIO_CHUNK_PREFIX)
+        end = start + len(encoded)
+        self._view[start:end] = encoded
+        suffix = _AUDIO_CHUNK_COMMIT_SUFFIX if commit else _AUDIO_CHUNK_SUFFIX
+        self._view[end:end + len(suffix)] = suffix
+        return self._view[: end + len(suffix)]
+
+
+def encode_commit() -> bytes:
+    """手動コミット (commit) メッセージ"""
+    return _COMMIT_MESSAGE
@@ -0,0 +1,159 @@
+"""起動時間プロファイラー - フェーズごと・インポートごとの所要時間を計測
+
+インポートの計測は環境変数 VOICESCRIBE_PROFILE_IMPORTS=1 の場合のみ有効。
+計測対象のインポートより前に読み込まれる必要があるため、
+このモジュールは標準ライブラリ以外に依存しない。
+"""
+
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_IMPORTS_ENV = "VOICESCRIBE_PROFILE_IMPORTS"
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """モジュールの実行時間を計測するローダーのラッパー"""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.exit()
+
+    def __getattr__(self, name):
+        # get_resource_reader などはそのまま元のローダーに委譲
+        return getattr(self._loader, name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """sys.meta_path に挿入してモジュールごとの読み込み時間を記録
+
+    子モジュールの読み込み時間を差し引いた自己時間と、
+    子を含む累積時間の両方を記録する。
+    """
+
+    def __init__(self):
+        self._stack: List[Tuple[str, int, int]] = []  # (名前, 開始時刻, 子の時間)
+        self._self_ns: Dict[str, int] = {}
+        self._cumulative_ns: Dict[str, int] = {}
+        self._thread_id = threading.get_ident()
+        self._finding = False
+
+    def install(self):
+        """計測を開始"""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """計測を終了"""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        # 起動スレッド以外のインポート、および再帰呼び出しは計測しない
+        if self._finding or threading.get_ident() != self._thread_id:
+            return None
+
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def enter(self, name: str):
+        """モジュールの実行開始"""
+        self._stack.append((name, time.perf_counter_ns(), 0))
+
+    def exit(self):
+        """モジュールの実行終了"""
+        name, start_ns, child_ns = self._stack.pop()
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        self._cumulative_ns[name] = elapsed_ns
+        self._self_ns[name] = elapsed_ns - child_ns
+
+        if self._stack:
+            parent_name, parent_start, parent_child_ns = self._stack[-1]
+            self._stack[-1] = (parent_name, parent_start, parent_child_ns + elapsed_ns)
+
+    def top(self, count: int = 15) -> List[Tuple[str, float, float]]:
+        """自己時間の長い順に (モジュール名, 自己ms, 累積ms)"""
+        ranked = sorted(self._self_ns.items(), key=lambda item: item[1], reverse=True)
+        return [
+            (name, self_ns / 1e6, self._cumulative_ns[name] / 1e6)
+            for name, self_ns in ranked[:count]
+        ]
+
+
+class StartupProfiler:
+    """起動処理のフェーズごとの所要時間を記録"""
+
+    def __init__(self, profile_imports: bool = False):
+        self._start_ns = time.perf_counter_ns()
+        self._lap_ns = self._start_ns
+        self._phases: List[Tuple[str, float]] = []
+        self._import_timer: Optional[ImportTimer] = None
+        if profile_imports:
+            self._import_timer = ImportTimer()
+            self._import_timer.install()
+
+    @classmethod
+    def from_environment(cls) -> "StartupProfiler":
+        """環境変数に応じてインポート計測を有効化"""
+        return cls(profile_imports=os.environ.get(PROFILE_IMPORTS_ENV) == "1")
+
+    def lap(self, name: str):
+        """前回の lap (または起動開始) からの所要時間を記録"""
+        now_ns = time.perf_counter_ns()
+        self._phases.append((name, (now_ns - self._lap_ns) / 1e6))
+        self._lap_ns = now_ns
+
+    @property
+    def elapsed_ms(self) -> float:
+        """起動開始からの経過時間 (ミリ秒)"""
+        return (time.perf_counter_ns() - self._start_ns) / 1e6
+
+    @property
+    def phases(self) -> List[Tuple[str, float]]:
+        """記録したフェーズ (名前, ミリ秒)"""
+        return list(self._phases)
+
+    def report(self):
+        """計測結果をログ出力し、インポート計測を終了"""
+        lines = [f"起動時間: {self.elapsed_ms:.0f}ms"]
+        for name, elapsed_ms in self._phases:
+            lines.append(f"  {name}: {elapsed_ms:.1f}ms")
+
+        if self._import_timer is not None:
+            self._import_timer.uninstall()
+            lines.append("インポート時間 (自己 / 累積):")
+            for name, self_ms, cumulative_ms in self._import_timer.top():
+                lines.append(f"  {name}: {self_ms:.1f}ms / {cumulative_ms:.1f}ms")
+            self._import_timer = None
+
+        logger.info("\n".join(lines))